@@ -0,0 +1,23 @@
+"""per-stage token accounting on ingestion runs
+
+Revision ID: 0002_run_stage_metrics
+Revises: 0001_initial_schema
+Create Date: 2026-10-19 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002_run_stage_metrics"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("stage_metrics", sa.Text(), nullable=False, server_default="{}"))
+
+
+def downgrade() -> None:
+    op.drop_column("ingestion_runs", "stage_metrics")
@@ -0,0 +1,25 @@
+"""record which PDF parser produced each paper and how long it took
+
+Revision ID: 0003_paper_parse_provenance
+Revises: 0002_run_stage_metrics
+Create Date: 2026-10-19 11:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_paper_parse_provenance"
+down_revision = "0002_run_stage_metrics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("papers", sa.Column("parser_name", sa.String(length=32), nullable=True))
+    op.add_column("papers", sa.Column("parse_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("papers", "parse_seconds")
+    op.drop_column("papers", "parser_name")
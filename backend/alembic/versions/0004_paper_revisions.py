@@ -0,0 +1,47 @@
+"""chunk content hashes and paper revision diffs
+
+Revision ID: 0004_paper_revisions
+Revises: 0003_paper_parse_provenance
+Create Date: 2026-10-19 12:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_paper_revisions"
+down_revision = "0003_paper_parse_provenance"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("paper_chunks", sa.Column("content_hash", sa.String(length=64), nullable=False, server_default=""))
+    op.create_index("ix_paper_chunks_content_hash", "paper_chunks", ["content_hash"])
+
+    op.create_table(
+        "paper_revisions",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("paper_id", sa.Integer(), sa.ForeignKey("papers.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("from_source_id", sa.String(length=128), nullable=False),
+        sa.Column("to_source_id", sa.String(length=128), nullable=False),
+        sa.Column("chunks_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_unchanged", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_added", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_removed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("changed_sections", sa.Text(), nullable=False, server_default=""),
+        sa.Column("abstract_changed", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("alpha_reextracted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("week_key", sa.String(length=16), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_paper_revisions_paper_id", "paper_revisions", ["paper_id"])
+    op.create_index("ix_paper_revisions_week_key", "paper_revisions", ["week_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_paper_revisions_week_key", table_name="paper_revisions")
+    op.drop_index("ix_paper_revisions_paper_id", table_name="paper_revisions")
+    op.drop_table("paper_revisions")
+    op.drop_index("ix_paper_chunks_content_hash", table_name="paper_chunks")
+    op.drop_column("paper_chunks", "content_hash")
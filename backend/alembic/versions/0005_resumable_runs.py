@@ -0,0 +1,53 @@
+"""stage checkpoints and staged documents for resumable runs
+
+Revision ID: 0005_resumable_runs
+Revises: 0004_paper_revisions
+Create Date: 2026-10-19 13:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0005_resumable_runs"
+down_revision = "0004_paper_revisions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("ingestion_runs", sa.Column("status", sa.String(length=16), nullable=False, server_default="completed"))
+    op.add_column("ingestion_runs", sa.Column("stage", sa.String(length=32), nullable=False, server_default=""))
+    op.add_column("ingestion_runs", sa.Column("week_key", sa.String(length=16), nullable=False, server_default=""))
+    op.add_column("ingestion_runs", sa.Column("request_json", sa.Text(), nullable=False, server_default="{}"))
+    op.add_column("ingestion_runs", sa.Column("checkpoint_json", sa.Text(), nullable=False, server_default="{}"))
+    op.add_column("ingestion_runs", sa.Column("error", sa.Text(), nullable=False, server_default=""))
+    op.create_index("ix_ingestion_runs_status", "ingestion_runs", ["status"])
+    # Runs that never reached completion before this migration cannot be resumed (no staged docs).
+    op.execute("UPDATE ingestion_runs SET status = 'failed' WHERE completed_at IS NULL")
+
+    op.create_table(
+        "ingestion_run_documents",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("run_id", sa.Integer(), sa.ForeignKey("ingestion_runs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(length=64), nullable=False, server_default=""),
+        sa.Column("source_id", sa.String(length=128), nullable=False),
+        sa.Column("payload_json", sa.Text(), nullable=False),
+        sa.Column("outcome", sa.String(length=16), nullable=False, server_default=""),
+        sa.Column("paper_id", sa.Integer(), sa.ForeignKey("papers.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("revision_id", sa.Integer(), nullable=True),
+        sa.Column("extracted", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("alpha_card_id", sa.Integer(), nullable=True),
+        sa.Column("hmr_json", sa.Text(), nullable=False, server_default=""),
+        sa.UniqueConstraint("run_id", "position", name="uq_run_document_position"),
+    )
+    op.create_index("ix_ingestion_run_documents_run_id", "ingestion_run_documents", ["run_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_run_documents_run_id", table_name="ingestion_run_documents")
+    op.drop_table("ingestion_run_documents")
+    op.drop_index("ix_ingestion_runs_status", table_name="ingestion_runs")
+    for column in ("error", "checkpoint_json", "request_json", "week_key", "stage", "status"):
+        op.drop_column("ingestion_runs", column)
@@ -0,0 +1,44 @@
+"""persisted workflow job queue
+
+Revision ID: 0006_workflow_jobs
+Revises: 0005_resumable_runs
+Create Date: 2026-10-19 14:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0006_workflow_jobs"
+down_revision = "0005_resumable_runs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="queued"),
+        sa.Column("request_json", sa.Text(), nullable=False, server_default="{}"),
+        sa.Column("run_id", sa.Integer(), sa.ForeignKey("ingestion_runs.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("active_slot", sa.String(length=32), nullable=True),
+        sa.Column("stage", sa.String(length=32), nullable=False, server_default=""),
+        sa.Column("progress_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("progress_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("error", sa.Text(), nullable=False, server_default=""),
+        sa.Column("worker_id", sa.String(length=128), nullable=False, server_default=""),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("active_slot", name="uq_workflow_jobs_active_slot"),
+    )
+    op.create_index("ix_workflow_jobs_status", "workflow_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_workflow_jobs_status", table_name="workflow_jobs")
+    op.drop_table("workflow_jobs")
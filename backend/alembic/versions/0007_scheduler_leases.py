@@ -0,0 +1,46 @@
+"""scheduler leader lease and scheduled-run history
+
+Revision ID: 0007_scheduler_leases
+Revises: 0006_workflow_jobs
+Create Date: 2026-10-19 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0007_scheduler_leases"
+down_revision = "0006_workflow_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_leases",
+        sa.Column("name", sa.String(length=64), primary_key=True),
+        sa.Column("holder", sa.String(length=128), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("acquired_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "scheduler_job_runs",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("job_name", sa.String(length=64), nullable=False),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("holder", sa.String(length=128), nullable=False, server_default=""),
+        sa.Column("catch_up", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column(
+            "workflow_job_id", sa.Integer(), sa.ForeignKey("workflow_jobs.id", ondelete="SET NULL"), nullable=True
+        ),
+        sa.Column("error", sa.Text(), nullable=False, server_default=""),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_scheduler_job_runs_job_name", "scheduler_job_runs", ["job_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduler_job_runs_job_name", table_name="scheduler_job_runs")
+    op.drop_table("scheduler_job_runs")
+    op.drop_table("scheduler_leases")
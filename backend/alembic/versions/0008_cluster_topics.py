@@ -0,0 +1,43 @@
+"""stable cross-week cluster topics with centroids
+
+Revision ID: 0008_cluster_topics
+Revises: 0007_scheduler_leases
+Create Date: 2026-10-19 16:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "0008_cluster_topics"
+down_revision = "0007_scheduler_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cluster_topics",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("name", sa.String(length=256), nullable=False),
+        sa.Column("centroid", Vector(dim=1024), nullable=False),
+        sa.Column("paper_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("first_week", sa.String(length=16), nullable=False),
+        sa.Column("last_week", sa.String(length=16), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_cluster_topics_last_week", "cluster_topics", ["last_week"])
+    op.add_column(
+        "clusters",
+        sa.Column("topic_id", sa.Integer(), sa.ForeignKey("cluster_topics.id", ondelete="SET NULL"), nullable=True),
+    )
+    op.create_index("ix_clusters_topic_id", "clusters", ["topic_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_clusters_topic_id", table_name="clusters")
+    op.drop_column("clusters", "topic_id")
+    op.drop_index("ix_cluster_topics_last_week", table_name="cluster_topics")
+    op.drop_table("cluster_topics")
@@ -0,0 +1,44 @@
+"""cross-week hypothesis tracking: evidence embeddings, decayed scores, HNSW index
+
+Revision ID: 0009_hypothesis_tracking
+Revises: 0008_cluster_topics
+Create Date: 2026-10-19 17:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "0009_hypothesis_tracking"
+down_revision = "0008_cluster_topics"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("hypotheses", sa.Column("embedding_vector", Vector(dim=1024), nullable=True))
+    op.add_column("hypotheses", sa.Column("evidence_score", sa.Float(), nullable=False, server_default="0"))
+    op.add_column("hypotheses", sa.Column("evidence_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("hypotheses", sa.Column("last_evidence_week", sa.String(length=16), nullable=False, server_default=""))
+    op.create_index("ix_hypotheses_last_evidence_week", "hypotheses", ["last_evidence_week"])
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_hypotheses_embedding_hnsw "
+        "ON hypotheses USING hnsw (embedding_vector vector_cosine_ops)"
+    )
+
+    op.add_column(
+        "hypothesis_paper_links", sa.Column("week_key", sa.String(length=16), nullable=False, server_default="")
+    )
+    op.create_index("ix_hypothesis_paper_links_week_key", "hypothesis_paper_links", ["week_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hypothesis_paper_links_week_key", table_name="hypothesis_paper_links")
+    op.drop_column("hypothesis_paper_links", "week_key")
+    op.execute("DROP INDEX IF EXISTS ix_hypotheses_embedding_hnsw")
+    op.drop_index("ix_hypotheses_last_evidence_week", table_name="hypotheses")
+    op.drop_column("hypotheses", "last_evidence_week")
+    op.drop_column("hypotheses", "evidence_count")
+    op.drop_column("hypotheses", "evidence_score")
+    op.drop_column("hypotheses", "embedding_vector")
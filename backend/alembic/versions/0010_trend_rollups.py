@@ -0,0 +1,34 @@
+"""weekly trend rollups
+
+Revision ID: 0010_trend_rollups
+Revises: 0009_hypothesis_tracking
+Create Date: 2026-10-19 18:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010_trend_rollups"
+down_revision = "0009_hypothesis_tracking"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trend_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("week_key", sa.String(length=16), nullable=False),
+        sa.Column("dimension", sa.String(length=32), nullable=False),
+        sa.Column("value", sa.String(length=256), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("week_key", "dimension", "value", name="uq_trend_rollup_week_value"),
+    )
+    op.create_index("ix_trend_rollups_week_key", "trend_rollups", ["week_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trend_rollups_week_key", table_name="trend_rollups")
+    op.drop_table("trend_rollups")
@@ -0,0 +1,28 @@
+"""nearest-neighbour novelty score on alpha cards, HNSW index on paper embeddings
+
+Revision ID: 0011_paper_novelty_scores
+Revises: 0010_trend_rollups
+Create Date: 2026-10-19 19:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011_paper_novelty_scores"
+down_revision = "0010_trend_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("paper_alpha_cards", sa.Column("novelty_score", sa.Float(), nullable=True))
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_papers_embedding_hnsw "
+        "ON papers USING hnsw (embedding_vector vector_cosine_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_papers_embedding_hnsw")
+    op.drop_column("paper_alpha_cards", "novelty_score")
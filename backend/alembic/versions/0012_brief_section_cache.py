@@ -0,0 +1,36 @@
+"""per-section brief cache; index runs by week
+
+Revision ID: 0012_brief_section_cache
+Revises: 0011_paper_novelty_scores
+Create Date: 2026-10-19 20:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0012_brief_section_cache"
+down_revision = "0011_paper_novelty_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "brief_section_cache",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("brief_id", sa.Integer(), sa.ForeignKey("research_briefs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("section", sa.String(length=64), nullable=False),
+        sa.Column("input_hash", sa.String(length=64), nullable=False, server_default=""),
+        sa.Column("content", sa.Text(), nullable=False, server_default=""),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("brief_id", "section", name="uq_brief_section"),
+    )
+    op.create_index("ix_brief_section_cache_brief_id", "brief_section_cache", ["brief_id"])
+    op.create_index("ix_ingestion_runs_week_key", "ingestion_runs", ["week_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ingestion_runs_week_key", table_name="ingestion_runs")
+    op.drop_index("ix_brief_section_cache_brief_id", table_name="brief_section_cache")
+    op.drop_table("brief_section_cache")
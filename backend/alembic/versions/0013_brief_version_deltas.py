@@ -0,0 +1,35 @@
+"""compressed delta storage for brief versions
+
+Revision ID: 0013_brief_version_deltas
+Revises: 0012_brief_section_cache
+Create Date: 2026-10-19 21:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0013_brief_version_deltas"
+down_revision = "0012_brief_section_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows stay as uncompressed full snapshots.
+    op.add_column(
+        "research_brief_versions", sa.Column("storage", sa.String(length=8), nullable=False, server_default="full")
+    )
+    op.add_column("research_brief_versions", sa.Column("payload", sa.LargeBinary(), nullable=True))
+    op.alter_column("research_brief_versions", "markdown_content", existing_type=sa.Text(), nullable=True)
+    op.create_index(
+        "ix_research_brief_versions_brief_version", "research_brief_versions", ["brief_id", "version_number"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_research_brief_versions_brief_version", table_name="research_brief_versions")
+    # Delta rows have no plain-text copy; rebuild them with brief_versions.version_markdown before downgrading.
+    op.alter_column("research_brief_versions", "markdown_content", existing_type=sa.Text(), nullable=False)
+    op.drop_column("research_brief_versions", "payload")
+    op.drop_column("research_brief_versions", "storage")
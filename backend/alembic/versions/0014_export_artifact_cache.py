@@ -0,0 +1,29 @@
+"""key cached export artifacts by brief version, platform and variant
+
+Revision ID: 0014_export_artifact_cache
+Revises: 0013_brief_version_deltas
+Create Date: 2026-10-19 22:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0014_export_artifact_cache"
+down_revision = "0013_brief_version_deltas"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "export_artifacts", sa.Column("variant", sa.String(length=64), nullable=False, server_default="")
+    )
+    op.create_unique_constraint(
+        "uq_export_artifact_version_platform", "export_artifacts", ["brief_version_id", "platform", "variant"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_export_artifact_version_platform", "export_artifacts", type_="unique")
+    op.drop_column("export_artifacts", "variant")
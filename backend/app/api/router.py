@@ -9,6 +9,7 @@ from app.api.v1.hypotheses import router as hypotheses_router
 from app.api.v1.memory import router as memory_router
 from app.api.v1.papers import router as papers_router
 from app.api.v1.qa import router as qa_router
+from app.api.v1.trends import router as trends_router
 from app.api.v1.workflows import router as workflows_router
 
 api_router = APIRouter()
@@ -22,3 +23,4 @@ api_router.include_router(clusters_router)
 api_router.include_router(briefs_router)
 api_router.include_router(exports_router)
 api_router.include_router(qa_router)
+api_router.include_router(trends_router)
@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.db.session import get_db
-from app.schemas.domain import BriefUpdateRequest, BriefVersionOut
+from app.schemas.domain import BriefDiffOut, BriefUpdateRequest, BriefVersionOut
 from app.services.pipeline import brief_service
 
 router = APIRouter(prefix="/briefs", tags=["briefs"])
@@ -17,3 +17,16 @@ def latest_brief(week_key: Optional[str] = None, db: Session = Depends(get_db))
 @router.post("/update", response_model=BriefVersionOut)
 def update_brief(payload: BriefUpdateRequest, db: Session = Depends(get_db)) -> BriefVersionOut:
     return brief_service.update_brief(db=db, payload=payload)
+
+
+@router.get("/{week_key}/diff", response_model=BriefDiffOut)
+def diff_brief(
+    week_key: str,
+    from_version: Optional[int] = Query(default=None, alias="from", ge=1),
+    to_version: Optional[int] = Query(default=None, alias="to", ge=1),
+    db: Session = Depends(get_db),
+) -> BriefDiffOut:
+    try:
+        return brief_service.diff(db=db, week_key=week_key, from_version=from_version, to_version=to_version)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
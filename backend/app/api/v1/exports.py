@@ -1,16 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import get_args
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.schemas.domain import ExportRequest, ExportResponse
+from app.schemas.domain import ExportPlatform, ExportRequest, ExportResponse
+from app.services.export_streams import iter_text, iter_zip
 from app.services.pipeline import export_service
 
 router = APIRouter(prefix="/exports", tags=["exports"])
 
 
+def _filename(platform: str) -> str:
+    return "brief.md" if platform == "markdown" else f"{platform}.txt"
+
+
 @router.post("/generate", response_model=ExportResponse)
 def generate_exports(payload: ExportRequest, db: Session = Depends(get_db)) -> ExportResponse:
     try:
         return export_service.generate(db=db, payload=payload)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/{brief_version_id}/bundle.zip")
+def download_bundle(
+    brief_version_id: int,
+    platforms: list[ExportPlatform] = Query(default=list(get_args(ExportPlatform))),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    try:
+        items = export_service.artifacts(db=db, brief_version_id=brief_version_id, platforms=platforms)
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return StreamingResponse(
+        iter_zip((_filename(item.platform), item.content) for item in items),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="brief-{brief_version_id}.zip"'},
+    )
+
+
+@router.get("/{brief_version_id}/{platform}")
+def download_export(brief_version_id: int, platform: ExportPlatform, db: Session = Depends(get_db)) -> StreamingResponse:
+    try:
+        (item,) = export_service.artifacts(db=db, brief_version_id=brief_version_id, platforms=[platform])
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    media_type = "text/markdown; charset=utf-8" if platform == "markdown" else "text/plain; charset=utf-8"
+    return StreamingResponse(
+        iter_text(item.content),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{_filename(platform)}"'},
+    )
@@ -0,0 +1,34 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.domain import TrendsResponse
+from app.services.pipeline import analysis_service
+
+router = APIRouter(prefix="/trends", tags=["trends"])
+
+
+@router.get("", response_model=TrendsResponse)
+def get_trends(
+    week_key: Optional[str] = Query(default=None, pattern=r"^\d{4}-W\d{2}$"),
+    window: int = Query(default=12, ge=1, le=104),
+    dimension: Optional[Literal["hypothesis_type", "bottleneck", "mechanism", "source", "novelty"]] = None,
+    moving_average: int = Query(default=3, ge=1, le=26),
+    recent_weeks: int = Query(default=2, ge=1, le=26),
+    limit: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_db),
+) -> TrendsResponse:
+    try:
+        return analysis_service.trends(
+            db=db,
+            week_key=week_key,
+            window=window,
+            dimension=dimension,
+            moving_average_weeks=moving_average,
+            recent_weeks=recent_weeks,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
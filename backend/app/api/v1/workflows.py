@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
@@ -6,17 +6,59 @@ from app.schemas.domain import (
     InferencePolicyResponse,
     IngestionPolicyResponse,
     ProjectPolicyResponse,
+    SchedulerRunOut,
+    WorkflowJobOut,
     WorkflowRunRequest,
-    WorkflowRunResponse,
 )
+from app.services.jobs import JobConflictError, job_out, job_queue
 from app.services.pipeline import workflow_service
+from app.services.scheduler import list_history
 
 router = APIRouter(prefix="/workflows", tags=["workflows"])
 
 
-@router.post("/weekly-run", response_model=WorkflowRunResponse)
-def run_weekly_pipeline(payload: WorkflowRunRequest, db: Session = Depends(get_db)) -> WorkflowRunResponse:
-    return workflow_service.run_weekly(db=db, payload=payload)
+@router.post("/weekly-run", response_model=WorkflowJobOut, status_code=202)
+def run_weekly_pipeline(payload: WorkflowRunRequest, db: Session = Depends(get_db)) -> WorkflowJobOut:
+    try:
+        return job_out(job_queue.submit(db=db, kind="weekly_run", payload=payload))
+    except JobConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.post("/runs/{run_id}/resume", response_model=WorkflowJobOut, status_code=202)
+def resume_weekly_run(run_id: int, db: Session = Depends(get_db)) -> WorkflowJobOut:
+    try:
+        return job_out(job_queue.submit(db=db, kind="resume_run", run_id=run_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except JobConflictError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+
+@router.get("/jobs", response_model=list[WorkflowJobOut])
+def list_jobs(limit: int = 20, db: Session = Depends(get_db)) -> list[WorkflowJobOut]:
+    return [job_out(job) for job in job_queue.list_jobs(db=db, limit=limit)]
+
+
+@router.get("/jobs/{job_id}", response_model=WorkflowJobOut)
+def get_job(job_id: int, db: Session = Depends(get_db)) -> WorkflowJobOut:
+    try:
+        return job_out(job_queue.get(db=db, job_id=job_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=WorkflowJobOut)
+def cancel_job(job_id: int, db: Session = Depends(get_db)) -> WorkflowJobOut:
+    try:
+        return job_out(job_queue.cancel(db=db, job_id=job_id))
+    except ValueError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/schedule/history", response_model=list[SchedulerRunOut])
+def get_schedule_history(limit: int = 50, db: Session = Depends(get_db)) -> list[SchedulerRunOut]:
+    return list_history(db=db, limit=limit)
 
 
 @router.get("/ingestion-policy", response_model=IngestionPolicyResponse)
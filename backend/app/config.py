@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     weekly_cron: str = "0 2 * * *"
     weekly_timezone: str = "America/Los_Angeles"
     default_max_papers: int = 0
+    run_checkpoint_batch_size: int = 16
     ingest_sources: str = "arxiv,openreview,frontier_blogs,x_threads,reddit,university_blogs"
     arxiv_categories: str = "cs.CL,cs.LG,stat.ML,cs.AI,cs.DS,cs.GT,cs.MA"
     arxiv_recent_hours: int = 24
@@ -25,17 +26,31 @@ class Settings(BaseSettings):
     pdf_parser_primary: str = "pymupdf"
     pdf_parser_fallback: str = "pdfminer"
     appendix_policy: str = "main_first_fallback"
+    pdf_max_chars: int = 250_000
+    pdf_min_main_chars: int = 4000
+    pdf_parse_isolated: bool = True
+    pdf_parse_timeout_s: float = 120.0
+    pdf_parse_memory_mb: int = 2048
+    pdf_parse_race_after_s: float = 30.0
+    pdf_adaptive_parser_order: bool = True
     equation_policy: str = "plain_text_v1"
     chunk_target_tokens: int = 1200
     chunk_overlap_tokens: int = 150
     semantic_sectioning: bool = True
     topic_bias_enabled: bool = True
-    topic_bias_min_score: int = 1
+    topic_bias_min_score: float = 1
     topic_bias_keywords: str = (
         "llm post-training,reinforcement learning,rlhf,agentic systems,tool learning,"
         "adaptive reasoning,inference-time optimization,parallel scaling,"
         "hallucination detection,online rl,bandits,online learning,recommender systems,safety"
     )
+    topic_bias_weights: str = ""  # e.g. "rlhf:2,safety:0.5"; unlisted keywords weigh 1
+    topic_bias_word_boundaries: bool = False
+    topic_semantic_enabled: bool = True
+    topic_semantic_weight: float = 0.4
+    topic_semantic_min_similarity: float = 0.6
+    topic_recency_weight: float = 0.1
+    topic_recency_half_life_hours: float = 72.0
     llm_provider: str = "ollama"
     llm_model: str = "qwen2.5:7b-instruct"
     llm_synthesis_model: str = "qwen2.5:7b-instruct"
@@ -44,18 +59,53 @@ class Settings(BaseSettings):
     llm_fallback_provider: str = "openrouter"
     llm_weekly_budget_usd: float = 5.0
     llm_weekly_max_calls: int = 600
+    llm_max_output_tokens: int = 512
+    llm_generation_deadline_s: float = 90.0
+    llm_http_max_connections: int = 4
+    llm_http_max_keepalive: int = 4
+    llm_connect_timeout_s: float = 5.0
+    llm_read_timeout_s: float = 120.0
+    llm_keep_alive: str = "30m"
+    llm_warmup_enabled: bool = True
+    llm_unload_between_models: bool = True
+    llm_num_ctx: int = 8192
+    llm_parallel_requests: int = 1
+    llm_pack_short_items: bool = True
+    llm_pack_max_item_chars: int = 1200
+    llm_pack_max_items: int = 8
+    llm_pack_output_tokens_per_item: int = 200
+    llm_abstract_max_tokens: int = 800
+    tokenizer_dir: str = ""
     openrouter_model: str = "meta-llama/llama-3.1-8b-instruct:free"
     openrouter_api_key: str = ""
     embedding_model: str = "nomic-embed-text"
     embedding_scope: str = "chunks_and_paper"
+    embedding_batch_size: int = 64
     vector_metadata_filters: bool = True
     alpha_card_versioning: str = "immutable_with_history"
     novelty_score_mode: str = "ordinal"
+    novelty_neighbors: int = 5
+    novelty_half_life_weeks: float = 26.0
+    novelty_high_threshold: float = 0.75
+    novelty_low_threshold: float = 0.45
     hypothesis_strength_mode: str = "model_with_human_override"
+    hypothesis_match_threshold: float = 0.45
+    hypothesis_new_confidence: float = 0.6
+    hypothesis_evidence_half_life_weeks: float = 4.0
+    hypothesis_strength_scale: float = 2.0
     contradiction_edges_enabled: bool = True
+    contradiction_model: str = ""  # defaults to llm_model
+    contradiction_candidates_per_paper: int = 3
+    contradiction_min_similarity: float = 0.25
+    contradiction_max_checks: int = 60  # NLI pair checks per ISO week, shared by every run of that week
+    contradiction_batch_size: int = 8
+    contradiction_min_confidence: float = 0.6
     citation_provenance_required: bool = True
+    brief_snapshot_interval: int = 10
     auth_required: bool = False
     cluster_edit_mode: str = "v1_1"
+    cluster_match_threshold: float = 0.35
+    cluster_target_size: int = 8
     hypothesis_user_rating_scale: str = "binary"
     hotkeys_enabled: bool = True
     editor_mode: str = "markdown"
@@ -68,7 +118,16 @@ class Settings(BaseSettings):
     db_backend: str = "postgres"
     db_init_mode: str = "migrate"  # migrate | create_all
     dev_runtime_mode: str = "native_first"
-    scheduler_mode: str = "in_process"
+    scheduler_mode: str = "in_process"  # in_process | external (run by app.worker) | off
+    scheduler_lease_ttl_s: float = 300.0
+    scheduler_misfire_grace_s: int = 3600
+    scheduler_catch_up_missed: bool = True
+    job_worker_mode: str = "embedded"  # embedded | external (run by app.worker)
+    job_poll_interval_s: float = 5.0
+    job_heartbeat_s: float = 30.0
+    job_stale_after_s: float = 600.0
+    worker_processes: int = 1
+    pipeline_overlap_llm: bool = True
     backup_retention_days: int = 7
     min_acceptable_precision: float = 0.70
     manual_qa_checklist: bool = True
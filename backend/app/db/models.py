@@ -7,7 +7,9 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -30,6 +32,88 @@ class IngestionRun(Base):
     source_scope: Mapped[str] = mapped_column(String(256))
     total_items: Mapped[int] = mapped_column(Integer, default=0)
     notes: Mapped[str] = mapped_column(Text, default="")
+    # JSON: {stage: {calls, prompt_tokens, completion_tokens}}
+    stage_metrics: Mapped[str] = mapped_column(Text, default="{}")
+    status: Mapped[str] = mapped_column(String(16), default="running", index=True)
+    # Last completed pipeline stage: fetched, stored, extracted, synthesized, rendered
+    stage: Mapped[str] = mapped_column(String(32), default="")
+    week_key: Mapped[str] = mapped_column(String(16), default="", index=True)
+    request_json: Mapped[str] = mapped_column(Text, default="{}")
+    checkpoint_json: Mapped[str] = mapped_column(Text, default="{}")
+    error: Mapped[str] = mapped_column(Text, default="")
+
+
+class IngestionRunDocument(Base):
+    """A fetched document staged for a run, with its per-document progress."""
+
+    __tablename__ = "ingestion_run_documents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[int] = mapped_column(ForeignKey("ingestion_runs.id", ondelete="CASCADE"), index=True)
+    position: Mapped[int] = mapped_column(Integer)
+    source: Mapped[str] = mapped_column(String(64), default="")
+    source_id: Mapped[str] = mapped_column(String(128))
+    payload_json: Mapped[str] = mapped_column(Text)
+    # "" until stored, then new | revision | duplicate
+    outcome: Mapped[str] = mapped_column(String(16), default="")
+    paper_id: Mapped[Optional[int]] = mapped_column(ForeignKey("papers.id", ondelete="SET NULL"), nullable=True)
+    revision_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    extracted: Mapped[bool] = mapped_column(Boolean, default=False)
+    alpha_card_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    hmr_json: Mapped[str] = mapped_column(Text, default="")
+
+    __table_args__ = (UniqueConstraint("run_id", "position", name="uq_run_document_position"),)
+
+
+class WorkflowJob(Base):
+    __tablename__ = "workflow_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(32))
+    # queued | running | succeeded | failed | cancelled
+    status: Mapped[str] = mapped_column(String(16), default="queued", index=True)
+    request_json: Mapped[str] = mapped_column(Text, default="{}")
+    run_id: Mapped[Optional[int]] = mapped_column(ForeignKey("ingestion_runs.id", ondelete="SET NULL"), nullable=True)
+    # Set while queued/running; the unique constraint lets only one pipeline job be active.
+    active_slot: Mapped[Optional[str]] = mapped_column(String(32), nullable=True, unique=True)
+    stage: Mapped[str] = mapped_column(String(32), default="")
+    progress_done: Mapped[int] = mapped_column(Integer, default=0)
+    progress_total: Mapped[int] = mapped_column(Integer, default=0)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False)
+    error: Mapped[str] = mapped_column(Text, default="")
+    worker_id: Mapped[str] = mapped_column(String(128), default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class SchedulerLease(Base):
+    """Time-bounded ownership of a scheduler role; only the holder fires scheduled jobs."""
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    acquired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+
+class SchedulerJobRun(Base):
+    __tablename__ = "scheduler_job_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    job_name: Mapped[str] = mapped_column(String(64), index=True)
+    scheduled_for: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # enqueued | conflict | failed
+    status: Mapped[str] = mapped_column(String(16))
+    holder: Mapped[str] = mapped_column(String(128), default="")
+    catch_up: Mapped[bool] = mapped_column(Boolean, default=False)
+    workflow_job_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("workflow_jobs.id", ondelete="SET NULL"), nullable=True
+    )
+    error: Mapped[str] = mapped_column(Text, default="")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
 
 class Paper(Base):
@@ -47,6 +131,8 @@ class Paper(Base):
     full_text: Mapped[str] = mapped_column(Text)
     source_url: Mapped[str] = mapped_column(Text, default="")
     embedding_vector: Mapped[Optional[list[float]]] = mapped_column(Vector(1024), nullable=True)
+    parser_name: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    parse_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
 
 class PaperChunk(Base):
@@ -58,6 +144,8 @@ class PaperChunk(Base):
     chunk_index: Mapped[int] = mapped_column(Integer)
     text: Mapped[str] = mapped_column(Text)
     estimated_tokens: Mapped[int] = mapped_column(Integer, default=0)
+    # sha256 of the chunk text; unchanged chunks keep their embedding across paper revisions
+    content_hash: Mapped[str] = mapped_column(String(64), default="", index=True)
     embedding_vector: Mapped[Optional[list[float]]] = mapped_column(Vector(1024), nullable=True)
 
     paper: Mapped[Paper] = relationship()
@@ -65,6 +153,26 @@ class PaperChunk(Base):
     __table_args__ = (UniqueConstraint("paper_id", "chunk_index", name="uq_chunk_position"),)
 
 
+class PaperRevision(Base):
+    __tablename__ = "paper_revisions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    paper_id: Mapped[int] = mapped_column(ForeignKey("papers.id", ondelete="CASCADE"), index=True)
+    from_source_id: Mapped[str] = mapped_column(String(128))
+    to_source_id: Mapped[str] = mapped_column(String(128))
+    chunks_total: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_unchanged: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_added: Mapped[int] = mapped_column(Integer, default=0)
+    chunks_removed: Mapped[int] = mapped_column(Integer, default=0)
+    changed_sections: Mapped[str] = mapped_column(Text, default="")
+    abstract_changed: Mapped[bool] = mapped_column(Boolean, default=False)
+    alpha_reextracted: Mapped[bool] = mapped_column(Boolean, default=False)
+    week_key: Mapped[str] = mapped_column(String(16), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    paper: Mapped[Paper] = relationship()
+
+
 class PaperAlphaCard(Base):
     __tablename__ = "paper_alpha_cards"
 
@@ -80,6 +188,8 @@ class PaperAlphaCard(Base):
     evaluation_risk: Mapped[str] = mapped_column(Text, default="")
     implicit_assumptions: Mapped[str] = mapped_column(Text, default="")
     novelty_bucket: Mapped[str] = mapped_column(String(64), default="medium")
+    # 1 - time-decayed cosine similarity to the nearest earlier paper; null until scored
+    novelty_score: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     generalization_likelihood: Mapped[str] = mapped_column(String(64), default="medium")
     scaling_projection: Mapped[str] = mapped_column(Text, default="")
     strategic_relevance: Mapped[str] = mapped_column(Text, default="")
@@ -99,6 +209,12 @@ class Hypothesis(Base):
     strength_score: Mapped[float] = mapped_column(Float, default=0.0)
     user_override_strength: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     week_introduced: Mapped[str] = mapped_column(String(16), index=True)
+    # Running mean of linked evidence embeddings; searched through an HNSW index.
+    embedding_vector: Mapped[Optional[list[float]]] = mapped_column(Vector(1024), nullable=True)
+    # Sum of link confidences, halved every hypothesis_evidence_half_life_weeks since last_evidence_week.
+    evidence_score: Mapped[float] = mapped_column(Float, default=0.0)
+    evidence_count: Mapped[int] = mapped_column(Integer, default=0)
+    last_evidence_week: Mapped[str] = mapped_column(String(16), default="", index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
 
@@ -111,11 +227,28 @@ class HypothesisPaperLink(Base):
     relation: Mapped[str] = mapped_column(String(32))
     confidence: Mapped[float] = mapped_column(Float, default=0.5)
     provenance: Mapped[str] = mapped_column(Text, default="")
+    week_key: Mapped[str] = mapped_column(String(16), default="", index=True)
 
     hypothesis: Mapped[Hypothesis] = relationship()
     paper: Mapped[Paper] = relationship()
 
 
+class ClusterTopic(Base):
+    """Cluster identity that persists across weeks; each week's ``Cluster`` rows point at one."""
+
+    __tablename__ = "cluster_topics"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(256))
+    # Running mean of member paper embeddings (unit length)
+    centroid: Mapped[list[float]] = mapped_column(Vector(1024))
+    paper_count: Mapped[int] = mapped_column(Integer, default=0)
+    first_week: Mapped[str] = mapped_column(String(16))
+    last_week: Mapped[str] = mapped_column(String(16), index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+
 class Cluster(Base):
     __tablename__ = "clusters"
 
@@ -124,6 +257,9 @@ class Cluster(Base):
     dominant_bottleneck: Mapped[str] = mapped_column(String(256), default="unknown")
     mechanism_summary: Mapped[str] = mapped_column(Text, default="")
     week_key: Mapped[str] = mapped_column(String(16), index=True)
+    topic_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("cluster_topics.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
 
@@ -135,6 +271,21 @@ class ClusterPaperLink(Base):
     paper_id: Mapped[int] = mapped_column(ForeignKey("papers.id", ondelete="CASCADE"), index=True)
 
 
+class TrendRollup(Base):
+    """Per-week count of one value of one dimension (hypothesis_type, bottleneck, mechanism, source, novelty)."""
+
+    __tablename__ = "trend_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    week_key: Mapped[str] = mapped_column(String(16), index=True)
+    dimension: Mapped[str] = mapped_column(String(32))
+    value: Mapped[str] = mapped_column(String(256))
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (UniqueConstraint("week_key", "dimension", "value", name="uq_trend_rollup_week_value"),)
+
+
 class ResearchBrief(Base):
     __tablename__ = "research_briefs"
 
@@ -153,11 +304,32 @@ class ResearchBriefVersion(Base):
     brief_id: Mapped[int] = mapped_column(ForeignKey("research_briefs.id", ondelete="CASCADE"), index=True)
     version_number: Mapped[int] = mapped_column(Integer)
     editor: Mapped[str] = mapped_column(String(128), default="user")
-    markdown_content: Mapped[str] = mapped_column(Text)
+    # Only set on versions written before compressed storage; read through brief_versions.version_markdown.
+    markdown_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # full: payload is the zstd-compressed markdown; delta: zstd-compressed line delta against the previous version
+    storage: Mapped[str] = mapped_column(String(8), default="full")
+    payload: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, index=True)
 
     brief: Mapped[ResearchBrief] = relationship()
 
+    __table_args__ = (Index("ix_research_brief_versions_brief_version", "brief_id", "version_number"),)
+
+
+class BriefSectionCache(Base):
+    """Last rendered fragment of one brief section, reused while the hash of its inputs is unchanged."""
+
+    __tablename__ = "brief_section_cache"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    brief_id: Mapped[int] = mapped_column(ForeignKey("research_briefs.id", ondelete="CASCADE"), index=True)
+    section: Mapped[str] = mapped_column(String(64))
+    input_hash: Mapped[str] = mapped_column(String(64), default="")
+    content: Mapped[str] = mapped_column(Text, default="")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (UniqueConstraint("brief_id", "section", name="uq_brief_section"),)
+
 
 class ResearchMemoryEntry(Base):
     __tablename__ = "research_memory_entries"
@@ -182,5 +354,11 @@ class ExportArtifact(Base):
         ForeignKey("research_brief_versions.id", ondelete="CASCADE"), index=True
     )
     platform: Mapped[str] = mapped_column(String(32), index=True)
+    # Template mode and redaction the content was generated with; a change regenerates it.
+    variant: Mapped[str] = mapped_column(String(64), default="")
     content: Mapped[str] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("brief_version_id", "platform", "variant", name="uq_export_artifact_version_platform"),
+    )
@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from app.api.router import api_router
 from app.config import settings
 from app.db.session import ensure_db_extensions, init_db
+from app.services.jobs import job_worker
+from app.services.pipeline import workflow_service
 from app.services.scheduler import start_scheduler, stop_scheduler
 
 app = FastAPI(title=settings.app_name, version="0.1.0")
@@ -18,9 +20,14 @@ def on_startup() -> None:
 
     if settings.scheduler_mode == "in_process":
         start_scheduler()
+    if settings.job_worker_mode == "embedded":
+        job_worker.start()
 
 
 @app.on_event("shutdown")
 def on_shutdown() -> None:
     if settings.scheduler_mode == "in_process":
         stop_scheduler()
+    if settings.job_worker_mode == "embedded":
+        job_worker.stop()
+    workflow_service.close()
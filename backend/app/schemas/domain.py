@@ -37,6 +37,35 @@ class WorkflowRunResponse(BaseModel):
     notes: str
 
 
+class WorkflowJobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    run_id: Optional[int]
+    stage: str
+    progress_done: int
+    progress_total: int
+    cancel_requested: bool
+    error: str
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class SchedulerRunOut(BaseModel):
+    id: int
+    job_name: str
+    scheduled_for: Optional[datetime]
+    status: str
+    holder: str
+    catch_up: bool
+    workflow_job_id: Optional[int]
+    workflow_job_status: Optional[str]
+    duration_s: Optional[float]
+    error: str
+    created_at: datetime
+
+
 class IngestionPolicyResponse(BaseModel):
     sources: list[str]
     arxiv_categories: list[str]
@@ -63,6 +92,8 @@ class InferencePolicyResponse(BaseModel):
     llm_fallback_provider: str
     llm_weekly_budget_usd: float
     llm_weekly_max_calls: int
+    llm_max_output_tokens: int
+    llm_generation_deadline_s: float
     openrouter_model: str
 
 
@@ -108,6 +139,8 @@ class HypothesisOut(BaseModel):
     user_override_strength: Optional[float]
     support_count: int
     contradiction_count: int
+    week_introduced: str = ""
+    last_evidence_week: str = ""
 
 
 class ClusterOut(BaseModel):
@@ -116,6 +149,28 @@ class ClusterOut(BaseModel):
     dominant_bottleneck: str
     mechanism_summary: str
     paper_count: int
+    # Stable across weeks: clusters of the same topic in different weeks share it.
+    topic_id: Optional[int] = None
+
+
+class TrendSeriesOut(BaseModel):
+    dimension: str
+    value: str
+    total: int
+    # One count per week in TrendsResponse.weeks, oldest first
+    counts: list[int]
+    moving_average: list[float]
+    recent_average: float
+    baseline_average: float
+    change: float
+
+
+class TrendsResponse(BaseModel):
+    end_week: str
+    weeks: list[str]
+    series: list[TrendSeriesOut]
+    emerging: list[TrendSeriesOut]
+    declining: list[TrendSeriesOut]
 
 
 class MemoryEntryOut(BaseModel):
@@ -140,26 +195,37 @@ class BriefVersionOut(BaseModel):
     created_at: datetime
 
 
+class BriefDiffOut(BaseModel):
+    week_key: str
+    from_version: int
+    to_version: int
+    added_lines: int
+    removed_lines: int
+    # Unified diff, from_version -> to_version
+    diff: str
+
+
 class BriefUpdateRequest(BaseModel):
     week_key: str
     editor: str = "user"
     markdown_content: str
 
 
+ExportPlatform = Literal[
+    "twitter",
+    "linkedin",
+    "markdown",
+    "x_research",
+    "x_product",
+    "linkedin_research",
+    "linkedin_product",
+    "linkedin_vc",
+]
+
+
 class ExportRequest(BaseModel):
     brief_version_id: int
-    include_platforms: list[
-        Literal[
-            "twitter",
-            "linkedin",
-            "markdown",
-            "x_research",
-            "x_product",
-            "linkedin_research",
-            "linkedin_product",
-            "linkedin_vc",
-        ]
-    ] = Field(default_factory=lambda: ["twitter", "linkedin", "markdown"])
+    include_platforms: list[ExportPlatform] = Field(default_factory=lambda: ["twitter", "linkedin", "markdown"])
 
 
 class ExportItem(BaseModel):
@@ -195,4 +261,5 @@ class DiagnosticsResponse(BaseModel):
     memory_alpha_nugget_count: int
     memory_weekly_synthesis_count: int
     last_run_notes: Optional[str]
+    last_run_stage_metrics: Optional[dict[str, dict[str, int]]] = None
     last_run_completed_at: Optional[datetime]
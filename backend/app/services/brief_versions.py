@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import difflib
+import json
+from typing import Union
+
+import zstandard
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import ResearchBrief, ResearchBriefVersion
+
+ZSTD_LEVEL = 10
+
+# A delta is a list of ops over the previous version's lines: ``[start, end]`` copies that
+# line range, a string inserts literal text.
+Delta = list[Union[list[int], str]]
+
+
+def encode_delta(base: str, target: str) -> Delta:
+    a, b = base.splitlines(keepends=True), target.splitlines(keepends=True)
+    ops: Delta = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: Delta) -> str:
+    lines = base.splitlines(keepends=True)
+    return "".join("".join(lines[op[0] : op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+def _compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _chain(db: Session, brief_id: int, version_number: int) -> list[ResearchBriefVersion]:
+    """The nearest full snapshot at or before ``version_number`` and every delta after it, in order."""
+    snapshot = db.scalar(
+        select(func.max(ResearchBriefVersion.version_number)).where(
+            ResearchBriefVersion.brief_id == brief_id,
+            ResearchBriefVersion.version_number <= version_number,
+            ResearchBriefVersion.storage == "full",
+        )
+    )
+    if snapshot is None:
+        raise ValueError(f"No snapshot found for brief {brief_id} version {version_number}")
+    return list(
+        db.scalars(
+            select(ResearchBriefVersion)
+            .where(
+                ResearchBriefVersion.brief_id == brief_id,
+                ResearchBriefVersion.version_number.between(snapshot, version_number),
+            )
+            .order_by(ResearchBriefVersion.version_number)
+        ).all()
+    )
+
+
+def _full_text(row: ResearchBriefVersion) -> str:
+    # Versions written before delta storage keep their text uncompressed.
+    if row.payload is None:
+        return row.markdown_content or ""
+    return _decompress(row.payload).decode("utf-8")
+
+
+def _reconstruct(chain: list[ResearchBriefVersion]) -> str:
+    text = _full_text(chain[0])
+    for row in chain[1:]:
+        text = _full_text(row) if row.storage == "full" else apply_delta(text, json.loads(_decompress(row.payload)))
+    return text
+
+
+def version_markdown(db: Session, version: ResearchBriefVersion) -> str:
+    """Reconstruct a version's markdown: its snapshot plus at most ``brief_snapshot_interval - 1`` deltas."""
+    if version.storage == "full":
+        return _full_text(version)
+    return _reconstruct(_chain(db, version.brief_id, version.version_number))
+
+
+def get_version(db: Session, brief: ResearchBrief, version_number: int) -> ResearchBriefVersion:
+    row = db.scalar(
+        select(ResearchBriefVersion).where(
+            ResearchBriefVersion.brief_id == brief.id, ResearchBriefVersion.version_number == version_number
+        )
+    )
+    if not row:
+        raise ValueError(f"Brief {brief.week_key} has no version {version_number}")
+    return row
+
+
+def add_version(db: Session, brief: ResearchBrief, editor: str, markdown: str) -> ResearchBriefVersion:
+    """Append a version, stored as a zstd-compressed delta against the previous one when that is smaller.
+
+    Every ``brief_snapshot_interval``-th version in a chain is a full snapshot, which bounds
+    how many deltas a read has to apply.
+    """
+    previous = db.scalar(
+        select(ResearchBriefVersion)
+        .where(ResearchBriefVersion.brief_id == brief.id)
+        .order_by(desc(ResearchBriefVersion.version_number))
+        .limit(1)
+    )
+    full = _compress(markdown.encode("utf-8"))
+    row = ResearchBriefVersion(
+        brief_id=brief.id,
+        version_number=(previous.version_number + 1) if previous else 1,
+        editor=editor,
+        storage="full",
+        payload=full,
+    )
+    if previous is not None:
+        chain = _chain(db, brief.id, previous.version_number)
+        if len(chain) < max(1, settings.brief_snapshot_interval):
+            delta = _compress(json.dumps(encode_delta(_reconstruct(chain), markdown)).encode("utf-8"))
+            if len(delta) < len(full):
+                row.storage, row.payload = "delta", delta
+    db.add(row)
+    db.flush()
+    return row
+
+
+def unified_diff(db: Session, brief: ResearchBrief, from_version: int, to_version: int) -> tuple[str, int, int]:
+    """Unified diff between two versions, with added and removed line counts."""
+    before = version_markdown(db, get_version(db, brief, from_version)).splitlines()
+    after = version_markdown(db, get_version(db, brief, to_version)).splitlines()
+    lines = list(
+        difflib.unified_diff(before, after, fromfile=f"v{from_version}", tofile=f"v{to_version}", lineterm="")
+    )
+    added = sum(1 for line in lines if line.startswith("+") and not line.startswith("+++"))
+    removed = sum(1 for line in lines if line.startswith("-") and not line.startswith("---"))
+    return "\n".join(lines), added, removed
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def _kmeans_pp_init(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    centers = [x[rng.integers(len(x))]]
+    # Cosine distance on unit vectors; each new seed is drawn proportional to its squared distance.
+    dist = 1.0 - x @ centers[0]
+    for _ in range(1, k):
+        weights = np.maximum(dist, 0.0) ** 2
+        total = weights.sum()
+        idx = rng.integers(len(x)) if total <= 0 else rng.choice(len(x), p=weights / total)
+        centers.append(x[idx])
+        dist = np.minimum(dist, 1.0 - x @ x[idx])
+    return np.stack(centers)
+
+
+def minibatch_kmeans(
+    x: np.ndarray, k: int, batch_size: int = 256, iterations: int = 30, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Spherical mini-batch k-means (Sculley, 2010) over unit-norm rows of ``x``.
+
+    Returns ``(centers, labels)``; empty centers are dropped and labels renumbered.
+    """
+    rng = np.random.default_rng(seed)
+    k = max(1, min(k, len(x)))
+    centers = _kmeans_pp_init(x, k, rng)
+    counts = np.zeros(k)
+    for _ in range(iterations):
+        batch = x[rng.choice(len(x), size=min(batch_size, len(x)), replace=False)]
+        nearest = np.argmax(batch @ centers.T, axis=1)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, nearest, batch)
+        hits = np.bincount(nearest, minlength=k)
+        # Per-center learning rate 1/count, applied to the whole batch at once.
+        counts += hits
+        moved = hits > 0
+        centers[moved] += (sums[moved] - hits[moved, None] * centers[moved]) / counts[moved, None]
+        centers = normalize_rows(centers)
+    labels = np.argmax(x @ centers.T, axis=1)
+    used = np.unique(labels)
+    remap = np.full(k, -1)
+    remap[used] = np.arange(len(used))
+    return centers[used], remap[labels]
+
+
+@dataclass
+class ClusterUpdate:
+    """Result of one incremental refresh.
+
+    ``centroids``/``counts`` list the existing clusters first, in their original order,
+    followed by any new ones; ``labels[i]`` indexes into them.
+    """
+
+    labels: np.ndarray
+    centroids: np.ndarray
+    counts: np.ndarray
+
+
+def refresh_clusters(
+    existing: Optional[np.ndarray],
+    existing_counts: Optional[np.ndarray],
+    vectors: np.ndarray,
+    match_threshold: float,
+    target_size: int = 8,
+    batch_size: int = 256,
+    iterations: int = 30,
+    seed: int = 0,
+) -> ClusterUpdate:
+    """Assign this week's vectors to existing centroids, clustering only what does not fit.
+
+    Points with cosine similarity >= ``match_threshold`` to a stored centroid join it and
+    pull it toward themselves (running mean, weighted by the centroid's paper count). The
+    rest are clustered with mini-batch k-means into roughly ``target_size``-sized groups;
+    a new group whose center lands close to a stored centroid is merged into it instead.
+    Nothing already stored is reclustered, so cost grows with the week, not the history.
+    """
+    x = normalize_rows(np.asarray(vectors, dtype=np.float64))
+    dim = x.shape[1]
+    if existing is None or len(existing) == 0:
+        centroids = np.zeros((0, dim))
+    else:
+        centroids = normalize_rows(np.asarray(existing, dtype=np.float64))
+    counts = np.zeros(len(centroids)) if existing_counts is None else np.asarray(existing_counts, dtype=np.float64).copy()
+    labels = np.full(len(x), -1)
+
+    if len(centroids):
+        sims = x @ centroids.T
+        best = np.argmax(sims, axis=1)
+        matched = sims[np.arange(len(x)), best] >= match_threshold
+        labels[matched] = best[matched]
+
+    rest = np.flatnonzero(labels < 0)
+    new_centroids = np.zeros((0, dim))
+    if len(rest):
+        k = int(np.ceil(len(rest) / max(1, target_size)))
+        centers, sub_labels = minibatch_kmeans(x[rest], k, batch_size=batch_size, iterations=iterations, seed=seed)
+        target = np.arange(len(centers)) + len(centroids)
+        if len(centroids):
+            sims = centers @ centroids.T
+            best = np.argmax(sims, axis=1)
+            merge = sims[np.arange(len(centers)), best] >= match_threshold
+            target[merge] = best[merge]
+            keep = np.flatnonzero(~merge)
+            target[keep] = np.arange(len(keep)) + len(centroids)
+            centers = centers[keep]
+        labels[rest] = target[sub_labels]
+        new_centroids = centers
+
+    all_centroids = np.vstack([centroids, new_centroids]) if len(new_centroids) else centroids.copy()
+    all_counts = np.concatenate([counts, np.zeros(len(new_centroids))])
+    sums = np.zeros_like(all_centroids)
+    np.add.at(sums, labels, x)
+    hits = np.bincount(labels, minlength=len(all_centroids)).astype(np.float64)
+    touched = hits > 0
+    all_centroids[touched] = (
+        all_centroids[touched] * all_counts[touched, None] + sums[touched]
+    ) / (all_counts[touched] + hits[touched])[:, None]
+    all_counts += hits
+    return ClusterUpdate(labels=labels, centroids=normalize_rows(all_centroids), counts=all_counts)
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 
 from sqlalchemy.orm import Session
 
 from app.schemas.domain import (
+    BriefDiffOut,
     BriefUpdateRequest,
     BriefVersionOut,
     ClusterOut,
+    ExportItem,
     ExportRequest,
     ExportResponse,
     InferencePolicyResponse,
@@ -20,6 +22,7 @@ from app.schemas.domain import (
     HypothesisOut,
     MemoryEntryOut,
     DiagnosticsResponse,
+    TrendsResponse,
 )
 
 
@@ -35,7 +38,15 @@ class PaperService(ABC):
 
 class WorkflowService(ABC):
     @abstractmethod
-    def run_weekly(self, db: Session, payload: WorkflowRunRequest) -> WorkflowRunResponse:
+    def run_weekly(
+        self, db: Session, payload: WorkflowRunRequest, progress: Optional[Callable[[int, str, int, int], None]] = None
+    ) -> WorkflowRunResponse:
+        raise NotImplementedError
+
+    @abstractmethod
+    def resume_run(
+        self, db: Session, run_id: int, progress: Optional[Callable[[int, str, int, int], None]] = None
+    ) -> WorkflowRunResponse:
         raise NotImplementedError
 
     @abstractmethod
@@ -72,6 +83,19 @@ class AnalysisService(ABC):
     ) -> list[MemoryEntryOut]:
         raise NotImplementedError
 
+    @abstractmethod
+    def trends(
+        self,
+        db: Session,
+        week_key: Optional[str] = None,
+        window: int = 12,
+        dimension: Optional[str] = None,
+        moving_average_weeks: int = 3,
+        recent_weeks: int = 2,
+        limit: int = 10,
+    ) -> TrendsResponse:
+        raise NotImplementedError
+
 
 class BriefService(ABC):
     @abstractmethod
@@ -82,12 +106,22 @@ class BriefService(ABC):
     def update_brief(self, db: Session, payload: BriefUpdateRequest) -> BriefVersionOut:
         raise NotImplementedError
 
+    @abstractmethod
+    def diff(
+        self, db: Session, week_key: str, from_version: Optional[int] = None, to_version: Optional[int] = None
+    ) -> BriefDiffOut:
+        raise NotImplementedError
+
 
 class ExportService(ABC):
     @abstractmethod
     def generate(self, db: Session, payload: ExportRequest) -> ExportResponse:
         raise NotImplementedError
 
+    @abstractmethod
+    def artifacts(self, db: Session, brief_version_id: int, platforms: list[str]) -> list[ExportItem]:
+        raise NotImplementedError
+
 
 class QAService(ABC):
     @abstractmethod
@@ -0,0 +1,83 @@
+"""Chunking and embedding of fetched documents, the CPU-bound half of the store stage.
+
+Kept free of database models and service singletons: with ``WORKER_PROCESSES`` > 1 this
+module is what each spawned worker imports, so it must stay cheap to load.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.text_utils import Chunk, make_chunks, strip_reference_tail
+from app.services.tokenizers import get_tokenizer
+
+if TYPE_CHECKING:
+    from app.services.sources import SourceDocument
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by can for from has have in into is it its of on or our that the their these this "
+    "to via we was were which with".split()
+)
+
+
+def embed_text(text: str, dim: int = 1024) -> list[float]:
+    """Deterministic lexical embedding for local-first retrieval and clustering.
+
+    Signed feature hashing of unigrams and bigrams (stopwords dropped), sublinear term
+    weights, unit length. Texts that share vocabulary land close together without a model.
+    """
+    tokens = [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+    if not tokens:
+        return [0.0] * dim
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    counts = np.bincount((hashes % dim).astype(np.int64), weights=signs, minlength=dim)
+    vector = np.sign(counts) * np.log1p(np.abs(counts))
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).tolist()
+
+
+def chunk_document(doc: SourceDocument) -> tuple[str, list[Chunk]]:
+    body = doc.full_text
+    if settings.appendix_policy == "main_first_fallback":
+        body = strip_reference_tail(body)
+
+    # Layout spans index into the parsed text; reference stripping only trims the tail.
+    sections = [(name, start, min(end, len(body))) for name, start, end in doc.sections if start < len(body)]
+    chunks = make_chunks(
+        body,
+        target_tokens=settings.chunk_target_tokens,
+        overlap_tokens=settings.chunk_overlap_tokens,
+        tokenizer=get_tokenizer(settings.llm_model, settings.tokenizer_dir),
+        sections=sections if settings.semantic_sectioning else None,
+    )
+    return body, chunks
+
+
+@dataclass
+class PreparedDocument:
+    """CPU-side work for one document, computed ahead of the DB writes (possibly in another process)."""
+
+    body: str
+    chunks: list[Chunk]
+    paper_vector: list[float]
+    # None when chunk embeddings are left to the writer (revisions reuse unchanged ones).
+    chunk_vectors: Optional[list[list[float]]] = None
+
+
+def prepare_document(doc: SourceDocument, embed_chunks: bool = True) -> PreparedDocument:
+    body, chunks = chunk_document(doc)
+    return PreparedDocument(
+        body=body,
+        chunks=chunks,
+        paper_vector=embed_text(f"{doc.title}\n{doc.abstract}", dim=1024),
+        chunk_vectors=[embed_text(c.text[:4000], dim=1024) for c in chunks] if embed_chunks else None,
+    )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from collections.abc import Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_text(content: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    data = content.encode("utf-8")
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset : offset + chunk_size]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable buffer; ``zipfile`` then writes data descriptors instead of seeking back."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: Iterable[tuple[str, str]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Deflated zip of ``(name, text)`` entries, yielded as it is built rather than assembled in memory."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            with archive.open(name, mode="w") as handle:
+                for chunk in iter_text(content, chunk_size):
+                    handle.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    yield sink.drain()
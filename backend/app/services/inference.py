@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from typing import Optional
 from typing import Protocol
 
@@ -12,6 +16,20 @@ class InferenceRequest:
     prompt: str
     model: str
     temperature: float = 0.35
+    max_tokens: Optional[int] = None
+    stop: list[str] = field(default_factory=list)
+    # Stop reading as soon as one complete top-level JSON value has streamed in.
+    stop_on_json: bool = False
+    # Root container expected when stop_on_json is set: "object" or "array".
+    json_root: str = "object"
+    # Wall-clock cap for the whole generation, checked between streamed deltas.
+    deadline_s: Optional[float] = None
+    # Ollama only: how long the model stays resident after this call (e.g. "30m", "0").
+    keep_alive: Optional[str] = None
+    # Ollama only: context window. Changing it between calls reloads the model.
+    num_ctx: Optional[int] = None
+    # Pipeline stage label used for per-stage token accounting.
+    stage: str = "generate"
 
 
 @dataclass
@@ -19,64 +37,361 @@ class InferenceResult:
     text: str
     provider: str
     model: str
+    first_token_latency_s: Optional[float] = None
+    total_latency_s: float = 0.0
+    completion_tokens: int = 0
+    finish_reason: str = "stop"
+    # Time the server spent loading the model for this call, when it reports it.
+    load_duration_s: float = 0.0
+    # Server-reported prompt size; None when the provider did not report it.
+    prompt_tokens: Optional[int] = None
+
+
+@dataclass
+class ModelUsage:
+    calls: int = 0
+    failures: int = 0
+    load_s: float = 0.0
+    generation_s: float = 0.0
+    first_token_s: float = 0.0
+
+
+@dataclass
+class StageUsage:
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class InferenceStats:
+    """Per-run accumulator separating model load time from generation time.
+
+    Also keeps a per-stage prompt/completion token ledger.
+    """
+
+    def __init__(self) -> None:
+        self.by_model: dict[str, ModelUsage] = {}
+        self.by_stage: dict[str, StageUsage] = {}
+        self._lock = threading.Lock()
+
+    def _usage(self, model: str) -> ModelUsage:
+        return self.by_model.setdefault(model, ModelUsage())
+
+    def record_load(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._usage(model).load_s += seconds
+
+    def record(self, result: InferenceResult, stage: str = "generate") -> None:
+        with self._lock:
+            usage = self._usage(result.model)
+            usage.calls += 1
+            usage.load_s += result.load_duration_s
+            usage.generation_s += max(0.0, result.total_latency_s - result.load_duration_s)
+            usage.first_token_s += result.first_token_latency_s or 0.0
+
+            tokens = self.by_stage.setdefault(stage, StageUsage())
+            tokens.calls += 1
+            tokens.prompt_tokens += result.prompt_tokens or 0
+            tokens.completion_tokens += result.completion_tokens
+
+    def stage_metrics(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                stage: {
+                    "calls": usage.calls,
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                }
+                for stage, usage in sorted(self.by_stage.items())
+            }
+
+    def record_failure(self, model: str) -> None:
+        with self._lock:
+            self._usage(model).failures += 1
+
+    def summary(self) -> str:
+        parts = []
+        for model, usage in sorted(self.by_model.items()):
+            ttft = usage.first_token_s / usage.calls if usage.calls else 0.0
+            parts.append(
+                f"llm[{model}] calls={usage.calls} failures={usage.failures} "
+                f"load_s={usage.load_s:.1f} gen_s={usage.generation_s:.1f} ttft_avg_s={ttft:.2f}"
+            )
+        return " ".join(parts)
 
 
 class InferenceClient(Protocol):
     def generate(self, payload: InferenceRequest) -> InferenceResult:
         ...
 
+    def stream(self, payload: InferenceRequest) -> Iterator[str]:
+        ...
+
+
+class _JsonObjectTracker:
+    """Incremental bracket matcher that spots the end of the first top-level JSON value."""
+
+    def __init__(self, root: str = "object") -> None:
+        self.opener, self.closer = ("[", "]") if root == "array" else ("{", "}")
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int:
+        """Return the index just past the closing brace in ``text``, or -1 if not closed yet."""
+        for idx, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+            if ch == self.opener:
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == self.closer:
+                self.depth -= 1
+                if self.depth == 0:
+                    return idx + 1
+        return -1
+
+
+def collect_stream(deltas: Iterator[str], payload: InferenceRequest, provider: str, model: str) -> InferenceResult:
+    """Drain a delta stream, applying the request's token, stop-sequence, JSON and deadline cutoffs.
+
+    Closing the iterator early releases the underlying HTTP response, which is what
+    actually stops the server from generating further tokens.
+    """
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    parts: list[str] = []
+    tokens = 0
+    finish_reason = "stop"
+    tracker = _JsonObjectTracker(payload.json_root) if payload.stop_on_json else None
+    tail_window = max((len(s) for s in payload.stop), default=0)
+    tail = ""
+
+    try:
+        for delta in deltas:
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            tokens += 1
+
+            if tracker is not None:
+                end = tracker.feed(delta)
+                if end != -1:
+                    parts.append(delta[:end])
+                    finish_reason = "json_complete"
+                    break
+            parts.append(delta)
+
+            if tail_window:
+                # Only the recent tail can contain a stop sequence that just completed.
+                tail = (tail + delta)[-(tail_window + len(delta)):]
+                if any(s in tail for s in payload.stop):
+                    finish_reason = "stop_sequence"
+                    break
+            if payload.max_tokens is not None and tokens >= payload.max_tokens:
+                finish_reason = "length"
+                break
+            if payload.deadline_s is not None and time.perf_counter() - started >= payload.deadline_s:
+                finish_reason = "deadline"
+                break
+    finally:
+        close = getattr(deltas, "close", None)
+        if close:
+            close()
+
+    text = "".join(parts)
+    if finish_reason == "stop_sequence":
+        cut = min((text.find(s) for s in payload.stop if s in text), default=len(text))
+        text = text[:cut]
+
+    return InferenceResult(
+        text=text,
+        provider=provider,
+        model=model,
+        first_token_latency_s=(first_token_at - started) if first_token_at is not None else None,
+        total_latency_s=time.perf_counter() - started,
+        completion_tokens=tokens,
+        finish_reason=finish_reason,
+    )
+
+
+def build_http_client(
+    max_connections: int = 4,
+    max_keepalive_connections: int = 4,
+    connect_timeout_s: float = 5.0,
+    read_timeout_s: float = 120.0,
+    headers: Optional[dict[str, str]] = None,
+) -> httpx.Client:
+    """Long-lived keep-alive client; the pool size doubles as the concurrency cap per provider."""
+    return httpx.Client(
+        headers=headers,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        # pool timeout bounds how long a call waits for a free connection.
+        timeout=httpx.Timeout(read_timeout_s, connect=connect_timeout_s, pool=read_timeout_s),
+    )
+
 
 class OllamaClient:
-    def __init__(self, base_url: str = "http://localhost:11434") -> None:
+    def __init__(self, base_url: str = "http://localhost:11434", http_client: Optional[httpx.Client] = None) -> None:
         self.base_url = base_url.rstrip("/")
+        self.http_client = http_client or build_http_client()
+
+    def close(self) -> None:
+        self.http_client.close()
+
+    def _options(self, payload: InferenceRequest) -> dict:
+        options: dict = {"temperature": payload.temperature}
+        if payload.max_tokens is not None:
+            options["num_predict"] = payload.max_tokens
+        if payload.stop:
+            options["stop"] = payload.stop
+        if payload.num_ctx is not None:
+            options["num_ctx"] = payload.num_ctx
+        return options
+
+    def _stream(self, payload: InferenceRequest, metrics: Optional[dict]) -> Iterator[str]:
+        body: dict = {
+            "model": payload.model,
+            "prompt": payload.prompt,
+            "stream": True,
+            "options": self._options(payload),
+        }
+        if payload.keep_alive is not None:
+            body["keep_alive"] = payload.keep_alive
+        with self.http_client.stream("POST", f"{self.base_url}/api/generate", json=body) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                delta = chunk.get("response", "")
+                if delta:
+                    yield delta
+                if chunk.get("done"):
+                    if metrics is not None:
+                        metrics.update(chunk)
+                    return
+
+    def stream(self, payload: InferenceRequest) -> Iterator[str]:
+        return self._stream(payload, None)
 
     def generate(self, payload: InferenceRequest) -> InferenceResult:
-        response = httpx.post(
-            f"{self.base_url}/api/generate",
-            json={
-                "model": payload.model,
-                "prompt": payload.prompt,
-                "stream": False,
-                "options": {"temperature": payload.temperature},
-            },
-            timeout=120,
-        )
+        metrics: dict = {}
+        result = collect_stream(self._stream(payload, metrics), payload, provider="ollama", model=payload.model)
+        # Ollama reports durations (ns) and exact token counts on the final chunk; it is absent on early cutoff.
+        result.load_duration_s = metrics.get("load_duration", 0) / 1e9
+        if "prompt_eval_count" in metrics:
+            result.prompt_tokens = metrics["prompt_eval_count"]
+        if "eval_count" in metrics:
+            result.completion_tokens = metrics["eval_count"]
+        return result
+
+    def warm_up(self, model: str, keep_alive: Optional[str] = None, num_ctx: Optional[int] = None) -> float:
+        """Load ``model`` without generating and return the server-reported load time in seconds.
+
+        ``num_ctx`` must match the value later requests use, otherwise Ollama reloads the model.
+        """
+        body: dict = {"model": model, "prompt": "", "stream": False}
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        if num_ctx is not None:
+            body["options"] = {"num_ctx": num_ctx}
+        started = time.perf_counter()
+        response = self.http_client.post(f"{self.base_url}/api/generate", json=body)
+        response.raise_for_status()
+        load_ns = response.json().get("load_duration")
+        return load_ns / 1e9 if load_ns is not None else time.perf_counter() - started
+
+    def unload(self, model: str) -> None:
+        self.warm_up(model, keep_alive="0")
+
+    def embed(self, model: str, texts: list[str], keep_alive: Optional[str] = None) -> list[list[float]]:
+        """One ``/api/embed`` call for the whole batch; vectors come back in input order."""
+        body: dict = {"model": model, "input": texts}
+        if keep_alive is not None:
+            body["keep_alive"] = keep_alive
+        response = self.http_client.post(f"{self.base_url}/api/embed", json=body)
         response.raise_for_status()
-        body = response.json()
-        return InferenceResult(
-            text=body.get("response", ""),
-            provider="ollama",
-            model=payload.model,
-        )
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != len(texts):
+            raise RuntimeError(f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs")
+        return embeddings
 
 
 class OpenRouterClient:
-    def __init__(self, api_key: str, model: str, base_url: str = "https://openrouter.ai/api/v1") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        base_url: str = "https://openrouter.ai/api/v1",
+        http_client: Optional[httpx.Client] = None,
+    ) -> None:
         self.api_key = api_key
         self.model = model
         self.base_url = base_url.rstrip("/")
+        self.http_client = http_client or build_http_client()
 
-    def generate(self, payload: InferenceRequest) -> InferenceResult:
+    def close(self) -> None:
+        self.http_client.close()
+
+    def stream(self, payload: InferenceRequest) -> Iterator[str]:
         if not self.api_key:
             raise ValueError("OpenRouter API key is required when cloud fallback is enabled")
 
-        response = httpx.post(
+        body: dict = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": payload.prompt}],
+            "temperature": payload.temperature,
+            "stream": True,
+        }
+        if payload.max_tokens is not None:
+            body["max_tokens"] = payload.max_tokens
+        if payload.stop:
+            body["stop"] = payload.stop[:4]
+
+        with self.http_client.stream(
+            "POST",
             f"{self.base_url}/chat/completions",
             headers={
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": self.model,
-                "messages": [{"role": "user", "content": payload.prompt}],
-                "temperature": payload.temperature,
-            },
-            timeout=120,
-        )
-        response.raise_for_status()
-        body = response.json()
-        text = body.get("choices", [{}])[0].get("message", {}).get("content", "")
-        return InferenceResult(text=text, provider="openrouter", model=self.model)
+            json=body,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                # Server-sent events; lines starting with ":" are keep-alive comments.
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise RuntimeError(f"OpenRouter error: {chunk['error']}")
+                delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content") or ""
+                if delta:
+                    yield delta
+
+    def generate(self, payload: InferenceRequest) -> InferenceResult:
+        return collect_stream(self.stream(payload), payload, provider="openrouter", model=self.model)
 
 
 class FailoverInferenceClient:
@@ -90,6 +405,59 @@ class FailoverInferenceClient:
         self.primary_client = primary_client
         self.fallback_client = fallback_client
 
+    def stream(self, payload: InferenceRequest) -> Iterator[str]:
+        # Fail over only while nothing has been emitted; a mid-stream failure must
+        # surface rather than splice two different generations together.
+        primary = self.primary_client.stream(payload)
+        try:
+            first = next(primary)
+        except StopIteration:
+            return
+        except Exception:
+            if not self.fallback_client:
+                raise
+            yield from self.fallback_client.stream(payload)
+            return
+        try:
+            yield first
+            yield from primary
+        finally:
+            close = getattr(primary, "close", None)
+            if close:
+                close()
+
+    def warm_up(self, model: str, keep_alive: Optional[str] = None, num_ctx: Optional[int] = None) -> Optional[float]:
+        warm_up = getattr(self.primary_client, "warm_up", None)
+        if not warm_up:
+            return None
+        try:
+            return warm_up(model, keep_alive=keep_alive, num_ctx=num_ctx)
+        except Exception:
+            # A cold primary is not fatal; the first real call will load the model or fail over.
+            return None
+
+    def unload(self, model: str) -> None:
+        unload = getattr(self.primary_client, "unload", None)
+        if not unload:
+            return
+        try:
+            unload(model)
+        except Exception:
+            pass
+
+    def embed(self, model: str, texts: list[str], keep_alive: Optional[str] = None) -> list[list[float]]:
+        # Embeddings stay local: vectors from different providers are not comparable.
+        embed = getattr(self.primary_client, "embed", None)
+        if not embed:
+            raise RuntimeError("primary inference client does not support embeddings")
+        return embed(model, texts, keep_alive=keep_alive)
+
+    def close(self) -> None:
+        for client in (self.primary_client, self.fallback_client):
+            close = getattr(client, "close", None)
+            if close:
+                close()
+
     def generate(self, payload: InferenceRequest) -> InferenceResult:
         try:
             return self.primary_client.generate(payload)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import desc, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import IngestionRun, WorkflowJob
+from app.db.session import SessionLocal
+from app.schemas.domain import WorkflowJobOut, WorkflowRunRequest
+from app.services.contracts import WorkflowService
+from app.services.pipeline import workflow_service
+
+_PIPELINE_SLOT = "pipeline"
+
+
+class JobConflictError(RuntimeError):
+    """Raised when a pipeline job is submitted while another one is queued or running."""
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to stop a run whose job was cancelled."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(ts: Optional[datetime]) -> Optional[datetime]:
+    # sqlite drops tzinfo on round-trip
+    return ts.replace(tzinfo=timezone.utc) if ts and ts.tzinfo is None else ts
+
+
+def job_out(job: WorkflowJob) -> WorkflowJobOut:
+    return WorkflowJobOut(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        run_id=job.run_id,
+        stage=job.stage,
+        progress_done=job.progress_done,
+        progress_total=job.progress_total,
+        cancel_requested=job.cancel_requested,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+class WorkflowJobQueue:
+    """DB-persisted queue for pipeline runs with at most one active job.
+
+    The API only inserts rows; a ``JobWorker`` claims and executes them, reporting stage
+    progress and a heartbeat back to the row so pollers can follow along.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workflow: WorkflowService = workflow_service,
+    ) -> None:
+        self.session_factory = session_factory
+        self.workflow = workflow
+
+    def submit(
+        self, db: Session, kind: str, payload: Optional[WorkflowRunRequest] = None, run_id: Optional[int] = None
+    ) -> WorkflowJob:
+        if kind == "resume_run":
+            run = db.get(IngestionRun, run_id) if run_id is not None else None
+            if not run:
+                raise ValueError(f"Run not found: {run_id}")
+        self.reap_stale(db)
+        job = WorkflowJob(
+            kind=kind,
+            status="queued",
+            request_json=(payload or WorkflowRunRequest()).model_dump_json(),
+            run_id=run_id,
+            active_slot=_PIPELINE_SLOT,
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            active = db.scalar(select(WorkflowJob).where(WorkflowJob.active_slot == _PIPELINE_SLOT))
+            detail = f"job {active.id} is {active.status}" if active else "another job is active"
+            raise JobConflictError(f"A pipeline run is already in progress ({detail})") from exc
+        db.refresh(job)
+        return job
+
+    def get(self, db: Session, job_id: int) -> WorkflowJob:
+        job = db.get(WorkflowJob, job_id)
+        if not job:
+            raise ValueError(f"Job not found: {job_id}")
+        return job
+
+    def list_jobs(self, db: Session, limit: int = 20) -> list[WorkflowJob]:
+        return list(db.scalars(select(WorkflowJob).order_by(desc(WorkflowJob.id)).limit(limit)).all())
+
+    def cancel(self, db: Session, job_id: int) -> WorkflowJob:
+        job = self.get(db, job_id)
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.active_slot = None
+            job.finished_at = _utcnow()
+        elif job.status == "running":
+            # Cooperative: the worker stops at the next progress report; the run stays resumable.
+            job.cancel_requested = True
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def reap_stale(self, db: Session) -> int:
+        """Fail running jobs whose worker stopped heart-beating (crash, container restart)."""
+        cutoff = _utcnow() - timedelta(seconds=settings.job_stale_after_s)
+        stale = [
+            job
+            for job in db.scalars(select(WorkflowJob).where(WorkflowJob.status == "running")).all()
+            if (_aware(job.heartbeat_at) or _aware(job.started_at) or cutoff) < cutoff
+        ]
+        for job in stale:
+            job.status = "failed"
+            job.active_slot = None
+            job.error = job.error or "worker heartbeat lost"
+            job.finished_at = _utcnow()
+        if stale:
+            db.commit()
+        return len(stale)
+
+    def claim_next(self, worker_id: str) -> Optional[int]:
+        with self.session_factory() as db:
+            self.reap_stale(db)
+            job = db.scalar(
+                select(WorkflowJob)
+                .where(WorkflowJob.status == "queued")
+                .order_by(WorkflowJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if not job:
+                db.rollback()
+                return None
+            job.status = "running"
+            job.worker_id = worker_id
+            job.started_at = job.heartbeat_at = _utcnow()
+            db.commit()
+            return job.id
+
+    def _update(self, job_id: int, **fields) -> bool:
+        """Write progress fields on a short-lived session; returns whether cancel was requested."""
+        with self.session_factory() as db:
+            job = db.get(WorkflowJob, job_id)
+            if not job:
+                return False
+            for key, value in fields.items():
+                setattr(job, key, value)
+            job.heartbeat_at = _utcnow()
+            db.commit()
+            return bool(job.cancel_requested)
+
+    def execute(self, job_id: int) -> None:
+        with self.session_factory() as db:
+            job = self.get(db, job_id)
+            kind, run_id, request_json = job.kind, job.run_id, job.request_json
+
+        def progress(current_run_id: int, stage: str, done: int, total: int) -> None:
+            if self._update(job_id, run_id=current_run_id, stage=stage, progress_done=done, progress_total=total):
+                raise JobCancelled(f"job {job_id} cancelled during {stage}")
+
+        stop_heartbeat = threading.Event()
+
+        def heartbeat() -> None:
+            # Covers long stretches without progress reports (e.g. a slow PDF fetch).
+            while not stop_heartbeat.wait(settings.job_heartbeat_s):
+                self._update(job_id)
+
+        beat = threading.Thread(target=heartbeat, name=f"job-{job_id}-heartbeat", daemon=True)
+        beat.start()
+        status, error = "succeeded", ""
+        try:
+            with self.session_factory() as db:
+                if kind == "resume_run":
+                    self.workflow.resume_run(db, run_id, progress=progress)
+                else:
+                    self.workflow.run_weekly(db, WorkflowRunRequest.model_validate_json(request_json), progress=progress)
+        except JobCancelled as exc:
+            status, error = "cancelled", str(exc)
+        except Exception as exc:
+            status, error = "failed", f"{type(exc).__name__}: {exc}"[:2000]
+        finally:
+            stop_heartbeat.set()
+            beat.join(timeout=5)
+            self._update(job_id, status=status, error=error, active_slot=None, finished_at=_utcnow())
+
+
+class JobWorker:
+    """Polls the queue and executes one job at a time on a background thread."""
+
+    def __init__(self, queue: WorkflowJobQueue, poll_interval_s: Optional[float] = None) -> None:
+        self.queue = queue
+        self.poll_interval_s = poll_interval_s
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> bool:
+        job_id = self.queue.claim_next(self.worker_id)
+        if job_id is None:
+            return False
+        self.queue.execute(job_id)
+        return True
+
+    def run_forever(self) -> None:
+        interval = self.poll_interval_s if self.poll_interval_s is not None else settings.job_poll_interval_s
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception:
+                pass  # DB hiccup; try again on the next poll
+            self._stop.wait(interval)
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="workflow-job-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+
+job_queue = WorkflowJobQueue()
+job_worker = JobWorker(job_queue)
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Optional
+
+try:  # POSIX only; without it the memory cap is skipped.
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX
+    resource = None
+
+try:  # POSIX only; without it concurrent saves are not serialised.
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+@dataclass
+class ParserRecord:
+    attempts: int = 0
+    wins: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    # Still running when another parser won the race; killed without a result.
+    losses: int = 0
+    total_s: float = 0.0
+
+    def merge(self, other: ParserRecord) -> None:
+        self.attempts += other.attempts
+        self.wins += other.wins
+        self.failures += other.failures
+        self.timeouts += other.timeouts
+        self.losses += other.losses
+        self.total_s += other.total_s
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.attempts if self.attempts else 0.0
+
+
+class ParserStats:
+    """Per-parser outcome counters, persisted as JSON so parser order adapts across runs.
+
+    Several processes (API, workers) may share one file; ``save`` merges this process's
+    outcomes since its last save into what is on disk, so no process overwrites another's.
+    """
+
+    def __init__(self, path: Optional[Path] = None, min_attempts: int = 5) -> None:
+        self.path = path
+        self.min_attempts = min_attempts
+        self.records: dict[str, ParserRecord] = self._load()
+        # Outcomes recorded since the last save, not yet on disk.
+        self._unsaved: dict[str, ParserRecord] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, ParserRecord]:
+        if not (self.path and self.path.is_file()):
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            return {name: ParserRecord(**values) for name, values in raw.items()}
+        except Exception:
+            return {}
+
+    def record(self, parser: str, outcome: str, seconds: float) -> None:
+        delta = ParserRecord(attempts=1, total_s=seconds)
+        if outcome == "win":
+            delta.wins = 1
+        elif outcome == "timeout":
+            delta.timeouts = 1
+        elif outcome == "loss":
+            delta.losses = 1
+        else:
+            delta.failures = 1
+        with self._lock:
+            self.records.setdefault(parser, ParserRecord()).merge(delta)
+            self._unsaved.setdefault(parser, ParserRecord()).merge(delta)
+
+    def order(self, parsers: list[str]) -> list[str]:
+        """Configured order, unless another parser has a clearly better record.
+
+        Parsers with fewer than ``min_attempts`` samples keep their configured slot.
+        """
+        with self._lock:
+            records = {name: self.records.get(name, ParserRecord()) for name in parsers}
+        if any(rec.attempts < self.min_attempts for rec in records.values()):
+            return list(parsers)
+
+        def key(item: tuple[int, str]) -> tuple[float, float, int]:
+            idx, name = item
+            rec = records[name]
+            # Win rate in 0.1 buckets so noise does not flip the order; then mean latency.
+            return (-round(rec.win_rate, 1), rec.total_s / rec.attempts, idx)
+
+        return [name for _, name in sorted(enumerate(parsers), key=key)]
+
+    def save(self) -> None:
+        """Merge unsaved outcomes into the file under an exclusive lock, then atomically replace it."""
+        if not self.path:
+            return
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if not unsaved:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix(".lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                merged = self._load()
+                for name, delta in unsaved.items():
+                    merged.setdefault(name, ParserRecord()).merge(delta)
+                payload = {name: asdict(rec) for name, rec in merged.items()}
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp", delete=False
+                ) as tmp:
+                    json.dump(payload, tmp, indent=2)
+                os.replace(tmp.name, self.path)
+        except BaseException:
+            with self._lock:  # keep the outcomes for the next save
+                for name, delta in unsaved.items():
+                    self._unsaved.setdefault(name, ParserRecord()).merge(delta)
+            raise
+        # Pick up what other processes saved, plus anything recorded while saving.
+        with self._lock:
+            for name, delta in self._unsaved.items():
+                merged.setdefault(name, ParserRecord()).merge(delta)
+            self.records = merged
+
+
+def default_stats_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "artifacts" / "parser_stats.json"
+
+
+def _parse_in_child(conn: Connection, pdf_bytes: bytes, parser: str, memory_mb: int, options: dict) -> None:
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    try:
+        from app.services.sources import _extract_pdf_text
+
+        parsed = _extract_pdf_text(pdf_bytes, parser_primary=parser, parser_fallback="", **options)
+        conn.send(parsed)
+    except BaseException:  # MemoryError included: report failure instead of dying silently
+        conn.send(None)
+    finally:
+        conn.close()
+
+
+def process_context():
+    methods = multiprocessing.get_all_start_methods()
+    # forkserver/spawn children do not inherit the parent's threads or locks (scheduler, DB pool).
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def parse_pdf_isolated(
+    pdf_bytes: bytes,
+    parsers: list[str],
+    timeout_s: float,
+    memory_mb: int = 0,
+    race_after_s: Optional[float] = None,
+    stats: Optional[ParserStats] = None,
+    **options,
+):
+    """Parse in worker processes with a hard per-document timeout and address-space cap.
+
+    Parsers start in order (adapted by ``stats`` when given). The next parser starts as
+    soon as the current one fails, or races it once ``race_after_s`` has passed. The
+    first non-empty result wins and remaining workers are killed. Returns a ``ParsedPdf``
+    with ``parser`` and ``parse_seconds`` set; empty text when every parser fails or the
+    timeout is hit.
+    """
+    from app.services.sources import ParsedPdf
+
+    ctx = process_context()
+    pending = stats.order(parsers) if stats else list(parsers)
+    running: dict[Connection, tuple[multiprocessing.process.BaseProcess, str, float]] = {}
+    started = time.monotonic()
+    deadline = started + timeout_s
+    next_race = started + race_after_s if race_after_s else None
+
+    def launch() -> None:
+        nonlocal next_race
+        parser = pending.pop(0)
+        recv_conn, send_conn = ctx.Pipe(duplex=False)
+        proc = ctx.Process(target=_parse_in_child, args=(send_conn, pdf_bytes, parser, memory_mb, options), daemon=True)
+        proc.start()
+        send_conn.close()
+        running[recv_conn] = (proc, parser, time.monotonic())
+        if race_after_s:
+            next_race = time.monotonic() + race_after_s
+
+    def stop(conn: Connection) -> None:
+        proc, _, _ = running.pop(conn)
+        if proc.is_alive():
+            proc.kill()
+        proc.join(timeout=5)
+        conn.close()
+
+    winner = None
+    try:
+        while pending or running:
+            if not running:
+                launch()
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake = deadline if next_race is None or not pending else min(deadline, next_race)
+            ready = wait(list(running), timeout=max(0.0, wake - now))
+            if not ready:
+                if pending and next_race is not None and time.monotonic() >= next_race:
+                    launch()
+                continue
+            for conn in ready:
+                _, parser, parser_started = running[conn]
+                try:
+                    parsed = conn.recv()
+                except EOFError:  # killed by the memory cap or a crash
+                    parsed = None
+                elapsed = time.monotonic() - parser_started
+                stop(conn)
+                if parsed is not None and parsed.text.strip() and winner is None:
+                    parsed.parse_seconds = elapsed
+                    winner = parsed
+                    if stats:
+                        stats.record(parser, "win", elapsed)
+                elif stats:
+                    stats.record(parser, "failure", elapsed)
+            if winner is not None:
+                break
+    finally:
+        now = time.monotonic()
+        for conn in list(running):
+            _, parser, parser_started = running[conn]
+            if stats:
+                stats.record(parser, "timeout" if winner is None else "loss", now - parser_started)
+            stop(conn)
+        if stats:
+            stats.save()
+
+    return winner or ParsedPdf(text="", parse_seconds=time.monotonic() - started)
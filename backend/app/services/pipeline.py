@@ -1,31 +1,45 @@
 from __future__ import annotations
 
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from datetime import datetime, timezone
 import re
 import hashlib
 import json
+import math
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
+import httpx
+import numpy as np
 from sqlalchemy import delete, desc, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db.models import (
+    BriefSectionCache,
     Cluster,
     ClusterPaperLink,
+    ClusterTopic,
+    ExportArtifact,
     Hypothesis,
     HypothesisPaperLink,
     IngestionRun,
+    IngestionRunDocument,
     Paper,
     PaperAlphaCard,
     PaperChunk,
+    PaperRevision,
     ResearchBrief,
     ResearchBriefVersion,
     ResearchMemoryEntry,
 )
 from app.schemas.domain import (
+    BriefDiffOut,
     BriefUpdateRequest,
     BriefVersionOut,
     ClusterOut,
@@ -44,6 +58,7 @@ from app.schemas.domain import (
     WorkflowRunResponse,
     MemoryEntryOut,
     DiagnosticsResponse,
+    TrendsResponse,
 )
 from app.services.contracts import (
     AnalysisService,
@@ -54,9 +69,38 @@ from app.services.contracts import (
     WorkflowService,
     DiagnosticsService,
 )
-from app.services.inference import FailoverInferenceClient, InferenceRequest, OllamaClient, OpenRouterClient
-from app.services.sources import ArxivConnector, OpenReviewConnector, RSSConnector, SourceDocument, default_rss_sources
-from app.services.text_utils import make_chunks, strip_reference_tail
+from app.services.inference import (
+    FailoverInferenceClient,
+    InferenceRequest,
+    InferenceStats,
+    OllamaClient,
+    OpenRouterClient,
+    build_http_client,
+)
+from app.services.brief_versions import add_version as add_brief_version
+from app.services.brief_versions import unified_diff, version_markdown
+from app.services.clustering import normalize_rows, refresh_clusters
+from app.services.document_prep import STOPWORDS, TOKEN_RE, PreparedDocument, embed_text, prepare_document
+from app.services.pdf_worker import ParserStats, default_stats_path, process_context
+from app.services.sources import (
+    ArxivConnector,
+    OpenReviewConnector,
+    PdfParseOptions,
+    RSSConnector,
+    SourceDocument,
+    default_rss_sources,
+)
+from app.services.text_utils import Chunk, estimate_tokens
+from app.services.tokenizers import Tokenizer, get_tokenizer
+from app.services.topics import (
+    TopicEmbeddings,
+    TopicMatcher,
+    blend_relevance,
+    default_topic_embeddings_path,
+    parse_keyword_weights,
+)
+from app.services.trends import backfill_rollups, rollup_week, trend_report, week_keys_ending
+from app.services.vector_index import IncrementalVectorIndex, InMemoryVectorIndex, VectorIndex, open_vector_index
 
 
 def _week_key(ts: Optional[datetime] = None) -> str:
@@ -65,33 +109,102 @@ def _week_key(ts: Optional[datetime] = None) -> str:
     return f"{year}-W{week:02d}"
 
 
-def _novelty_bucket(text: str) -> str:
-    lowered = text.lower()
-    if any(k in lowered for k in ["first", "novel", "new"]):
+def _as_utc(ts: datetime) -> datetime:
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _novelty_bucket(score: float) -> str:
+    if score >= settings.novelty_high_threshold:
         return "high"
-    if any(k in lowered for k in ["incremental", "baseline", "ablation"]):
+    if score < settings.novelty_low_threshold:
         return "low"
     return "medium"
 
 
-def _embed_text(text: str, dim: int = 1024) -> list[float]:
-    """Deterministic lightweight embedding placeholder for local-first retrieval.
+_ARXIV_VERSION_RE = re.compile(r"v\d+$")
+# Sections whose edits can change an alpha card; typo fixes in appendices or related work do not.
+_ALPHA_SECTIONS = {"main", "abstract", "introduction", "method", "approach", "results", "conclusion"}
+
+
+def _arxiv_base_id(arxiv_id: str) -> str:
+    return _ARXIV_VERSION_RE.sub("", arxiv_id or "")
+
+
+def _arxiv_version(arxiv_id: str) -> int:
+    match = _ARXIV_VERSION_RE.search(arxiv_id or "")
+    return int(match.group(0)[1:]) if match else 0
+
+
+@lru_cache(maxsize=4)
+def _topic_matcher(keywords: str, weights: str, word_boundaries: bool) -> TopicMatcher:
+    return TopicMatcher(
+        keywords.split(","),
+        weights=parse_keyword_weights(weights),
+        word_boundaries=word_boundaries,
+    )
+
+
+def _chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
 
-    Replace with model-based embeddings in a later pass.
+
+@dataclass
+class _PaperSnapshot:
+    """Plain copy of the ``Paper`` fields the prompt builders read.
+
+    LLM calls run on a background thread while the writer keeps using the session, so
+    they must not touch ORM instances (a commit expires them and a read would lazy-load).
     """
-    if not text:
-        return [0.0] * dim
-    values: list[float] = []
-    seed = text.encode("utf-8", errors="ignore")
-    counter = 0
-    while len(values) < dim:
-        digest = hashlib.sha256(seed + counter.to_bytes(4, "little")).digest()
-        for b in digest:
-            values.append((b / 127.5) - 1.0)
-            if len(values) >= dim:
-                break
-        counter += 1
-    return values
+
+    id: int
+    title: str
+    abstract: str
+    source: str
+
+    @classmethod
+    def of(cls, paper: Paper) -> "_PaperSnapshot":
+        return cls(id=paper.id, title=paper.title, abstract=paper.abstract or "", source=paper.source)
+
+
+# (run_id, stage, done, total); may raise to abort the run, e.g. when its job was cancelled.
+ProgressCallback = Callable[[int, str, int, int], None]
+
+
+@dataclass
+class _RunContext:
+    payload: WorkflowRunRequest
+    checkpoint: dict
+    llm_stats: InferenceStats
+    run_id: int
+    progress: Optional[ProgressCallback] = None
+
+    def report(self, stage: str, done: int, total: int) -> None:
+        if self.progress:
+            self.progress(self.run_id, stage, done, total)
+
+
+def _document_to_json(doc: SourceDocument) -> str:
+    data = asdict(doc)
+    for key in ("published_at", "updated_at"):
+        data[key] = data[key].isoformat() if data[key] else None
+    return json.dumps(data)
+
+
+def _document_from_json(raw: str) -> SourceDocument:
+    data = json.loads(raw)
+    for key in ("published_at", "updated_at"):
+        data[key] = datetime.fromisoformat(data[key]) if data.get(key) else None
+    data["sections"] = [tuple(span) for span in data.get("sections", [])]
+    return SourceDocument(**data)
+
+
+def _merge_stage_metrics(base: dict[str, dict[str, int]], extra: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+    merged = {stage: dict(values) for stage, values in base.items()}
+    for stage, values in extra.items():
+        target = merged.setdefault(stage, {})
+        for key, value in values.items():
+            target[key] = target.get(key, 0) + value
+    return merged
 
 
 def _heuristic_alpha(doc: Paper, chunks: list[PaperChunk]) -> dict[str, str]:
@@ -113,7 +226,8 @@ def _heuristic_alpha(doc: Paper, chunks: list[PaperChunk]) -> dict[str, str]:
         "claimed_improvement": doc.abstract[:600],
         "evaluation_risk": "Potential benchmark overfitting; requires robustness checks.",
         "implicit_assumptions": "Assumes gains transfer to out-of-distribution tasks.",
-        "novelty_bucket": _novelty_bucket(doc.title + " " + doc.abstract),
+        # Provisional; _score_novelty sets the bucket once the run's papers are stored.
+        "novelty_bucket": "medium",
         "generalization_likelihood": "medium",
         "scaling_projection": "Expected gains increase with additional inference budget.",
         "strategic_relevance": "Relevant for frontier inference-time optimization roadmap.",
@@ -135,67 +249,341 @@ def _extract_json_object(text: str) -> Optional[dict]:
         return None
 
 
-def _build_hypotheses(alpha_cards: list[PaperAlphaCard], week_key: str) -> list[tuple[Hypothesis, list[tuple[int, str, float, str]]]]:
-    grouped: dict[str, list[PaperAlphaCard]] = {}
-    for card in alpha_cards:
-        grouped.setdefault(card.mechanism_type, []).append(card)
-
-    out = []
-    for mechanism, cards in grouped.items():
-        title = f"{mechanism} approaches continue to improve frontier model reasoning efficiency"
-        strength = min(1.0, 0.4 + 0.08 * len(cards))
-        hyp = Hypothesis(text=title, type="mechanism", strength_score=strength, week_introduced=week_key)
-        links: list[tuple[int, str, float, str]] = []
-        for card in cards:
-            relation = "support"
-            conf = min(0.95, 0.5 + 0.05 * len(cards))
-            prov = card.provenance_snippets[:220]
-            links.append((card.paper_id, relation, conf, prov))
-        out.append((hyp, links))
+def _extract_json_array(text: str) -> Optional[list]:
+    if not text:
+        return None
+    match = re.search(r"\[[\s\S]*\]", text)
+    if not match:
+        return None
+    try:
+        arr = json.loads(match.group(0))
+        return arr if isinstance(arr, list) else None
+    except Exception:
+        return None
+
+
+_NLI_LABELS = {"contradict", "support", "neutral"}
+
+
+def _parse_nli_items(text: str, pair_ids: list[int]) -> dict[int, tuple[str, float]]:
+    """``{pair_id: (label, confidence)}`` for well-formed items of a packed NLI reply."""
+    wanted = set(pair_ids)
+    out: dict[int, tuple[str, float]] = {}
+    for item in _extract_json_array(text) or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            pair_id = int(item.get("id"))
+            confidence = float(item.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            continue
+        label = str(item.get("label", "")).strip().lower()
+        if pair_id in wanted and label in _NLI_LABELS:
+            out[pair_id] = (label, min(1.0, max(0.0, confidence)))
+    return out
 
+
+def _parse_packed_items(text: str, paper_ids: list[int]) -> dict[int, dict]:
+    """Validate a packed JSON-array reply item by item; invalid or missing items are left out."""
+    out: dict[int, dict] = {}
+    for item in _extract_json_array(text) or []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            item_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if item_id not in paper_ids or item_id in out:
+            continue
+        if not any(isinstance(item.get(k), str) and item.get(k).strip() for k in ("hypothesis", "methods", "results")):
+            continue
+        out[item_id] = item
     return out
 
 
-def _cluster_cards(alpha_cards: list[PaperAlphaCard], week_key: str) -> list[tuple[Cluster, list[int]]]:
-    grouped: dict[str, list[PaperAlphaCard]] = {}
+def _week_start(week_key: str) -> Optional[datetime]:
+    try:
+        year, week = week_key.split("-W")
+        return datetime.fromisocalendar(int(year), int(week), 1)
+    except (ValueError, AttributeError):
+        return None
+
+
+def _weeks_between(earlier: str, later: str) -> int:
+    start, end = _week_start(earlier), _week_start(later)
+    if not start or not end:
+        return 0
+    return max(0, (end - start).days // 7)
+
+
+def _decayed_evidence(score: float, last_week: str, week_key: str) -> float:
+    half_life = max(settings.hypothesis_evidence_half_life_weeks, 1e-6)
+    return score * 0.5 ** (_weeks_between(last_week, week_key) / half_life)
+
+
+def _evidence_strength(score: float) -> float:
+    return 1.0 - math.exp(-score / max(settings.hypothesis_strength_scale, 1e-6))
+
+
+def _hypothesis_strength(hyp: Hypothesis, week_key: str) -> float:
+    """Strength as of ``week_key``: evidence decays while no new papers support the hypothesis."""
+    if not hyp.evidence_count:
+        return hyp.strength_score
+    return _evidence_strength(_decayed_evidence(hyp.evidence_score, hyp.last_evidence_week, week_key))
+
+
+def _track_hypotheses(
+    db: Session, alpha_cards: list[PaperAlphaCard], week_key: str, statements: Optional[dict[int, str]] = None
+) -> list[int]:
+    """Attach this week's evidence to existing hypotheses, creating new ones only when nothing matches.
+
+    Each card's hypothesis statement is embedded and matched by cosine similarity, first
+    against stored hypotheses (one batched ANN query) and then against hypotheses created
+    earlier in this batch. A match appends a ``support`` link, moves the hypothesis embedding
+    toward the evidence and adds the link confidence to its decayed evidence score.
+    Returns the ids of hypotheses touched this week, in first-touch order.
+    """
+    if not alpha_cards:
+        return []
+    statements = statements or {}
+    papers = {p.id: p for p in db.scalars(select(Paper).where(Paper.id.in_([c.paper_id for c in alpha_cards]))).all()}
+    cards = [card for card in alpha_cards if card.paper_id in papers]
+    texts = [
+        (statements.get(card.paper_id) or "").strip() or f"{papers[card.paper_id].title}: {card.short_alpha_summary}"
+        for card in cards
+    ]
+    vectors = np.asarray([embed_text(text, dim=1024) for text in texts], dtype=np.float32)
+    threshold = settings.hypothesis_match_threshold
+    stored = open_vector_index(db, Hypothesis.id, Hypothesis.embedding_vector)
+    stored_hits = stored.search(vectors, k=1)
+    created = InMemoryVectorIndex()
+
+    touched: list[int] = []
+    for card, text, vector, hits in zip(cards, texts, vectors, stored_hits):
+        match = hits[0] if hits and hits[0][1] >= threshold else None
+        if match is None:
+            week_hits = created.search(vector[None, :], k=1)[0]
+            match = week_hits[0] if week_hits and week_hits[0][1] >= threshold else None
+
+        if match is None:
+            confidence = settings.hypothesis_new_confidence
+            hyp = Hypothesis(
+                text=text[:2000],
+                type=card.mechanism_type,
+                week_introduced=week_key,
+                embedding_vector=vector.tolist(),
+                evidence_score=confidence,
+                evidence_count=1,
+                last_evidence_week=week_key,
+                strength_score=_evidence_strength(confidence),
+            )
+            db.add(hyp)
+            db.flush()
+            created.add([hyp.id], vector[None, :])
+        else:
+            hyp = db.get(Hypothesis, match[0])
+            already = db.scalar(
+                select(HypothesisPaperLink.id).where(
+                    HypothesisPaperLink.hypothesis_id == hyp.id, HypothesisPaperLink.paper_id == card.paper_id
+                )
+            )
+            if already:  # e.g. a revised paper re-extracted
+                continue
+            confidence = min(0.95, max(0.5, match[1]))
+            count = hyp.evidence_count or 0
+            previous = np.asarray(hyp.embedding_vector if hyp.embedding_vector is not None else vector, dtype=np.float32)
+            merged = (previous * count + vector) / (count + 1)
+            hyp.embedding_vector = (merged / (np.linalg.norm(merged) or 1.0)).tolist()
+            hyp.evidence_score = _decayed_evidence(hyp.evidence_score or 0.0, hyp.last_evidence_week, week_key) + confidence
+            hyp.evidence_count = count + 1
+            hyp.last_evidence_week = week_key
+            hyp.strength_score = _evidence_strength(hyp.evidence_score)
+
+        db.add(
+            HypothesisPaperLink(
+                hypothesis_id=hyp.id,
+                paper_id=card.paper_id,
+                relation="support",
+                confidence=confidence,
+                provenance=card.provenance_snippets[:220],
+                week_key=week_key,
+            )
+        )
+        if hyp.id not in touched:
+            touched.append(hyp.id)
+    db.flush()
+    return touched
+
+
+def _paper_vector(paper: Paper) -> list[float]:
+    if paper.embedding_vector is not None:
+        return list(paper.embedding_vector)
+    return embed_text(f"{paper.title}\n{paper.abstract}", dim=1024)
+
+
+def reembed_stored_vectors(db: Session, batch_size: int = 500) -> dict[str, int]:
+    """Recompute every stored embedding with the current ``embed_text``; returns rows per table.
+
+    Vectors written by an earlier embedding live in a different space, so similarity between
+    old and new rows is meaningless until they are rewritten. Papers, chunks, memory entries
+    and hypotheses are re-embedded from their text (a hypothesis restarts from its statement,
+    dropping the evidence it had been pulled toward); topic centroids are rebuilt as the mean
+    of their member papers. Commits after every batch, so an interrupted run can be resumed.
+    """
+    sources: list[tuple[type, Callable[..., str]]] = [
+        (Paper, lambda row: f"{row.title}\n{row.abstract}"),
+        (PaperChunk, lambda row: row.text[:4000]),
+        (ResearchMemoryEntry, lambda row: row.summary),
+        (Hypothesis, lambda row: row.text),
+    ]
+    updated: dict[str, int] = {}
+    for model, text_of in sources:
+        updated[model.__tablename__] = 0
+        last_id = 0
+        while True:
+            rows = db.scalars(select(model).where(model.id > last_id).order_by(model.id).limit(batch_size)).all()
+            if not rows:
+                break
+            for row in rows:
+                row.embedding_vector = embed_text(text_of(row), dim=1024)
+            last_id = rows[-1].id
+            updated[model.__tablename__] += len(rows)
+            db.commit()
+
+    updated[ClusterTopic.__tablename__] = 0
+    for topic in db.scalars(select(ClusterTopic)).all():
+        members = (
+            select(ClusterPaperLink.paper_id)
+            .join(Cluster, Cluster.id == ClusterPaperLink.cluster_id)
+            .where(Cluster.topic_id == topic.id)
+        )
+        member_vectors = db.scalars(
+            select(Paper.embedding_vector).where(Paper.id.in_(members), Paper.embedding_vector.is_not(None))
+        ).all()
+        if not member_vectors:
+            continue
+        topic.centroid = normalize_rows(np.asarray(member_vectors, dtype=np.float64).mean(axis=0)[None, :])[0].tolist()
+        updated[ClusterTopic.__tablename__] += 1
+    db.commit()
+    return updated
+
+
+def _score_novelty(db: Session, alpha_cards: list[PaperAlphaCard], index: VectorIndex) -> dict[int, float]:
+    """Novelty of each card's paper as 1 - its closest time-decayed similarity to earlier papers.
+
+    One batched nearest-neighbour query covers all ``alpha_cards``; the papers themselves are
+    excluded so a week is scored against history, not against itself. A neighbour's
+    similarity halves every ``novelty_half_life_weeks`` it was published before the paper,
+    so revisiting an old idea counts as more novel than repeating last week's. Sets
+    ``novelty_score`` and ``novelty_bucket`` on the cards and returns ``{paper_id: score}``.
+    """
+    papers = {p.id: p for p in db.scalars(select(Paper).where(Paper.id.in_([c.paper_id for c in alpha_cards]))).all()}
+    if not papers:
+        return {}
+    paper_ids = list(papers)
+    vectors = np.asarray([_paper_vector(papers[pid]) for pid in paper_ids], dtype=np.float32)
+    hits = index.search(vectors, k=max(1, settings.novelty_neighbors), exclude=set(paper_ids))
+    neighbor_ids = {row_id for neighbors in hits for row_id, _ in neighbors}
+    published = (
+        dict(db.execute(select(Paper.id, Paper.published_at).where(Paper.id.in_(neighbor_ids))).all()) if neighbor_ids else {}
+    )
+    half_life = max(settings.novelty_half_life_weeks, 1e-6)
+    scores: dict[int, float] = {}
+    for paper_id, neighbors in zip(paper_ids, hits):
+        when = _as_utc(papers[paper_id].published_at)
+        closest = 0.0
+        for row_id, similarity in neighbors:
+            age_weeks = max(0.0, (when - _as_utc(published[row_id])).total_seconds() / (7 * 86400))
+            closest = max(closest, similarity * 0.5 ** (age_weeks / half_life))
+        scores[paper_id] = round(1.0 - closest, 4)
     for card in alpha_cards:
-        grouped.setdefault(card.bottleneck_attacked, []).append(card)
+        if card.paper_id in scores:
+            card.novelty_score = scores[card.paper_id]
+            card.novelty_bucket = _novelty_bucket(card.novelty_score)
+    db.flush()
+    return scores
+
+
+def _topic_label(titles: list[str], max_terms: int = 3) -> str:
+    counts = Counter(
+        token for title in titles for token in set(TOKEN_RE.findall(title.lower())) if token not in STOPWORDS and len(token) > 2
+    )
+    terms = [token for token, _ in counts.most_common(max_terms)]
+    return " / ".join(term.title() for term in terms) if terms else "Misc"
+
+
+def _cluster_cards(db: Session, alpha_cards: list[PaperAlphaCard], week_key: str) -> list[tuple[Cluster, list[int]]]:
+    """Cluster this week's papers by embedding against the stored cross-week topics.
+
+    Papers near an existing ``ClusterTopic`` centroid join it (so its id stays stable across
+    weeks); the rest form new topics via mini-batch k-means. Only this week's vectors and the
+    topic centroids are loaded, never the full paper history.
+    """
+    if not alpha_cards:
+        return []
+    papers = {p.id: p for p in db.scalars(select(Paper).where(Paper.id.in_([c.paper_id for c in alpha_cards]))).all()}
+    cards = [card for card in alpha_cards if card.paper_id in papers]
+    vectors = np.asarray([_paper_vector(papers[card.paper_id]) for card in cards], dtype=np.float64)
+    topics = list(db.scalars(select(ClusterTopic).order_by(ClusterTopic.id)).all())
+    update = refresh_clusters(
+        np.asarray([t.centroid for t in topics], dtype=np.float64) if topics else None,
+        np.asarray([t.paper_count for t in topics], dtype=np.float64) if topics else None,
+        vectors,
+        match_threshold=settings.cluster_match_threshold,
+        target_size=settings.cluster_target_size,
+    )
+
+    members: dict[int, list[PaperAlphaCard]] = {}
+    for card, label in zip(cards, update.labels.tolist()):
+        members.setdefault(label, []).append(card)
 
     clusters: list[tuple[Cluster, list[int]]] = []
-    for bottleneck, cards in grouped.items():
+    for label in sorted(members):
+        group = members[label]
+        if label < len(topics):
+            topic = topics[label]
+        else:
+            topic = ClusterTopic(name=_topic_label([papers[c.paper_id].title for c in group]), first_week=week_key)
+            db.add(topic)
+        # Only centroids that gained members are rewritten.
+        topic.centroid = update.centroids[label].tolist()
+        topic.paper_count = int(update.counts[label])
+        topic.last_week = week_key
+        db.flush()
+
+        bottleneck = Counter(c.bottleneck_attacked for c in group).most_common(1)[0][0]
         cluster = Cluster(
-            name=f"{bottleneck.title()} Cluster",
+            name=f"{topic.name} Cluster",
             dominant_bottleneck=bottleneck,
-            mechanism_summary=f"Dominant mechanisms: {', '.join(sorted({c.mechanism_type for c in cards}))}",
+            mechanism_summary=f"Dominant mechanisms: {', '.join(sorted({c.mechanism_type for c in group}))}",
             week_key=week_key,
+            topic_id=topic.id,
         )
-        paper_ids = [card.paper_id for card in cards]
-        clusters.append((cluster, paper_ids))
+        clusters.append((cluster, [card.paper_id for card in group]))
     return clusters
 
 
 def _derive_long_horizon_insights(db: Session, current_week_key: str, lookback: int = 6) -> str:
-    weeks = db.scalars(
-        select(ResearchBrief.week_key).order_by(desc(ResearchBrief.week_key)).limit(max(lookback, 1))
-    ).all()
+    # Weeks from before rollups existed are filled in on first use.
+    backfill_rollups(db, week_keys_ending(current_week_key, lookback))
+    report = trend_report(db, current_week_key, window=lookback, limit=3)
+    weeks = [w for i, w in enumerate(report.weeks) if any(s.counts[i] for s in report.series)]
     if not weeks:
         return "No historical signal available yet."
 
-    hyp_rows = db.scalars(
-        select(Hypothesis).where(Hypothesis.week_introduced.in_(weeks)).order_by(desc(Hypothesis.created_at))
-    ).all()
-    cluster_rows = db.scalars(select(Cluster).where(Cluster.week_key.in_(weeks))).all()
-
-    mechanism_counter = Counter([h.type for h in hyp_rows])
-    bottleneck_counter = Counter([c.dominant_bottleneck for c in cluster_rows])
+    def top(dimension: str) -> str:
+        series = [s for s in report.series if s.dimension == dimension][:3]
+        return ", ".join(f"{s.value}({s.total})" for s in series) or "none"
 
-    top_mechanisms = ", ".join([f"{k}({v})" for k, v in mechanism_counter.most_common(3)]) or "none"
-    top_bottlenecks = ", ".join([f"{k}({v})" for k, v in bottleneck_counter.most_common(3)]) or "none"
+    top_mechanisms = top("hypothesis_type")
+    top_bottlenecks = top("bottleneck")
+    emerging = ", ".join(s.value for s in report.emerging)
+    emerging_suffix = f" Emerging mechanisms: {emerging}." if emerging else ""
 
     return (
         f"Across the last {len(weeks)} tracked weeks (up to {current_week_key}), "
         f"the dominant hypothesis types are: {top_mechanisms}. "
-        f"Most persistent bottlenecks are: {top_bottlenecks}."
+        f"Most persistent bottlenecks are: {top_bottlenecks}.{emerging_suffix}"
     )
 
 
@@ -225,84 +613,246 @@ def _write_verification_artifacts(week_key: str, payload: dict) -> None:
     md_path.write_text("\n".join(md) + "\n", encoding="utf-8")
 
 
-def _render_brief(
-    week_key: str,
+# Brief sections in document order: (name, heading). Each is cached on its own by input hash.
+_BRIEF_SECTIONS: list[tuple[str, str]] = [
+    ("field_temperature", "Field Temperature"),
+    ("arxiv", "New arXiv papers (recent window)"),
+    ("citations", "Citations (evidence links)"),
+    ("revisions", "Revised Papers (what changed)"),
+    ("bottleneck", "Dominant Bottleneck"),
+    ("top_hypothesis", "Top Hypothesis"),
+    ("research_notes", "Paper-Specific Research Notes (Hypothesis / Methods / Results)"),
+    ("strategic_flags", "Strategic Flags"),
+    ("long_horizon", "Long-Horizon Insight"),
+    ("open_questions", "Open Questions"),
+]
+
+
+def _brief_section_inputs(
     papers: list[Paper],
     cards: list[PaperAlphaCard],
     hyps: list[Hypothesis],
     long_horizon_insight: str,
     paper_hmr: Optional[dict[int, dict[str, str]]] = None,
-) -> str:
-    count_by_source = Counter([p.source for p in papers])
-    source_lines = "\n".join([f"- {k}: {v}" for k, v in sorted(count_by_source.items())]) or "- none"
-    top_hyp = hyps[0].text if hyps else "No hypotheses generated yet."
+    revisions: Optional[list[tuple[Paper, PaperRevision]]] = None,
+) -> dict[str, object]:
+    """Exactly the data each brief section renders, as JSON-able values.
 
+    A section's cache key is the hash of its entry here, so a section is regenerated only
+    when something it shows has changed.
+    """
+    count_by_source = Counter([p.source for p in papers])
+    novelty = {c.paper_id: c.novelty_score for c in cards if c.novelty_score is not None}
+    high_novelty = sum(1 for c in cards if c.novelty_score is not None and c.novelty_bucket == "high")
+    # Most novel first; papers without a score (never extracted) rank by recency after them.
     arxiv_papers = [p for p in papers if p.source == "arxiv"]
-    arxiv_papers = sorted(arxiv_papers, key=lambda p: p.published_at, reverse=True)
-    arxiv_lines = []
-    citation_lines = []
+    arxiv_papers = sorted(arxiv_papers, key=lambda p: (novelty.get(p.id, -1.0), _as_utc(p.published_at)), reverse=True)
+
+    arxiv = []
     for p in arxiv_papers[:10]:
         first = (p.abstract or "").split(".")[0].strip()
-        inc = first[:220] + ("..." if len(first) > 220 else "")
-        aid = p.arxiv_id or p.source_id
-        arxiv_lines.append(f"- {aid}: {p.title} — {inc}")
-        citation_lines.append(f"- {aid}: {p.source_url}")
-    arxiv_section = "\n".join(arxiv_lines) if arxiv_lines else "- none"
-    citation_section = "\n".join(citation_lines) if citation_lines else "- none"
+        arxiv.append(
+            {
+                "aid": p.arxiv_id or p.source_id,
+                "title": p.title,
+                "lead": first[:220] + ("..." if len(first) > 220 else ""),
+                "novelty": novelty.get(p.id),
+                "url": p.source_url,
+            }
+        )
 
     paper_hmr = paper_hmr or {}
-    research_notes_lines: list[str] = []
+    notes = []
     for p in arxiv_papers[:8]:
         hmr = paper_hmr.get(p.id, {})
-        hyp = (hmr.get("hypothesis") or "").strip()
-        methods = (hmr.get("methods") or "").strip()
-        results = (hmr.get("results") or "").strip()
-        aid = p.arxiv_id or p.source_id
-        if not any([hyp, methods, results]):
-            continue
-        caveat = "Needs independent replication beyond benchmark-local setup." if results else "Results unclear from abstract; requires full-paper validation."
-        research_notes_lines.append(
-            f"- {aid} — **{p.title}**\n"
-            f"  - Hypothesis: {hyp[:260] if hyp else 'N/A'}\n"
-            f"  - Methods delta: {methods[:320] if methods else 'N/A'}\n"
-            f"  - Results: {results[:280] if results else 'N/A'}\n"
-            f"  - Caveat: {caveat}"
+        fields = {key: (hmr.get(key) or "").strip() for key in ("hypothesis", "methods", "results")}
+        if any(fields.values()):
+            notes.append({"aid": p.arxiv_id or p.source_id, "title": p.title, **fields})
+
+    revised = []
+    for p, rev in revisions or []:
+        revised.append(
+            {
+                "aid": p.arxiv_id or p.source_id,
+                "title": p.title,
+                "changed": rev.chunks_total - rev.chunks_unchanged,
+                "total": rev.chunks_total,
+                "sections": rev.changed_sections,
+                "added": rev.chunks_added,
+                "removed": rev.chunks_removed,
+                "reextracted": rev.alpha_reextracted,
+            }
+        )
+
+    bottlenecks = Counter(c.bottleneck_attacked for c in cards)
+    return {
+        "field_temperature": {"total": len(papers), "high_novelty": high_novelty, "sources": sorted(count_by_source.items())},
+        "arxiv": arxiv,
+        "citations": [{"aid": item["aid"], "url": item["url"]} for item in arxiv],
+        "revisions": revised,
+        "bottleneck": bottlenecks.most_common(1)[0][0] if bottlenecks else "N/A",
+        "top_hypothesis": hyps[0].text if hyps else "No hypotheses generated yet.",
+        "research_notes": notes,
+        "strategic_flags": [settings.citation_provenance_required, settings.min_acceptable_precision],
+        "long_horizon": long_horizon_insight,
+        "open_questions": None,
+    }
+
+
+def _brief_section_hash(data: object) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _format_brief_section(name: str, data) -> str:
+    if name == "field_temperature":
+        source_lines = "\n".join(f"- {k}: {v}" for k, v in data["sources"]) or "- none"
+        return (
+            f"- Total ingested artifacts: {data['total']}\n"
+            f"- High-novelty papers: {data['high_novelty']}\n"
+            f"- Source distribution:\n{source_lines}"
         )
-    research_notes = "\n".join(research_notes_lines) if research_notes_lines else "- none"
+    if name == "arxiv":
+        lines = []
+        for item in data:
+            score = f" (novelty {item['novelty']:.2f})" if item["novelty"] is not None else ""
+            lines.append(f"- {item['aid']}: {item['title']} — {item['lead']}{score}")
+        return "\n".join(lines) or "- none"
+    if name == "citations":
+        return "\n".join(f"- {item['aid']}: {item['url']}" for item in data) or "- none"
+    if name == "revisions":
+        lines = []
+        for item in data:
+            sections = f" in {item['sections']}" if item["sections"] else ""
+            alpha = "alpha card re-extracted" if item["reextracted"] else "alpha card unchanged"
+            lines.append(
+                f"- {item['aid']}: {item['title']} — {item['changed']}/{item['total']} chunks changed{sections} "
+                f"(+{item['added']}/-{item['removed']}); {alpha}"
+            )
+        return "\n".join(lines) or "- none"
+    if name == "research_notes":
+        lines = []
+        for item in data:
+            hyp, methods, results = item["hypothesis"], item["methods"], item["results"]
+            caveat = "Needs independent replication beyond benchmark-local setup." if results else "Results unclear from abstract; requires full-paper validation."
+            lines.append(
+                f"- {item['aid']} — **{item['title']}**\n"
+                f"  - Hypothesis: {hyp[:260] if hyp else 'N/A'}\n"
+                f"  - Methods delta: {methods[:320] if methods else 'N/A'}\n"
+                f"  - Results: {results[:280] if results else 'N/A'}\n"
+                f"  - Caveat: {caveat}"
+            )
+        return "\n".join(lines) or "- none"
+    if name == "strategic_flags":
+        provenance, precision = data
+        return (
+            f"- Citation provenance is {'enabled' if provenance else 'disabled'}.\n"
+            f"- Quality gate target precision: {precision:.2f}"
+        )
+    if name == "open_questions":
+        return "- Which mechanisms remain robust across revised versions?\n- Which gains are likely benchmark-specific?"
+    # bottleneck, top_hypothesis, long_horizon: a single line
+    return f"- {data}"
+
 
-    return f"""# aifrontierpulse Weekly Brief ({week_key})
+def _compose_brief(week_key: str, sections: dict[str, str]) -> str:
+    body = "\n\n".join(f"## {heading}\n{sections[name]}" for name, heading in _BRIEF_SECTIONS)
+    return f"# aifrontierpulse Weekly Brief ({week_key})\n\n{body}\n"
 
-## Field Temperature
-- Total ingested artifacts: {len(papers)}
-- Source distribution:
-{source_lines}
 
-## New arXiv papers (recent window)
-{arxiv_section}
+def _merge_memory(db: Session, entry: ResearchMemoryEntry) -> ResearchMemoryEntry:
+    """``db.merge`` keyed on the unique ``memory_key`` rather than the primary key.
 
-## Citations (evidence links)
-{citation_section}
+    Later runs in the same week then update their entries instead of failing on the constraint.
+    """
+    entry.id = db.scalar(select(ResearchMemoryEntry.id).where(ResearchMemoryEntry.memory_key == entry.memory_key))
+    return db.merge(entry)
+
+
+def _week_brief_inputs(db: Session, week_key: str, long_horizon_insight: str) -> dict[str, object]:
+    """Section inputs for everything ingested in ``week_key``, across all of the week's runs.
 
-## Dominant Bottleneck
-- {cards[0].bottleneck_attacked if cards else 'N/A'}
+    Reads only the week's run documents and the rows they point at; for a paper seen by
+    several runs, the latest run's extraction wins.
+    """
+    rows = db.scalars(
+        select(IngestionRunDocument)
+        .join(IngestionRun, IngestionRun.id == IngestionRunDocument.run_id)
+        .where(
+            IngestionRun.week_key == week_key,
+            IngestionRunDocument.paper_id.is_not(None),
+            IngestionRunDocument.outcome.in_(("new", "revision")),
+        )
+        .order_by(IngestionRunDocument.run_id, IngestionRunDocument.position)
+    ).all()
+    new_ids = list(dict.fromkeys(r.paper_id for r in rows if r.outcome == "new"))
+    revision_refs = list(dict.fromkeys((r.paper_id, r.revision_id) for r in rows if r.outcome == "revision" and r.revision_id))
+    paper_hmr = {r.paper_id: json.loads(r.hmr_json) for r in rows if r.hmr_json}
+    paper_ids = set(new_ids) | {paper_id for paper_id, _ in revision_refs}
+
+    papers = {p.id: p for p in db.scalars(select(Paper).where(Paper.id.in_(paper_ids))).all()} if paper_ids else {}
+    revision_ids = [revision_id for _, revision_id in revision_refs]
+    revision_rows = (
+        {r.id: r for r in db.scalars(select(PaperRevision).where(PaperRevision.id.in_(revision_ids))).all()} if revision_ids else {}
+    )
+    cards = (
+        db.scalars(
+            select(PaperAlphaCard).where(PaperAlphaCard.paper_id.in_(paper_ids), PaperAlphaCard.is_current).order_by(PaperAlphaCard.id)
+        ).all()
+        if paper_ids
+        else []
+    )
+    supported = select(HypothesisPaperLink.hypothesis_id).where(
+        HypothesisPaperLink.week_key == week_key, HypothesisPaperLink.relation == "support"
+    )
+    hyps = db.scalars(select(Hypothesis).where(Hypothesis.id.in_(supported)).order_by(desc(Hypothesis.strength_score), Hypothesis.id)).all()
+    revisions = [
+        (papers[paper_id], revision_rows[revision_id])
+        for paper_id, revision_id in revision_refs
+        if paper_id in papers and revision_id in revision_rows
+    ]
+    return _brief_section_inputs(
+        [papers[i] for i in new_ids if i in papers],
+        list(cards),
+        list(hyps),
+        long_horizon_insight,
+        paper_hmr=paper_hmr,
+        revisions=revisions,
+    )
 
-## Top Hypothesis
-- {top_hyp}
 
-## Paper-Specific Research Notes (Hypothesis / Methods / Results)
-{research_notes}
+def _compose_cached_brief(db: Session, brief: ResearchBrief, inputs: dict[str, object]) -> tuple[str, list[str]]:
+    """Compose the brief from cached section fragments, regenerating only sections whose inputs changed.
 
-## Strategic Flags
-- Citation provenance is {'enabled' if settings.citation_provenance_required else 'disabled'}.
-- Quality gate target precision: {settings.min_acceptable_precision:.2f}
+    Returns the markdown and the names of the regenerated sections.
+    """
+    cached = {row.section: row for row in db.scalars(select(BriefSectionCache).where(BriefSectionCache.brief_id == brief.id)).all()}
+    sections: dict[str, str] = {}
+    regenerated: list[str] = []
+    for name, _ in _BRIEF_SECTIONS:
+        digest = _brief_section_hash(inputs[name])
+        row = cached.get(name)
+        if row is None:
+            row = BriefSectionCache(brief_id=brief.id, section=name)
+            db.add(row)
+        if row.input_hash != digest:
+            row.input_hash = digest
+            row.content = _format_brief_section(name, inputs[name])
+            regenerated.append(name)
+        sections[name] = row.content
+    return _compose_brief(brief.week_key, sections), regenerated
 
-## Long-Horizon Insight
-- {long_horizon_insight}
 
-## Open Questions
-- Which mechanisms remain robust across revised versions?
-- Which gains are likely benchmark-specific?
-"""
+def _render_brief(
+    week_key: str,
+    papers: list[Paper],
+    cards: list[PaperAlphaCard],
+    hyps: list[Hypothesis],
+    long_horizon_insight: str,
+    paper_hmr: Optional[dict[int, dict[str, str]]] = None,
+    revisions: Optional[list[tuple[Paper, PaperRevision]]] = None,
+) -> str:
+    inputs = _brief_section_inputs(papers, cards, hyps, long_horizon_insight, paper_hmr=paper_hmr, revisions=revisions)
+    return _compose_brief(week_key, {name: _format_brief_section(name, inputs[name]) for name, _ in _BRIEF_SECTIONS})
 
 
 class DefaultPaperService(PaperService):
@@ -340,8 +890,71 @@ class DefaultWorkflowService(WorkflowService):
     def __init__(self) -> None:
         fallback = None
         if settings.llm_enable_cloud_fallback and settings.llm_fallback_provider == "openrouter":
-            fallback = OpenRouterClient(api_key=settings.openrouter_api_key, model=settings.openrouter_model)
-        self.inference_client = FailoverInferenceClient(primary_client=OllamaClient(), fallback_client=fallback)
+            fallback = OpenRouterClient(
+                api_key=settings.openrouter_api_key,
+                model=settings.openrouter_model,
+                http_client=self._http_client(),
+            )
+        self.inference_client = FailoverInferenceClient(
+            primary_client=OllamaClient(http_client=self._http_client()),
+            fallback_client=fallback,
+        )
+        self.parser_stats = ParserStats(default_stats_path()) if settings.pdf_adaptive_parser_order else None
+        self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        self.topic_embeddings = TopicEmbeddings(
+            embed=lambda texts: self.inference_client.embed(settings.embedding_model, texts),
+            model=settings.embedding_model,
+            path=default_topic_embeddings_path(),
+            batch_size=settings.embedding_batch_size,
+        )
+        self.paper_index = IncrementalVectorIndex(Paper.id, Paper.embedding_vector)
+
+    @staticmethod
+    def _http_client() -> httpx.Client:
+        return build_http_client(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive,
+            connect_timeout_s=settings.llm_connect_timeout_s,
+            read_timeout_s=settings.llm_read_timeout_s,
+        )
+
+    def close(self) -> None:
+        self.inference_client.close()
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(cancel_futures=True)
+            self._cpu_pool = None
+
+    # Below this many documents per worker, pickling and worker start-up cost more than they save.
+    MIN_DOCS_PER_PROCESS = 4
+
+    def _prepare_documents(self, docs: list[SourceDocument], embed_chunks: list[bool]) -> Iterator[PreparedDocument]:
+        """Chunk and embed ``docs`` in order, across ``worker_processes`` processes when that pays off.
+
+        The pool is skipped on a single CPU and for batches too small to amortise it. Results
+        are yielded as soon as each one (and those before it) is ready, so the caller can
+        write early documents while later ones are still being prepared.
+        """
+        workers = min(settings.worker_processes, os.cpu_count() or 1)
+        if workers <= 1 or len(docs) < workers * self.MIN_DOCS_PER_PROCESS:
+            return (prepare_document(doc, embed) for doc, embed in zip(docs, embed_chunks))
+        if self._cpu_pool is None:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+        return self._cpu_pool.map(prepare_document, docs, embed_chunks)
+
+    @staticmethod
+    def _tokenizer(model: str) -> Tokenizer:
+        return get_tokenizer(model, settings.tokenizer_dir)
+
+    def _pdf_options(self) -> PdfParseOptions:
+        return PdfParseOptions(
+            appendix_policy=settings.appendix_policy,
+            max_chars=settings.pdf_max_chars,
+            min_main_chars=settings.pdf_min_main_chars,
+            timeout_s=settings.pdf_parse_timeout_s if settings.pdf_parse_isolated else None,
+            memory_mb=settings.pdf_parse_memory_mb,
+            race_after_s=settings.pdf_parse_race_after_s or None,
+            stats=self.parser_stats,
+        )
 
     def _connectors(self, sources: list[str]) -> dict[str, object]:
         rss = default_rss_sources()
@@ -357,6 +970,7 @@ class DefaultWorkflowService(WorkflowService):
                 include_current_id_month=settings.arxiv_include_current_id_month,
                 id_months_back=settings.arxiv_id_months_back,
                 announcement_days=settings.arxiv_announcement_days,
+                pdf_options=self._pdf_options(),
             ),
             "openreview": OpenReviewConnector(),
             "frontier_blogs": RSSConnector("frontier_blogs", rss["frontier_blogs"]),
@@ -380,36 +994,96 @@ class DefaultWorkflowService(WorkflowService):
                     return True
         return False
 
-    def _topic_score(self, doc: SourceDocument) -> int:
+    def _topic_score(self, doc: SourceDocument) -> float:
         if not settings.topic_bias_enabled:
-            return 0
-        text = f"{doc.title}\n{doc.abstract}".lower()
-        score = 0
-        for kw in settings.topic_bias_keywords_list:
-            if kw in text:
-                score += 1
-        return score
+            return 0.0
+        # Cached on the document: ranking, the relevance floor and run notes all ask again.
+        if doc.topic_score is None:
+            matcher = _topic_matcher(
+                settings.topic_bias_keywords, settings.topic_bias_weights, settings.topic_bias_word_boundaries
+            )
+            doc.topic_score = matcher.score(f"{doc.title}\n{doc.abstract}")
+        return doc.topic_score
+
+    def _topic_similarities(self, docs: list[SourceDocument]) -> bool:
+        """Fill ``topic_similarity`` on ``docs``; False when the embedding model is unavailable."""
+        todo = [d for d in docs if d.topic_similarity is None]
+        if not todo:
+            return True
+        try:
+            sims = self.topic_embeddings.similarities(
+                [f"{d.title}\n{d.abstract}" for d in todo], settings.topic_bias_keywords_list
+            )
+        except Exception:
+            return False
+        for doc, sim in zip(todo, sims.tolist()):
+            doc.topic_similarity = sim
+        return True
+
+    def _is_topic_match(self, doc: SourceDocument) -> bool:
+        if self._topic_score(doc) >= settings.topic_bias_min_score:
+            return True
+        return doc.topic_similarity is not None and doc.topic_similarity >= settings.topic_semantic_min_similarity
 
     def _prioritize_docs(self, docs: list[SourceDocument], max_items: int) -> list[SourceDocument]:
-        ranked = sorted(
-            docs,
-            key=lambda d: (
-                self._topic_score(d),
-                d.published_at,
-            ),
-            reverse=True,
-        )
+        if settings.topic_bias_enabled and settings.topic_semantic_enabled and docs and self._topic_similarities(docs):
+            now = datetime.now(timezone.utc)
+            ages = [(now - _as_utc(d.published_at)).total_seconds() / 3600 for d in docs]
+            relevance = blend_relevance(
+                np.asarray([self._topic_score(d) for d in docs], dtype=np.float32),
+                np.asarray([d.topic_similarity for d in docs], dtype=np.float32),
+                np.asarray(ages, dtype=np.float32),
+                semantic_weight=settings.topic_semantic_weight,
+                recency_weight=settings.topic_recency_weight,
+                half_life_hours=settings.topic_recency_half_life_hours,
+            )
+            ranked = [docs[i] for i in np.argsort(-relevance, kind="stable")]
+        else:
+            # Keyword hits, then recency (also the fallback when no embedding model is reachable)
+            ranked = sorted(
+                docs,
+                key=lambda d: (
+                    self._topic_score(d),
+                    d.published_at,
+                ),
+                reverse=True,
+            )
         if settings.topic_bias_enabled:
             # For arXiv, enforce relevance floor so nightly stays focused on preferred areas
-            ranked = [d for d in ranked if (d.source != "arxiv" or self._topic_score(d) >= settings.topic_bias_min_score)]
+            ranked = [d for d in ranked if (d.source != "arxiv" or self._is_topic_match(d))]
         if max_items > 0:
             return ranked[:max_items]
         return ranked
 
-    def _store_paper(self, db: Session, doc: SourceDocument) -> Paper:
-        body = doc.full_text
-        if settings.appendix_policy == "main_first_fallback":
-            body = strip_reference_tail(body)
+    def _add_chunks(
+        self,
+        db: Session,
+        paper: Paper,
+        chunks: list[Chunk],
+        reuse: Optional[dict[str, list[float]]] = None,
+        vectors: Optional[list[list[float]]] = None,
+    ) -> None:
+        reuse = reuse or {}
+        for idx, chunk in enumerate(chunks):
+            content_hash = _chunk_hash(chunk.text)
+            vector = reuse.get(content_hash)
+            if vector is None and vectors is not None:
+                vector = vectors[idx]
+            db.add(
+                PaperChunk(
+                    paper_id=paper.id,
+                    section_name=chunk.section_name,
+                    chunk_index=idx,
+                    text=chunk.text,
+                    estimated_tokens=chunk.estimated_tokens,
+                    content_hash=content_hash,
+                    embedding_vector=vector if vector is not None else embed_text(chunk.text[:4000], dim=1024),
+                )
+            )
+
+    def _store_paper(self, db: Session, doc: SourceDocument, prepared: Optional[PreparedDocument] = None) -> Paper:
+        prepared = prepared or prepare_document(doc)
+        body, chunks = prepared.body, prepared.chunks
 
         paper = Paper(
             source=doc.source,
@@ -422,54 +1096,398 @@ class DefaultWorkflowService(WorkflowService):
             abstract=doc.abstract,
             full_text=body,
             source_url=doc.source_url,
-            embedding_vector=_embed_text(f"{doc.title}\n{doc.abstract}", dim=1024),
+            parser_name=doc.parser_name,
+            parse_seconds=doc.parse_seconds,
+            embedding_vector=prepared.paper_vector,
         )
         db.add(paper)
         db.flush()
 
-        chunks = make_chunks(
-            body,
-            target_tokens=settings.chunk_target_tokens,
-            overlap_tokens=settings.chunk_overlap_tokens,
-        )
-        for idx, chunk in enumerate(chunks):
-            db.add(
-                PaperChunk(
-                    paper_id=paper.id,
-                    section_name=chunk.section_name,
-                    chunk_index=idx,
-                    text=chunk.text,
-                    estimated_tokens=chunk.estimated_tokens,
-                    embedding_vector=_embed_text(chunk.text[:4000], dim=1024),
-                )
-            )
+        self._add_chunks(db, paper, chunks, vectors=prepared.chunk_vectors)
         return paper
 
-    def _extract_alpha(self, db: Session, paper: Paper) -> PaperAlphaCard:
-        chunks = db.scalars(select(PaperChunk).where(PaperChunk.paper_id == paper.id).order_by(PaperChunk.chunk_index)).all()
-        data = _heuristic_alpha(paper, chunks)
+    def _find_prior_version(self, db: Session, doc: SourceDocument) -> Optional[Paper]:
+        """Stored paper for an earlier arXiv version of ``doc``, if any."""
+        if doc.source != "arxiv" or not doc.arxiv_id:
+            return None
+        base = _arxiv_base_id(doc.arxiv_id)
+        if not base or db.scalar(select(Paper.id).where(Paper.source_id == doc.source_id)):
+            return None
+        rows = db.scalars(
+            select(Paper).where(
+                Paper.source == "arxiv",
+                (Paper.arxiv_id == base) | Paper.arxiv_id.like(f"{base}v%"),
+                Paper.source_id != doc.source_id,
+            )
+        ).all()
+        # Only move forward: an older version resurfacing in a wider scan is not a revision.
+        version = _arxiv_version(doc.arxiv_id)
+        rows = [row for row in rows if _arxiv_base_id(row.arxiv_id or "") == base and _arxiv_version(row.arxiv_id or "") < version]
+        return max(rows, key=lambda row: _arxiv_version(row.arxiv_id or "")) if rows else None
+
+    def _apply_revision(
+        self,
+        db: Session,
+        paper: Paper,
+        doc: SourceDocument,
+        week_key: str,
+        prepared: Optional[PreparedDocument] = None,
+    ) -> PaperRevision:
+        """Update ``paper`` in place to ``doc``'s version, re-embedding only chunks whose text changed."""
+        prepared = prepared or prepare_document(doc, embed_chunks=False)
+        body, chunks = prepared.body, prepared.chunks
+        old_chunks = db.scalars(select(PaperChunk).where(PaperChunk.paper_id == paper.id)).all()
+        reuse = {c.content_hash: c.embedding_vector for c in old_chunks if c.content_hash and c.embedding_vector is not None}
+        old_hashes = Counter(c.content_hash for c in old_chunks)
+        new_hashes = Counter(_chunk_hash(c.text) for c in chunks)
+
+        unchanged = sum((old_hashes & new_hashes).values())
+        # A section counts as changed when it gained new text or lost text the new version dropped.
+        changed_sections = sorted(
+            {c.section_name for c in chunks if _chunk_hash(c.text) not in old_hashes}
+            | {c.section_name for c in old_chunks if c.content_hash not in new_hashes}
+        )
+        abstract_changed = (paper.title, paper.abstract) != (doc.title, doc.abstract)
+        alpha_changed = abstract_changed or any(name.split(" / ")[0] in _ALPHA_SECTIONS for name in changed_sections)
+
+        revision = PaperRevision(
+            paper_id=paper.id,
+            from_source_id=paper.source_id,
+            to_source_id=doc.source_id,
+            chunks_total=len(chunks),
+            chunks_unchanged=unchanged,
+            chunks_added=max(0, len(chunks) - unchanged),
+            chunks_removed=max(0, len(old_chunks) - unchanged),
+            changed_sections=", ".join(changed_sections)[:2000],
+            abstract_changed=abstract_changed,
+            alpha_reextracted=alpha_changed,
+            week_key=week_key,
+        )
+        db.add(revision)
+
+        paper.source_id = doc.source_id
+        paper.arxiv_id = doc.arxiv_id
+        paper.title = doc.title
+        paper.authors = doc.authors
+        paper.updated_at = doc.updated_at
+        paper.abstract = doc.abstract
+        paper.full_text = body
+        paper.source_url = doc.source_url
+        paper.parser_name = doc.parser_name
+        paper.parse_seconds = doc.parse_seconds
+        if abstract_changed:
+            paper.embedding_vector = prepared.paper_vector
+
+        db.execute(delete(PaperChunk).where(PaperChunk.paper_id == paper.id))
+        db.flush()
+        self._add_chunks(db, paper, chunks, reuse=reuse, vectors=prepared.chunk_vectors)
+        db.flush()
+        return revision
 
-        # Optional best-effort model enhancement. On parse failure we keep heuristic content.
+    def _alpha_request(self, paper: Paper) -> InferenceRequest:
+        abstract = self._tokenizer(settings.llm_model).truncate(paper.abstract or "", settings.llm_abstract_max_tokens)
         prompt = (
             "Summarize this paper for structured alpha extraction in 5 bullet points:\n\n"
-            f"Title: {paper.title}\nAbstract: {paper.abstract[:3000]}"
+            f"Title: {paper.title}\nAbstract: {abstract}"
+        )
+        return InferenceRequest(
+            prompt=prompt,
+            model=settings.llm_model,
+            temperature=settings.llm_temperature,
+            max_tokens=settings.llm_max_output_tokens,
+            deadline_s=settings.llm_generation_deadline_s,
+            keep_alive=settings.llm_keep_alive,
+            num_ctx=settings.llm_num_ctx,
+            stage="extract_alpha",
+        )
+
+    def _hmr_request(self, paper: Paper) -> InferenceRequest:
+        abstract = self._tokenizer(settings.llm_synthesis_model).truncate(
+            (paper.abstract or "").strip(), settings.llm_abstract_max_tokens
+        )
+        prompt = (
+            "Read the title+abstract and return STRICT JSON with keys hypothesis, methods, results. "
+            "Keep each field concise, specific, and evidence-grounded. "
+            "Do not hallucinate numbers.\n\n"
+            f"Title: {paper.title}\n"
+            f"Abstract: {abstract}"
+        )
+        return InferenceRequest(
+            prompt=prompt,
+            model=settings.llm_synthesis_model,
+            temperature=0.1,
+            max_tokens=settings.llm_max_output_tokens,
+            stop_on_json=True,
+            deadline_s=settings.llm_generation_deadline_s,
+            keep_alive=settings.llm_keep_alive,
+            num_ctx=settings.llm_num_ctx,
+            stage="extract_hmr",
+        )
+
+    def _packed_hmr_request(self, papers: list[Paper]) -> InferenceRequest:
+        items = "\n\n".join(
+            f"[id={paper.id}]\nTitle: {paper.title}\nText: {(paper.abstract or '').strip()}" for paper in papers
+        )
+        prompt = (
+            "Read each item below and return STRICT JSON: an array with one object per item, "
+            "each with keys id, hypothesis, methods, results. "
+            "Keep each field concise, specific, and evidence-grounded. "
+            "Do not hallucinate numbers.\n\n"
+            f"{items}"
+        )
+        return InferenceRequest(
+            prompt=prompt,
+            model=settings.llm_synthesis_model,
+            temperature=0.1,
+            max_tokens=settings.llm_pack_output_tokens_per_item * len(papers),
+            stop_on_json=True,
+            json_root="array",
+            deadline_s=settings.llm_generation_deadline_s,
+            keep_alive=settings.llm_keep_alive,
+            num_ctx=settings.llm_num_ctx,
+            stage="extract_hmr_packed",
+        )
+
+    def _hmr_batches(self, papers: list[Paper]) -> list[list[Paper]]:
+        """Pack short non-arXiv items (RSS, blogs) into prompts sized to the model's num_ctx.
+
+        arXiv papers and long items keep one request each.
+        """
+        if not settings.llm_pack_short_items:
+            return [[paper] for paper in papers]
+
+        tokenizer = self._tokenizer(settings.llm_synthesis_model)
+        per_item_output = settings.llm_pack_output_tokens_per_item
+        base_tokens = estimate_tokens(self._packed_hmr_request([]).prompt, tokenizer)
+        batches: list[list[Paper]] = []
+        current: list[Paper] = []
+        used = base_tokens
+        for paper in papers:
+            abstract = (paper.abstract or "").strip()
+            if paper.source == "arxiv" or len(abstract) > settings.llm_pack_max_item_chars:
+                batches.append([paper])
+                continue
+            cost = estimate_tokens(f"{paper.title}\n{abstract}", tokenizer) + 16 + per_item_output
+            if current and (len(current) >= settings.llm_pack_max_items or used + cost > settings.llm_num_ctx):
+                batches.append(current)
+                current, used = [], base_tokens
+            current.append(paper)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run_extraction_llm(
+        self, papers: list[Paper], stats: InferenceStats
+    ) -> tuple[list[Optional[str]], dict[int, Optional[dict]]]:
+        """Alpha summaries per paper plus parsed HMR objects keyed by paper id.
+
+        Packed HMR replies are validated per item; items that are missing or malformed
+        fall back to one single-item call each.
+        """
+        hmr_batches = self._hmr_batches(papers)
+        requests = [self._alpha_request(paper) for paper in papers]
+        requests += [
+            self._hmr_request(batch[0]) if len(batch) == 1 else self._packed_hmr_request(batch) for batch in hmr_batches
+        ]
+        outputs = self._generate_grouped(requests, stats)
+        alpha_outputs = outputs[: len(papers)]
+
+        hmr_parsed: dict[int, Optional[dict]] = {}
+        retry: list[Paper] = []
+        for batch, text in zip(hmr_batches, outputs[len(papers):]):
+            if len(batch) == 1:
+                hmr_parsed[batch[0].id] = _extract_json_object(text or "")
+                continue
+            items = _parse_packed_items(text or "", [paper.id for paper in batch])
+            for paper in batch:
+                if paper.id in items:
+                    hmr_parsed[paper.id] = items[paper.id]
+                else:
+                    retry.append(paper)
+
+        if retry:
+            retry_outputs = self._generate_grouped([self._hmr_request(paper) for paper in retry], stats)
+            for paper, text in zip(retry, retry_outputs):
+                hmr_parsed[paper.id] = _extract_json_object(text or "")
+        return alpha_outputs, hmr_parsed
+
+    def _generate_grouped(self, requests: list[InferenceRequest], stats: InferenceStats) -> list[Optional[str]]:
+        """Run requests grouped by model so each model is loaded once per batch.
+
+        Extraction and synthesis models may differ; interleaving them per paper forces
+        Ollama to swap models on memory-limited hosts. Failed calls yield ``None`` so
+        callers keep their heuristic defaults.
+        """
+        by_model: dict[str, list[int]] = {}
+        for idx, request in enumerate(requests):
+            by_model.setdefault(request.model, []).append(idx)
+
+        outputs: list[Optional[str]] = [None] * len(requests)
+
+        def run(idx: int) -> None:
+            request = requests[idx]
+            try:
+                result = self.inference_client.generate(request)
+            except Exception:
+                stats.record_failure(request.model)
+                return
+            if result.prompt_tokens is None:
+                result.prompt_tokens = self._tokenizer(request.model).count(request.prompt)
+            stats.record(result, request.stage)
+            outputs[idx] = result.text
+
+        models = list(by_model)
+        for pos, model in enumerate(models):
+            if settings.llm_warmup_enabled:
+                load_s = self.inference_client.warm_up(
+                    model, keep_alive=settings.llm_keep_alive, num_ctx=settings.llm_num_ctx
+                )
+                if load_s is not None:
+                    stats.record_load(model, load_s)
+            if settings.llm_parallel_requests > 1:
+                # Ollama serves OLLAMA_NUM_PARALLEL slots per loaded model; the HTTP pool caps this too.
+                with ThreadPoolExecutor(max_workers=settings.llm_parallel_requests) as pool:
+                    list(pool.map(run, by_model[model]))
+            else:
+                for idx in by_model[model]:
+                    run(idx)
+            if settings.llm_unload_between_models and pos + 1 < len(models):
+                self.inference_client.unload(model)
+        return outputs
+
+    def _nli_request(self, pairs: list[tuple[int, Hypothesis, str]]) -> InferenceRequest:
+        items = "\n\n".join(
+            f"[id={pair_id}]\nHypothesis: {hyp.text[:400]}\nPaper finding: {finding[:600]}" for pair_id, hyp, finding in pairs
+        )
+        prompt = (
+            "For each item, decide whether the paper finding contradicts, supports, or is neutral to the hypothesis. "
+            "Return STRICT JSON: an array with one object per item, each with keys id, "
+            'label ("contradict", "support" or "neutral") and confidence (0 to 1). '
+            "Only answer contradict when the finding is evidence against the hypothesis.\n\n"
+            f"{items}"
+        )
+        return InferenceRequest(
+            prompt=prompt,
+            model=settings.contradiction_model or settings.llm_model,
+            temperature=0.0,
+            max_tokens=48 * len(pairs) + 16,
+            stop_on_json=True,
+            json_root="array",
+            deadline_s=settings.llm_generation_deadline_s,
+            keep_alive=settings.llm_keep_alive,
+            num_ctx=settings.llm_num_ctx,
+            stage="contradiction_nli",
         )
-        try:
-            model_text = self.inference_client.generate(
-                InferenceRequest(prompt=prompt, model=settings.llm_model, temperature=settings.llm_temperature)
-            ).text
-            if model_text:
-                data["strategic_relevance"] = model_text[:900]
-        except Exception:
-            pass
+
+    def _contradiction_budget(self, db: Session, run: IngestionRun) -> int:
+        """NLI checks left for ``run``'s week: ``contradiction_max_checks`` minus what other runs of it spent.
+
+        The scheduler can fire several times a week; each run records its checks in its
+        checkpoint. The run's own checkpoint is ignored since a resumed synthesize stage
+        starts over.
+        """
+        spent = 0
+        for checkpoint_json in db.scalars(
+            select(IngestionRun.checkpoint_json).where(IngestionRun.week_key == run.week_key, IngestionRun.id != run.id)
+        ):
+            spent += int(json.loads(checkpoint_json or "{}").get("contradiction_checks", 0))
+        return max(0, settings.contradiction_max_checks - spent)
+
+    def _detect_contradictions(
+        self,
+        db: Session,
+        alpha_cards: list[PaperAlphaCard],
+        week_key: str,
+        findings: dict[int, str],
+        stats: InferenceStats,
+        budget: Optional[int] = None,
+    ) -> tuple[int, int]:
+        """Write ``contradict`` links between this week's papers and stored hypotheses.
+
+        Candidates are each paper's nearest hypotheses by embedding similarity (ones it
+        already supports excluded), pruned to the ``budget`` most similar pairs (default
+        ``contradiction_max_checks``; see ``_contradiction_budget`` for what is left of the
+        week's), then labelled by a cheap NLI prompt packing several pairs per call. Link
+        confidence is the model's confidence weighted by pair similarity. Returns the number
+        of links written and of pairs checked.
+        """
+        budget = settings.contradiction_max_checks if budget is None else budget
+        papers = {p.id: p for p in db.scalars(select(Paper).where(Paper.id.in_([c.paper_id for c in alpha_cards]))).all()}
+        if not papers or budget <= 0:
+            return 0, 0
+        paper_ids = list(papers)
+        linked = set(
+            db.execute(
+                select(HypothesisPaperLink.hypothesis_id, HypothesisPaperLink.paper_id).where(
+                    HypothesisPaperLink.paper_id.in_(paper_ids)
+                )
+            ).all()
+        )
+        index = open_vector_index(db, Hypothesis.id, Hypothesis.embedding_vector)
+        vectors = np.asarray([_paper_vector(papers[pid]) for pid in paper_ids], dtype=np.float32)
+        hits = index.search(vectors, k=settings.contradiction_candidates_per_paper + 1)
+
+        candidates: list[tuple[float, int, int]] = []
+        for paper_id, neighbors in zip(paper_ids, hits):
+            kept = [
+                (sim, hyp_id, paper_id)
+                for hyp_id, sim in neighbors
+                if sim >= settings.contradiction_min_similarity and (hyp_id, paper_id) not in linked
+            ]
+            candidates.extend(kept[: settings.contradiction_candidates_per_paper])
+        candidates = sorted(candidates, reverse=True)[:budget]
+        if not candidates:
+            return 0, 0
+
+        hypotheses = {h.id: h for h in db.scalars(select(Hypothesis).where(Hypothesis.id.in_({c[1] for c in candidates}))).all()}
+        pairs: list[tuple[int, Hypothesis, str]] = []
+        for pair_id, (_, hyp_id, paper_id) in enumerate(candidates):
+            paper = papers[paper_id]
+            finding = (findings.get(paper_id) or "").strip() or (paper.abstract or "")
+            pairs.append((pair_id, hypotheses[hyp_id], f"{paper.title}. {finding}"))
+        batch_size = max(1, settings.contradiction_batch_size)
+        batches = [pairs[offset : offset + batch_size] for offset in range(0, len(pairs), batch_size)]
+        outputs = self._generate_grouped([self._nli_request(batch) for batch in batches], stats)
+
+        written = 0
+        for batch, text in zip(batches, outputs):
+            labels = _parse_nli_items(text or "", [pair_id for pair_id, _, _ in batch])
+            for pair_id, hyp, _ in batch:
+                label, confidence = labels.get(pair_id, ("neutral", 0.0))
+                if label != "contradict" or confidence < settings.contradiction_min_confidence:
+                    continue
+                similarity, _, paper_id = candidates[pair_id]
+                db.add(
+                    HypothesisPaperLink(
+                        hypothesis_id=hyp.id,
+                        paper_id=paper_id,
+                        relation="contradict",
+                        confidence=round(confidence * similarity, 4),
+                        provenance=f"nli confidence={confidence:.2f} similarity={similarity:.2f}",
+                        week_key=week_key,
+                    )
+                )
+                written += 1
+        db.flush()
+        return written, len(candidates)
+
+    def _extract_alpha(self, db: Session, paper: Paper, model_text: Optional[str] = None) -> PaperAlphaCard:
+        chunks = db.scalars(select(PaperChunk).where(PaperChunk.paper_id == paper.id).order_by(PaperChunk.chunk_index)).all()
+        data = _heuristic_alpha(paper, chunks)
+
+        # Optional best-effort model enhancement. Without model output we keep heuristic content.
+        if model_text:
+            data["strategic_relevance"] = model_text[:900]
 
         current_cards = db.scalars(select(PaperAlphaCard).where(PaperAlphaCard.paper_id == paper.id, PaperAlphaCard.is_current)).all()
         for c in current_cards:
             c.is_current = False
+        latest_version = db.scalar(select(func.max(PaperAlphaCard.version_number)).where(PaperAlphaCard.paper_id == paper.id))
 
         card = PaperAlphaCard(
             paper_id=paper.id,
-            version_number=(len(current_cards) + 1),
+            version_number=int(latest_version or 0) + 1,
             is_current=True,
             **data,
         )
@@ -477,35 +1495,21 @@ class DefaultWorkflowService(WorkflowService):
         db.flush()
         return card
 
-    def _extract_hypothesis_method_results(self, paper: Paper) -> dict[str, str]:
+    def _extract_hypothesis_method_results(self, paper: Paper, parsed: Optional[dict] = None) -> dict[str, str]:
         abstract = (paper.abstract or "").strip()
         default_h = f"{paper.title}: proposes a potentially useful method that may improve agent/tool performance under specific conditions."
         default_m = abstract[:500] if abstract else "Method details unavailable (abstract missing)."
         default_r = "Results not confidently extractable from abstract alone."
 
-        prompt = (
-            "Read the title+abstract and return STRICT JSON with keys hypothesis, methods, results. "
-            "Keep each field concise, specific, and evidence-grounded. "
-            "Do not hallucinate numbers.\n\n"
-            f"Title: {paper.title}\n"
-            f"Abstract: {abstract[:3500]}"
-        )
-        try:
-            model_text = self.inference_client.generate(
-                InferenceRequest(prompt=prompt, model=settings.llm_synthesis_model, temperature=0.1)
-            ).text
-            parsed = _extract_json_object(model_text or "")
-            if parsed:
-                hypothesis = str(parsed.get("hypothesis") or default_h).strip()
-                methods = str(parsed.get("methods") or default_m).strip()
-                results = str(parsed.get("results") or default_r).strip()
-                return {
-                    "hypothesis": hypothesis[:1200],
-                    "methods": methods[:1800],
-                    "results": results[:1800],
-                }
-        except Exception:
-            pass
+        if parsed:
+            hypothesis = str(parsed.get("hypothesis") or default_h).strip()
+            methods = str(parsed.get("methods") or default_m).strip()
+            results = str(parsed.get("results") or default_r).strip()
+            return {
+                "hypothesis": hypothesis[:1200],
+                "methods": methods[:1800],
+                "results": results[:1800],
+            }
 
         # deterministic fallback
         return {
@@ -514,14 +1518,85 @@ class DefaultWorkflowService(WorkflowService):
             "results": default_r[:1800],
         }
 
-    def run_weekly(self, db: Session, payload: WorkflowRunRequest) -> WorkflowRunResponse:
-        week_key = _week_key()
+    def run_weekly(
+        self, db: Session, payload: WorkflowRunRequest, progress: Optional[ProgressCallback] = None
+    ) -> WorkflowRunResponse:
         requested = payload.sources or settings.ingest_sources_list
-        max_items = payload.max_papers if payload.max_papers > 0 else 120
-
-        run = IngestionRun(source_scope=",".join(requested), notes="weekly pipeline")
+        run = IngestionRun(
+            source_scope=",".join(requested),
+            notes="weekly pipeline",
+            status="running",
+            week_key=_week_key(),
+            request_json=payload.model_dump_json(),
+        )
         db.add(run)
-        db.flush()
+        db.commit()
+        return self._execute_run(db, run, progress)
+
+    def resume_run(self, db: Session, run_id: int, progress: Optional[ProgressCallback] = None) -> WorkflowRunResponse:
+        """Continue a failed or interrupted run from its last completed stage."""
+        run = db.get(IngestionRun, run_id)
+        if not run:
+            raise ValueError(f"Run not found: {run_id}")
+        if run.status != "completed":
+            run.status = "running"
+            run.error = ""
+            db.commit()
+        return self._execute_run(db, run, progress)
+
+    def _execute_run(self, db: Session, run: IngestionRun, progress: Optional[ProgressCallback] = None) -> WorkflowRunResponse:
+        ctx = _RunContext(
+            payload=WorkflowRunRequest.model_validate_json(run.request_json or "{}"),
+            checkpoint=json.loads(run.checkpoint_json or "{}"),
+            llm_stats=InferenceStats(),
+            progress=progress,
+            run_id=run.id,
+        )
+        stages = [
+            ("fetched", self._stage_fetch),
+            ("stored", self._stage_store),
+            ("extracted", self._stage_extract),
+            ("synthesized", self._stage_synthesize),
+            ("rendered", self._stage_render),
+        ]
+        done = [name for name, _ in stages].index(run.stage) + 1 if run.stage else 0
+        try:
+            # Each stage commits its own work; the stage marker is committed together with its
+            # last writes, so a resumed run never repeats a finished stage.
+            for name, stage in stages[done:]:
+                ctx.report(name, 0, 0)
+                stage(db, run, ctx)
+                run.stage = name
+                run.checkpoint_json = json.dumps(ctx.checkpoint)
+                db.commit()
+        except Exception as exc:
+            db.rollback()
+            run.status = "failed"
+            run.error = f"{type(exc).__name__}: {exc}"[:2000]
+            db.commit()
+            raise
+
+        return WorkflowRunResponse(
+            status="completed",
+            run_id=run.id,
+            ingested_papers=int(ctx.checkpoint.get("ingested", 0)),
+            extracted_alpha_cards=int(ctx.checkpoint.get("alpha_cards", 0)),
+            synthesized_hypotheses=len(ctx.checkpoint.get("hypothesis_ids", [])),
+            generated_clusters=len(ctx.checkpoint.get("cluster_ids", [])),
+            brief_version=int(ctx.checkpoint.get("brief_version", 0)),
+            notes=run.notes,
+        )
+
+    def _run_documents(self, db: Session, run: IngestionRun) -> list[IngestionRunDocument]:
+        return list(
+            db.scalars(
+                select(IngestionRunDocument).where(IngestionRunDocument.run_id == run.id).order_by(IngestionRunDocument.position)
+            ).all()
+        )
+
+    def _stage_fetch(self, db: Session, run: IngestionRun, ctx: _RunContext) -> None:
+        requested = ctx.payload.sources or settings.ingest_sources_list
+        max_items = ctx.payload.max_papers if ctx.payload.max_papers > 0 else 120
 
         connectors = self._connectors(requested)
         docs: list[SourceDocument] = []
@@ -541,31 +1616,76 @@ class DefaultWorkflowService(WorkflowService):
                 source_errors.append(f"{source}:{exc}")
 
         prioritized_docs = self._prioritize_docs(docs, max_items=max_items)
-        topic_matches = sum(1 for d in prioritized_docs if self._topic_score(d) >= settings.topic_bias_min_score)
+        ctx.checkpoint["topic_matches"] = sum(1 for d in prioritized_docs if self._is_topic_match(d))
+        ctx.checkpoint["source_errors"] = source_errors
 
-        papers_added: list[Paper] = []
-        dedupe_skipped = 0
-        for doc in prioritized_docs:
-            if self._dedupe_exists(db, doc):
-                dedupe_skipped += 1
-                continue
-            papers_added.append(self._store_paper(db, doc))
+        db.execute(delete(IngestionRunDocument).where(IngestionRunDocument.run_id == run.id))
+        for position, doc in enumerate(prioritized_docs):
+            db.add(
+                IngestionRunDocument(
+                    run_id=run.id,
+                    position=position,
+                    source=doc.source,
+                    source_id=doc.source_id,
+                    payload_json=_document_to_json(doc),
+                )
+            )
+
+    def _stage_store(self, db: Session, run: IngestionRun, ctx: _RunContext) -> None:
+        rows = self._run_documents(db, run)
+        pending = {row.id: row for row in rows if not row.outcome}
+        docs = {row_id: _document_from_json(row.payload_json) for row_id, row in pending.items()}
+        ids = list(docs)
+        # Chunking and embedding run ahead in the CPU pool; this session is the single writer,
+        # classifying in order so in-batch duplicates are still caught.
+        priors: dict[int, Optional[Paper]] = {
+            row_id: self._find_prior_version(db, docs[row_id]) if ctx.payload.include_revised_papers else None
+            for row_id in ids
+        }
+        embed_chunks = [priors[row_id] is None for row_id in ids]
+        prepared = zip(ids, self._prepare_documents([docs[row_id] for row_id in ids], embed_chunks))
+        batch_size = max(1, settings.run_checkpoint_batch_size)
+        written = 0
+        stored_ids: set[str] = set()
+        for row_id, prep in prepared:
+            row, doc = pending[row_id], docs[row_id]
+            prior = priors[row_id]
+            # Only what this loop wrote can change a lookup: an earlier document may have stored
+            # the prior version, or already moved a paper to this very version.
+            if ctx.payload.include_revised_papers and (prior is None or doc.source_id in stored_ids):
+                prior = self._find_prior_version(db, doc)
+            if prior is not None:
+                revision = self._apply_revision(db, prior, doc, run.week_key, prepared=prep)
+                row.outcome, row.paper_id, row.revision_id = "revision", prior.id, revision.id
+            elif self._dedupe_exists(db, doc):
+                row.outcome = "duplicate"
+            else:
+                paper = self._store_paper(db, doc, prepared=prep)
+                row.outcome, row.paper_id = "new", paper.id
+            stored_ids.add(doc.source_id)
+            written += 1
+            # Batched commits: a crash loses at most one batch, which resume re-stores.
+            if written % batch_size == 0:
+                db.commit()
+            ctx.report("stored", len(rows) - len(ids) + written, len(rows))
+        db.commit()
 
         # Verification payload for arXiv coverage
-        arxiv_discovered_docs = [d for d in prioritized_docs if d.source == "arxiv"]
-        arxiv_discovered_ids = [d.arxiv_id or d.source_id for d in arxiv_discovered_docs]
-        arxiv_new_papers = [p for p in papers_added if p.source == "arxiv"]
+        arxiv_rows = [r for r in rows if r.source == "arxiv"]
+        arxiv_discovered_ids = [_document_from_json(r.payload_json).arxiv_id or r.source_id for r in arxiv_rows]
+        arxiv_new_papers = [db.get(Paper, r.paper_id) for r in arxiv_rows if r.outcome == "new" and r.paper_id]
+        arxiv_new_papers = [p for p in arxiv_new_papers if p is not None]
         full_text_success = [p for p in arxiv_new_papers if _is_full_text_processed(p)]
         abstract_only = [p for p in arxiv_new_papers if not _is_full_text_processed(p)]
 
-        discovered_count = len(arxiv_discovered_docs)
+        discovered_count = len(arxiv_rows)
         processed_count = len(arxiv_new_papers)
         failed_count = max(0, discovered_count - processed_count)
         full_text_coverage = (len(full_text_success) / discovered_count) if discovered_count else 0.0
         processed_coverage = (processed_count / discovered_count) if discovered_count else 0.0
 
         verification_payload = {
-            "week_key": week_key,
+            "week_key": run.week_key,
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "arxiv_discovered_count": discovered_count,
             "arxiv_discovered_ids": arxiv_discovered_ids,
@@ -577,87 +1697,160 @@ class DefaultWorkflowService(WorkflowService):
             "abstract_only_ids": [p.arxiv_id or p.source_id for p in abstract_only],
             "failed_count": failed_count,
             "failed_ids": arxiv_discovered_ids[processed_count:],
-            "dedupe_skipped_total": dedupe_skipped,
+            "dedupe_skipped_total": sum(1 for r in rows if r.outcome == "duplicate"),
+            "arxiv_revised_ids": [
+                _document_from_json(r.payload_json).arxiv_id or r.source_id for r in arxiv_rows if r.outcome == "revision"
+            ],
             "full_text_coverage": full_text_coverage,
             "processed_coverage": processed_coverage,
         }
-        _write_verification_artifacts(week_key, verification_payload)
-
-        alpha_cards = [self._extract_alpha(db, paper) for paper in papers_added]
-
-        # Paper-grounded research memory: hypothesis / methods / results per paper
-        paper_hmr: dict[int, dict[str, str]] = {}
-        for paper in papers_added:
-            hmr = self._extract_hypothesis_method_results(paper)
-            paper_hmr[paper.id] = hmr
-            for key, mem_type in (("hypothesis", "paper_hypothesis"), ("methods", "paper_methods"), ("results", "paper_results")):
-                text = (hmr.get(key) or "").strip()
-                if not text:
+        _write_verification_artifacts(run.week_key, verification_payload)
+        ctx.checkpoint["ingested"] = sum(1 for r in rows if r.outcome == "new")
+        ctx.checkpoint["revised"] = sum(1 for r in rows if r.outcome == "revision")
+        ctx.checkpoint["full_text_coverage"] = full_text_coverage
+        ctx.checkpoint["processed_coverage"] = processed_coverage
+
+    def _stage_extract(self, db: Session, run: IngestionRun, ctx: _RunContext) -> None:
+        # Revised papers only go back through extraction when alpha-relevant text changed.
+        pending: list[IngestionRunDocument] = []
+        for row in self._run_documents(db, run):
+            if row.extracted or not row.paper_id or row.outcome not in {"new", "revision"}:
+                continue
+            if row.outcome == "revision":
+                revision = db.get(PaperRevision, row.revision_id) if row.revision_id else None
+                if not revision or not revision.alpha_reextracted:
                     continue
-                mem_key = f"{week_key}:{mem_type}:{paper.id}"
-                db.merge(
-                    ResearchMemoryEntry(
-                        memory_key=mem_key,
-                        memory_type=mem_type,
-                        title=f"{paper.title[:120]} ({key})",
-                        summary=text,
-                        source_week=week_key,
-                        provenance=f"paper_id={paper.id}; source={paper.source}; arxiv_id={paper.arxiv_id or ''}",
-                        embedding_vector=_embed_text(text, dim=1024),
-                    )
+            pending.append(row)
+
+        base_metrics = json.loads(run.stage_metrics or "{}")
+        batch_size = max(1, settings.run_checkpoint_batch_size)
+        batches = [pending[offset : offset + batch_size] for offset in range(0, len(pending), batch_size)]
+
+        def llm_batch(snapshots: list[_PaperSnapshot]) -> tuple[list[Optional[str]], dict[int, Optional[dict]], dict]:
+            alpha_outputs, hmr_parsed = self._run_extraction_llm(snapshots, ctx.llm_stats)
+            # Metrics as of this batch, before the next one starts recording.
+            return alpha_outputs, hmr_parsed, ctx.llm_stats.stage_metrics()
+
+        def submit(pool: ThreadPoolExecutor, batch: list[IngestionRunDocument]):
+            return pool.submit(llm_batch, [_PaperSnapshot.of(db.get(Paper, row.paper_id)) for row in batch])
+
+        # One batch of LLM calls stays in flight while this thread writes the previous batch.
+        with ThreadPoolExecutor(max_workers=1) as llm_pool:
+            future = submit(llm_pool, batches[0]) if batches else None
+            for idx, batch in enumerate(batches):
+                ctx.report("extracted", idx * batch_size, len(pending))
+                alpha_outputs, hmr_parsed, metrics = future.result()
+                if idx + 1 < len(batches) and settings.pipeline_overlap_llm:
+                    future = submit(llm_pool, batches[idx + 1])
+                papers = [db.get(Paper, row.paper_id) for row in batch]
+                for row, paper, text in zip(batch, papers, alpha_outputs):
+                    card = self._extract_alpha(db, paper, text)
+                    hmr = self._extract_hypothesis_method_results(paper, hmr_parsed.get(paper.id))
+                    self._store_paper_memory(db, run.week_key, paper, hmr)
+                    row.extracted = True
+                    row.alpha_card_id = card.id
+                    row.hmr_json = json.dumps(hmr)
+                run.stage_metrics = json.dumps(_merge_stage_metrics(base_metrics, metrics))
+                db.commit()
+                if idx + 1 < len(batches) and not settings.pipeline_overlap_llm:
+                    future = submit(llm_pool, batches[idx + 1])
+
+        ctx.checkpoint["alpha_cards"] = sum(1 for row in self._run_documents(db, run) if row.alpha_card_id)
+        if ctx.llm_stats.by_model:
+            ctx.checkpoint["llm_summary"] = ctx.llm_stats.summary()
+
+    def _store_paper_memory(self, db: Session, week_key: str, paper: Paper, hmr: dict[str, str]) -> None:
+        # Paper-grounded research memory: hypothesis / methods / results per paper
+        for key, mem_type in (("hypothesis", "paper_hypothesis"), ("methods", "paper_methods"), ("results", "paper_results")):
+            text = (hmr.get(key) or "").strip()
+            if not text:
+                continue
+            mem_key = f"{week_key}:{mem_type}:{paper.id}"
+            _merge_memory(
+                db,
+                ResearchMemoryEntry(
+                    memory_key=mem_key,
+                    memory_type=mem_type,
+                    title=f"{paper.title[:120]} ({key})",
+                    summary=text,
+                    source_week=week_key,
+                    provenance=f"paper_id={paper.id}; source={paper.source}; arxiv_id={paper.arxiv_id or ''}",
+                    embedding_vector=embed_text(text, dim=1024),
                 )
+            )
 
-        hypotheses_input = _build_hypotheses(alpha_cards, week_key)
-        hypotheses: list[Hypothesis] = []
-        for hyp, links in hypotheses_input:
-            db.add(hyp)
-            db.flush()
-            hypotheses.append(hyp)
-            for paper_id, relation, conf, prov in links:
-                db.add(
-                    HypothesisPaperLink(
-                        hypothesis_id=hyp.id,
-                        paper_id=paper_id,
-                        relation=relation,
-                        confidence=conf,
-                        provenance=prov,
-                    )
-                )
+    def _run_alpha_cards(self, db: Session, run: IngestionRun) -> list[PaperAlphaCard]:
+        ids = [row.alpha_card_id for row in self._run_documents(db, run) if row.alpha_card_id]
+        cards = {card.id: card for card in db.scalars(select(PaperAlphaCard).where(PaperAlphaCard.id.in_(ids))).all()} if ids else {}
+        return [cards[i] for i in ids if i in cards]
+
+    def _stage_synthesize(self, db: Session, run: IngestionRun, ctx: _RunContext) -> None:
+        alpha_cards = self._run_alpha_cards(db, run)
+        _score_novelty(db, alpha_cards, self.paper_index.open(db))
+        ctx.checkpoint["high_novelty"] = sum(1 for c in alpha_cards if c.novelty_bucket == "high")
+        statements = {
+            row.paper_id: json.loads(row.hmr_json).get("hypothesis", "")
+            for row in self._run_documents(db, run)
+            if row.paper_id and row.hmr_json
+        }
+        hypothesis_ids = _track_hypotheses(db, alpha_cards, run.week_key, statements)
+        if settings.contradiction_edges_enabled:
+            findings = {
+                row.paper_id: json.loads(row.hmr_json).get("results", "")
+                for row in self._run_documents(db, run)
+                if row.paper_id and row.hmr_json
+            }
+            ctx.checkpoint["contradictions"], ctx.checkpoint["contradiction_checks"] = self._detect_contradictions(
+                db, alpha_cards, run.week_key, findings, ctx.llm_stats, budget=self._contradiction_budget(db, run)
+            )
 
-        clusters_input = _cluster_cards(alpha_cards, week_key)
-        clusters: list[Cluster] = []
+        clusters_input = _cluster_cards(db, alpha_cards, run.week_key)
+        cluster_ids: list[int] = []
         for cluster, paper_ids in clusters_input:
             db.add(cluster)
             db.flush()
-            clusters.append(cluster)
+            cluster_ids.append(cluster.id)
             for paper_id in paper_ids:
                 db.add(ClusterPaperLink(cluster_id=cluster.id, paper_id=paper_id))
 
+        ctx.checkpoint["hypothesis_ids"] = hypothesis_ids
+        ctx.checkpoint["cluster_ids"] = cluster_ids
+
+    def _stage_render(self, db: Session, run: IngestionRun, ctx: _RunContext) -> None:
+        week_key = run.week_key
+        rows = self._run_documents(db, run)
+        papers_added = [db.get(Paper, r.paper_id) for r in rows if r.outcome == "new" and r.paper_id]
+        papers_added = [p for p in papers_added if p is not None]
+        revisions: list[tuple[Paper, PaperRevision]] = []
+        for r in rows:
+            if r.outcome == "revision" and r.paper_id and r.revision_id:
+                paper, revision = db.get(Paper, r.paper_id), db.get(PaperRevision, r.revision_id)
+                if paper and revision:
+                    revisions.append((paper, revision))
+        alpha_cards = self._run_alpha_cards(db, run)
+        hyp_ids = ctx.checkpoint.get("hypothesis_ids", [])
+        hyp_by_id = {h.id: h for h in db.scalars(select(Hypothesis).where(Hypothesis.id.in_(hyp_ids))).all()} if hyp_ids else {}
+        hypotheses = [hyp_by_id[i] for i in hyp_ids if i in hyp_by_id]
+
         brief = db.scalar(select(ResearchBrief).where(ResearchBrief.week_key == week_key))
         if not brief:
             brief = ResearchBrief(week_key=week_key, title=f"aifrontierpulse {week_key}", status="draft")
             db.add(brief)
             db.flush()
 
-        current_version = db.scalar(
-            select(func.max(ResearchBriefVersion.version_number)).where(ResearchBriefVersion.brief_id == brief.id)
-        )
-        version_number = int(current_version or 0) + 1
+        ctx.checkpoint["trend_rows"] = rollup_week(db, week_key)
         long_horizon_insight = _derive_long_horizon_insights(db, week_key, lookback=6)
-        markdown = _render_brief(week_key, papers_added, alpha_cards, hypotheses, long_horizon_insight, paper_hmr=paper_hmr)
-        brief_version = ResearchBriefVersion(
-            brief_id=brief.id,
-            version_number=version_number,
-            editor="system",
-            markdown_content=markdown,
-        )
-        db.add(brief_version)
+        # The brief covers every run of the week, not only this one.
+        inputs = _week_brief_inputs(db, week_key, long_horizon_insight)
+        markdown, ctx.checkpoint["brief_sections_regenerated"] = _compose_cached_brief(db, brief, inputs)
+        brief_version = add_brief_version(db, brief, "system", markdown)
 
         # Memory entries (richer nugget + trend persistence)
         for hyp in hypotheses:
             key = f"{week_key}:hypothesis:{hyp.id}"
             summary = hyp.text
-            db.merge(
+            _merge_memory(
+                db,
                 ResearchMemoryEntry(
                     memory_key=key,
                     memory_type="hypothesis",
@@ -665,14 +1858,15 @@ class DefaultWorkflowService(WorkflowService):
                     summary=summary,
                     source_week=week_key,
                     provenance="derived from linked alpha cards with provenance snippets",
-                    embedding_vector=_embed_text(summary, dim=1024),
+                    embedding_vector=embed_text(summary, dim=1024),
                 )
             )
 
         for card in alpha_cards:
             key = f"{week_key}:alpha:{card.paper_id}:{card.version_number}"
             summary = f"{card.short_alpha_summary}\nMechanism={card.mechanism_type}; Bottleneck={card.bottleneck_attacked}; Novelty={card.novelty_bucket}."
-            db.merge(
+            _merge_memory(
+                db,
                 ResearchMemoryEntry(
                     memory_key=key,
                     memory_type="alpha_nugget",
@@ -680,42 +1874,38 @@ class DefaultWorkflowService(WorkflowService):
                     summary=summary,
                     source_week=week_key,
                     provenance=card.provenance_snippets[:1500],
-                    embedding_vector=_embed_text(summary, dim=1024),
+                    embedding_vector=embed_text(summary, dim=1024),
                 )
             )
 
         trend_key = f"{week_key}:trend:long_horizon"
-        db.merge(
+        _merge_memory(
+            db,
             ResearchMemoryEntry(
                 memory_key=trend_key,
                 memory_type="weekly_synthesis",
                 title=f"Long-horizon synthesis {week_key}",
                 summary=long_horizon_insight,
                 source_week=week_key,
-                provenance="computed from prior hypotheses and clusters",
-                embedding_vector=_embed_text(long_horizon_insight, dim=1024),
+                provenance="computed from weekly trend rollups",
+                embedding_vector=embed_text(long_horizon_insight, dim=1024),
             )
         )
 
+        ctx.checkpoint["brief_version"] = brief_version.version_number
         run.total_items = len(papers_added)
         run.completed_at = datetime.now(timezone.utc)
+        run.status = "completed"
+        source_errors = ctx.checkpoint.get("source_errors", [])
         error_suffix = f" errors={'; '.join(source_errors[:3])}" if source_errors else ""
+        llm_suffix = f" {ctx.checkpoint['llm_summary']}" if ctx.checkpoint.get("llm_summary") else ""
         run.notes = (
-            f"ingested={len(papers_added)} topic_matched={topic_matches} min_topic_score={settings.topic_bias_min_score} "
-            f"hypotheses={len(hypotheses)} clusters={len(clusters)} "
-            f"arxiv_fulltext_coverage={full_text_coverage:.2f} arxiv_processed_coverage={processed_coverage:.2f}{error_suffix}"
-        )
-        db.commit()
-
-        return WorkflowRunResponse(
-            status="completed",
-            run_id=run.id,
-            ingested_papers=len(papers_added),
-            extracted_alpha_cards=len(alpha_cards),
-            synthesized_hypotheses=len(hypotheses),
-            generated_clusters=len(clusters),
-            brief_version=version_number,
-            notes=run.notes,
+            f"ingested={len(papers_added)} revised={len(revisions)} topic_matched={ctx.checkpoint.get('topic_matches', 0)} "
+            f"min_topic_score={settings.topic_bias_min_score} "
+            f"hypotheses={len(hypotheses)} clusters={len(ctx.checkpoint.get('cluster_ids', []))} "
+            f"arxiv_fulltext_coverage={ctx.checkpoint.get('full_text_coverage', 0.0):.2f} "
+            f"arxiv_processed_coverage={ctx.checkpoint.get('processed_coverage', 0.0):.2f}"
+            f"{llm_suffix}{error_suffix}"
         )
 
     def ingestion_policy(self) -> IngestionPolicyResponse:
@@ -746,6 +1936,8 @@ class DefaultWorkflowService(WorkflowService):
             llm_fallback_provider=settings.llm_fallback_provider,
             llm_weekly_budget_usd=settings.llm_weekly_budget_usd,
             llm_weekly_max_calls=settings.llm_weekly_max_calls,
+            llm_max_output_tokens=settings.llm_max_output_tokens,
+            llm_generation_deadline_s=settings.llm_generation_deadline_s,
             openrouter_model=settings.openrouter_model,
         )
 
@@ -789,8 +1981,11 @@ class DefaultAnalysisService(AnalysisService):
     def list_hypotheses(self, db: Session, week_key: Optional[str] = None) -> list[HypothesisOut]:
         query = select(Hypothesis)
         if week_key:
-            query = query.where(Hypothesis.week_introduced == week_key)
+            # Hypotheses live across weeks: include those that gained evidence in ``week_key``.
+            linked = select(HypothesisPaperLink.hypothesis_id).where(HypothesisPaperLink.week_key == week_key)
+            query = query.where((Hypothesis.week_introduced == week_key) | Hypothesis.id.in_(linked))
         rows = db.scalars(query.order_by(desc(Hypothesis.created_at))).all()
+        as_of = week_key or _week_key()
         out: list[HypothesisOut] = []
         for row in rows:
             links = db.scalars(select(HypothesisPaperLink).where(HypothesisPaperLink.hypothesis_id == row.id)).all()
@@ -801,10 +1996,12 @@ class DefaultAnalysisService(AnalysisService):
                     id=row.id,
                     text=row.text,
                     type=row.type,
-                    strength_score=row.user_override_strength or row.strength_score,
+                    strength_score=row.user_override_strength or _hypothesis_strength(row, as_of),
                     user_override_strength=row.user_override_strength,
                     support_count=support_count,
                     contradiction_count=contradiction_count,
+                    week_introduced=row.week_introduced,
+                    last_evidence_week=row.last_evidence_week,
                 )
             )
         return out
@@ -826,6 +2023,7 @@ class DefaultAnalysisService(AnalysisService):
                     dominant_bottleneck=row.dominant_bottleneck,
                     mechanism_summary=row.mechanism_summary,
                     paper_count=int(count),
+                    topic_id=row.topic_id,
                 )
             )
         return out
@@ -874,6 +2072,26 @@ class DefaultAnalysisService(AnalysisService):
             for row in rows
         ]
 
+    def trends(
+        self,
+        db: Session,
+        week_key: Optional[str] = None,
+        window: int = 12,
+        dimension: Optional[str] = None,
+        moving_average_weeks: int = 3,
+        recent_weeks: int = 2,
+        limit: int = 10,
+    ) -> TrendsResponse:
+        return trend_report(
+            db,
+            week_key=week_key,
+            window=window,
+            dimension=dimension,
+            moving_average_weeks=moving_average_weeks,
+            recent_weeks=recent_weeks,
+            limit=limit,
+        )
+
 
 class DefaultBriefService(BriefService):
     def latest_version(self, db: Session, week_key: Optional[str] = None) -> Optional[BriefVersionOut]:
@@ -897,7 +2115,7 @@ class DefaultBriefService(BriefService):
             week_key=brief.week_key,
             version_number=version.version_number,
             editor=version.editor,
-            markdown_content=version.markdown_content,
+            markdown_content=version_markdown(db, version),
             created_at=version.created_at,
         )
 
@@ -908,18 +2126,8 @@ class DefaultBriefService(BriefService):
             db.add(brief)
             db.flush()
 
-        current = db.scalar(
-            select(func.max(ResearchBriefVersion.version_number)).where(ResearchBriefVersion.brief_id == brief.id)
-        )
-        version_number = int(current or 0) + 1
-        row = ResearchBriefVersion(
-            brief_id=brief.id,
-            version_number=version_number,
-            editor=payload.editor,
-            markdown_content=payload.markdown_content,
-        )
+        row = add_brief_version(db, brief, payload.editor, payload.markdown_content)
         brief.updated_at = datetime.now(timezone.utc)
-        db.add(row)
         db.commit()
         db.refresh(row)
         return BriefVersionOut(
@@ -928,12 +2136,40 @@ class DefaultBriefService(BriefService):
             week_key=brief.week_key,
             version_number=row.version_number,
             editor=row.editor,
-            markdown_content=row.markdown_content,
+            markdown_content=payload.markdown_content,
             created_at=row.created_at,
         )
 
+    def diff(
+        self, db: Session, week_key: str, from_version: Optional[int] = None, to_version: Optional[int] = None
+    ) -> BriefDiffOut:
+        brief = db.scalar(select(ResearchBrief).where(ResearchBrief.week_key == week_key))
+        if not brief:
+            raise ValueError(f"No brief for week {week_key}")
+        if to_version is None:
+            to_version = db.scalar(
+                select(func.max(ResearchBriefVersion.version_number)).where(ResearchBriefVersion.brief_id == brief.id)
+            )
+            if to_version is None:
+                raise ValueError(f"Brief {week_key} has no versions")
+        if from_version is None:
+            from_version = max(1, to_version - 1)
+        diff, added, removed = unified_diff(db, brief, from_version, to_version)
+        return BriefDiffOut(
+            week_key=week_key,
+            from_version=from_version,
+            to_version=to_version,
+            added_lines=added,
+            removed_lines=removed,
+            diff=diff,
+        )
+
 
 class DefaultExportService(ExportService):
+    # Part of the export cache key: bump whenever a renderer or template below changes, so
+    # exports cached from older templates are regenerated instead of served.
+    RENDERER_VERSION = 1
+
     def _strip_paths(self, text: str) -> str:
         if not settings.redact_export_paths:
             return text
@@ -1020,40 +2256,67 @@ class DefaultExportService(ExportService):
             "Expect value capture to concentrate in teams that combine technical depth with deployment advantage."
         )
 
-    def generate(self, db: Session, payload: ExportRequest) -> ExportResponse:
-        brief_version = db.get(ResearchBriefVersion, payload.brief_version_id)
-        if not brief_version:
-            raise ValueError(f"Brief version {payload.brief_version_id} not found")
-
-        markdown = self._strip_paths(brief_version.markdown_content)
-        items: list[ExportItem] = []
-
-        for platform in payload.include_platforms:
-            if platform == "twitter":
-                content = self._to_twitter_thread(markdown)
-            elif platform == "linkedin":
-                content = self._to_linkedin(markdown)
-            elif platform == "x_research":
-                content = self._x_research(markdown)
-            elif platform == "x_product":
-                content = self._x_product(markdown)
-            elif platform == "linkedin_research":
-                content = self._linkedin_research(markdown)
-            elif platform == "linkedin_product":
-                content = self._linkedin_product(markdown)
-            elif platform == "linkedin_vc":
-                content = self._linkedin_vc(markdown)
-            else:
-                content = markdown
-            items.append(ExportItem(platform=platform, content=content))
+    def _render_platform(self, platform: str, markdown: str) -> str:
+        if platform == "twitter":
+            return self._to_twitter_thread(markdown)
+        if platform == "linkedin":
+            return self._to_linkedin(markdown)
+        if platform == "x_research":
+            return self._x_research(markdown)
+        if platform == "x_product":
+            return self._x_product(markdown)
+        if platform == "linkedin_research":
+            return self._linkedin_research(markdown)
+        if platform == "linkedin_product":
+            return self._linkedin_product(markdown)
+        if platform == "linkedin_vc":
+            return self._linkedin_vc(markdown)
+        return markdown
+
+    def artifacts(self, db: Session, brief_version_id: int, platforms: list[str]) -> list[ExportItem]:
+        """Exports for ``platforms`` from ``ExportArtifact``, generating and storing only missing ones.
+
+        Brief versions are immutable, so a cached export stays valid until the renderers
+        (``RENDERER_VERSION``) or path redaction change; both are part of the cache key.
+        """
+        platforms = list(dict.fromkeys(platforms))
+        variant = f"r{self.RENDERER_VERSION}:{'redacted' if settings.redact_export_paths else 'raw'}"
+        cached = {
+            row.platform: row.content
+            for row in db.scalars(
+                select(ExportArtifact).where(
+                    ExportArtifact.brief_version_id == brief_version_id,
+                    ExportArtifact.variant == variant,
+                    ExportArtifact.platform.in_(platforms),
+                )
+            ).all()
+        }
+        missing = [p for p in platforms if p not in cached]
+        if missing:
+            brief_version = db.get(ResearchBriefVersion, brief_version_id)
+            if not brief_version:
+                raise ValueError(f"Brief version {brief_version_id} not found")
+            markdown = self._strip_paths(version_markdown(db, brief_version))
+            # Renderers are cheap string templating; threads would only add overhead.
+            generated = {platform: self._render_platform(platform, markdown) for platform in missing}
+            for platform, content in generated.items():
+                db.add(ExportArtifact(brief_version_id=brief_version_id, platform=platform, variant=variant, content=content))
+            try:
+                db.commit()
+            except IntegrityError:
+                # A concurrent request stored the same exports first; the content is identical.
+                db.rollback()
+            cached.update(generated)
+        return [ExportItem(platform=p, content=cached[p]) for p in platforms]
 
-        return ExportResponse(items=items)
+    def generate(self, db: Session, payload: ExportRequest) -> ExportResponse:
+        return ExportResponse(items=self.artifacts(db, payload.brief_version_id, payload.include_platforms))
 
 
 class DefaultQAService(QAService):
     def checklist(self, db: Session) -> QAResponse:
         latest = db.scalar(select(ResearchBriefVersion).order_by(desc(ResearchBriefVersion.created_at)))
-        has_citation = bool(latest and "citation" in latest.markdown_content.lower())
+        has_citation = bool(latest and "citation" in version_markdown(db, latest).lower())
         return QAResponse(
             checklist=[
                 QAItem(id="citations", title="Claims include citations/provenance", required=True, passed=has_citation),
@@ -1093,6 +2356,7 @@ class DefaultDiagnosticsService(DiagnosticsService):
             memory_alpha_nugget_count=int(mem_alpha),
             memory_weekly_synthesis_count=int(mem_weekly),
             last_run_notes=latest_run.notes if latest_run else None,
+            last_run_stage_metrics=json.loads(latest_run.stage_metrics or "{}") if latest_run else None,
             last_run_completed_at=latest_run.completed_at if latest_run else None,
         )
 
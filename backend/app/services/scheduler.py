@@ -1,38 +1,226 @@
 from __future__ import annotations
 
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import case, desc, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.db.models import SchedulerJobRun, SchedulerLease, WorkflowJob
 from app.db.session import SessionLocal
-from app.schemas.domain import WorkflowRunRequest
-from app.services.pipeline import workflow_service
+from app.schemas.domain import SchedulerRunOut, WorkflowRunRequest
+from app.services.jobs import JobConflictError, WorkflowJobQueue, job_queue
 
 scheduler = BackgroundScheduler(timezone=settings.weekly_timezone)
 
+HOLDER = f"{socket.gethostname()}:{os.getpid()}"
+LEADER_LEASE = "scheduler_leader"
+NIGHTLY_JOB = "nightly_pipeline"
 
-def run_nightly_job() -> None:
-    with SessionLocal() as db:
-        workflow_service.run_weekly(
-            db=db,
-            payload=WorkflowRunRequest(
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def try_acquire_lease(db: Session, name: str, holder: str, ttl_s: float) -> bool:
+    """Take or renew lease ``name`` for ``holder``; False while another holder's lease is live.
+
+    A conditional UPDATE (or the primary-key INSERT for a new lease) is the only write, so
+    concurrent processes racing for an expired lease cannot both win.
+    """
+    now = _utcnow()
+    expires_at = now + timedelta(seconds=ttl_s)
+    result = db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now))
+        .values(
+            expires_at=expires_at,
+            acquired_at=case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now),
+            holder=holder,
+        )
+    )
+    if result.rowcount:
+        db.commit()
+        return True
+    if db.get(SchedulerLease, name) is not None:
+        db.rollback()
+        return False
+    db.add(SchedulerLease(name=name, holder=holder, expires_at=expires_at, acquired_at=now))
+    try:
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+
+
+def release_lease(db: Session, name: str, holder: str) -> None:
+    db.execute(
+        update(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .values(expires_at=_utcnow())
+    )
+    db.commit()
+
+
+def _trigger() -> CronTrigger:
+    minute, hour, *_ = settings.weekly_cron.split()
+    return CronTrigger(minute=minute, hour=hour, timezone=settings.weekly_timezone)
+
+
+def _renew_interval_s() -> float:
+    return max(5.0, settings.scheduler_lease_ttl_s / 3)
+
+
+def previous_fire_time(trigger: CronTrigger, now: datetime) -> Optional[datetime]:
+    """Most recent time ``trigger`` fired at or before ``now`` (looks back up to eight days)."""
+    fire = trigger.get_next_fire_time(None, now - timedelta(days=8))
+    last = None
+    while fire is not None and fire <= now:
+        last = fire
+        fire = trigger.get_next_fire_time(fire, fire + timedelta(seconds=1))
+    return last
+
+
+def enqueue_scheduled_run(
+    db: Session,
+    scheduled_for: Optional[datetime],
+    catch_up: bool = False,
+    queue: WorkflowJobQueue = job_queue,
+    holder: str = HOLDER,
+) -> SchedulerJobRun:
+    record = SchedulerJobRun(job_name=NIGHTLY_JOB, scheduled_for=scheduled_for, holder=holder, catch_up=catch_up)
+    try:
+        job = queue.submit(
+            db,
+            "weekly_run",
+            WorkflowRunRequest(
                 max_papers=settings.default_max_papers,
                 sources=settings.ingest_sources_list,
                 include_revised_papers=settings.include_revised_papers,
             ),
         )
+        record.status, record.workflow_job_id = "enqueued", job.id
+    except JobConflictError as exc:
+        # A manual run is already going; it covers this slot.
+        record.status, record.error = "conflict", str(exc)
+    except Exception as exc:
+        db.rollback()
+        record.status, record.error = "failed", f"{type(exc).__name__}: {exc}"[:2000]
+    db.add(record)
+    db.commit()
+    return record
+
+
+def run_nightly_job() -> None:
+    with SessionLocal() as db:
+        if not try_acquire_lease(db, LEADER_LEASE, HOLDER, settings.scheduler_lease_ttl_s):
+            return
+        enqueue_scheduled_run(db, scheduled_for=previous_fire_time(_trigger(), _utcnow()))
+
+
+def catch_up_missed_run(
+    db: Session, now: Optional[datetime] = None, queue: WorkflowJobQueue = job_queue
+) -> Optional[SchedulerJobRun]:
+    """Enqueue one run if the last scheduled fire was missed; any number of misses coalesce into it.
+
+    Callers must hold the leader lease. A fire younger than one renewal interval is left to
+    the regular cron job, so the two never race for the same slot.
+    """
+    now = now or _utcnow()
+    missed = previous_fire_time(_trigger(), now)
+    if missed is None or now - missed < timedelta(seconds=_renew_interval_s()):
+        return None
+    last = db.scalar(
+        select(SchedulerJobRun).where(SchedulerJobRun.job_name == NIGHTLY_JOB).order_by(desc(SchedulerJobRun.id))
+    )
+    last_fire = last.scheduled_for if last else None
+    if last_fire is not None and last_fire.tzinfo is None:  # sqlite drops tzinfo on round-trip
+        last_fire = last_fire.replace(tzinfo=timezone.utc)
+    # No history yet means a fresh install: wait for the first regular fire instead.
+    if last_fire is None or last_fire >= missed:
+        return None
+    return enqueue_scheduled_run(db, scheduled_for=missed, catch_up=True, queue=queue)
+
+
+def renew_leadership() -> None:
+    """Take or keep the leader lease; whoever holds it also runs the missed-slot check.
+
+    Checking on every renewal (not just once at startup) means a follower that takes over
+    from a dead leader picks up the slot the old leader never ran.
+    """
+    with SessionLocal() as db:
+        if not try_acquire_lease(db, LEADER_LEASE, HOLDER, settings.scheduler_lease_ttl_s):
+            return
+        if settings.scheduler_catch_up_missed:
+            catch_up_missed_run(db)
+
+
+def list_history(db: Session, limit: int = 50) -> list[SchedulerRunOut]:
+    rows = db.execute(
+        select(SchedulerJobRun, WorkflowJob)
+        .outerjoin(WorkflowJob, WorkflowJob.id == SchedulerJobRun.workflow_job_id)
+        .order_by(desc(SchedulerJobRun.id))
+        .limit(limit)
+    ).all()
+    out: list[SchedulerRunOut] = []
+    for record, job in rows:
+        duration = None
+        if job and job.started_at and job.finished_at:
+            duration = (job.finished_at - job.started_at).total_seconds()
+        out.append(
+            SchedulerRunOut(
+                id=record.id,
+                job_name=record.job_name,
+                scheduled_for=record.scheduled_for,
+                status=record.status,
+                holder=record.holder,
+                catch_up=record.catch_up,
+                workflow_job_id=record.workflow_job_id,
+                workflow_job_status=job.status if job else None,
+                duration_s=duration,
+                error=record.error,
+                created_at=record.created_at,
+            )
+        )
+    return out
 
 
 def start_scheduler() -> None:
     if scheduler.running:
         return
 
-    minute, hour, *_ = settings.weekly_cron.split()
-    trigger = CronTrigger(minute=minute, hour=hour)
-    scheduler.add_job(run_nightly_job, trigger=trigger, id="nightly_pipeline", replace_existing=True)
+    # Every worker runs the scheduler; the leader lease decides which one acts on each fire.
+    scheduler.add_job(
+        run_nightly_job,
+        trigger=_trigger(),
+        id=NIGHTLY_JOB,
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=settings.scheduler_misfire_grace_s,
+    )
+    scheduler.add_job(
+        renew_leadership,
+        trigger=IntervalTrigger(seconds=_renew_interval_s()),
+        id="scheduler_leader_lease",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        next_run_time=datetime.now(timezone.utc),
+    )
     scheduler.start()
 
 
 def stop_scheduler() -> None:
     if scheduler.running:
         scheduler.shutdown(wait=False)
+        with SessionLocal() as db:
+            release_lease(db, LEADER_LEASE, HOLDER)
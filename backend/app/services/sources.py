@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import io
+import re
 import time
-from dataclasses import dataclass
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Protocol
 from xml.etree import ElementTree
@@ -10,6 +13,9 @@ from xml.etree import ElementTree
 import feedparser
 import httpx
 
+from app.services.pdf_worker import ParserStats, parse_pdf_isolated
+from app.services.text_utils import canonical_section_name, heading_level
+
 
 @dataclass
 class SourceDocument:
@@ -23,6 +29,13 @@ class SourceDocument:
     updated_at: Optional[datetime]
     source_url: str
     arxiv_id: Optional[str] = None
+    # Layout-derived (section_name, start, end) spans into full_text, when the PDF parser provides them.
+    sections: list[tuple[str, int, int]] = field(default_factory=list)
+    parser_name: Optional[str] = None
+    parse_seconds: Optional[float] = None
+    # Filled in lazily by the workflow's topic scorers.
+    topic_score: Optional[float] = None
+    topic_similarity: Optional[float] = None
 
 
 class SourceConnector(Protocol):
@@ -46,55 +59,301 @@ def _request_with_retry(url: str, timeout: int = 60, retries: int = 3) -> httpx.
     raise RuntimeError(f"Failed after retries: {url}") from last_error
 
 
-def _extract_pdf_text(pdf_bytes: bytes, parser_primary: str = "pymupdf", parser_fallback: str = "pdfminer") -> str:
-    def parse_with_pymupdf(data: bytes) -> str:
-        import fitz  # pymupdf
+@dataclass
+class PdfBlock:
+    page: int
+    text: str
+    font_size: float
+    is_bold: bool
+
+
+@dataclass
+class ParsedPdf:
+    text: str
+    # (section_name, start, end) offsets into text; empty when the parser has no layout info.
+    sections: list[tuple[str, int, int]] = field(default_factory=list)
+    parser: str = ""
+    parse_seconds: float = 0.0
+
+
+@dataclass
+class PdfParseOptions:
+    appendix_policy: str = "main_first_fallback"
+    max_chars: int = 250_000
+    min_main_chars: int = 4000
+    # Worker-process isolation; None parses in-process with no timeout.
+    timeout_s: Optional[float] = None
+    memory_mb: int = 0
+    race_after_s: Optional[float] = None
+    stats: Optional[ParserStats] = None
+
+
+def _join_block_lines(lines: list[str]) -> str:
+    out = ""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if out.endswith("-") and line[:1].islower():
+            out = out[:-1] + line  # de-hyphenate words broken across lines
+        else:
+            out = f"{out} {line}" if out else line
+    return out
 
-        text_parts: list[str] = []
-        doc = fitz.open(stream=data, filetype="pdf")
-        try:
-            for page in doc:
-                text_parts.append(page.get_text("text") or "")
-        finally:
-            doc.close()
-        return "\n".join(text_parts)
 
-    def parse_with_pdfminer(data: bytes) -> str:
-        from pdfminer.high_level import extract_text
+def _iter_pymupdf_blocks(data: bytes) -> Iterator[PdfBlock]:
+    """Yield text blocks page by page with their dominant font size and boldness.
 
-        return extract_text(io.BytesIO(data)) or ""
+    Only one page's layout dict is alive at a time, so memory stays bounded on long
+    appendices; image payloads are excluded from the dict.
+    """
+    import fitz  # pymupdf
+
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        for page_number in range(doc.page_count):
+            page = doc.load_page(page_number)
+            layout = page.get_text("dict", flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES)
+            for block in layout.get("blocks", []):
+                if block.get("type", 0) != 0:
+                    continue
+                lines: list[str] = []
+                chars = 0
+                size_weight = 0.0
+                bold_chars = 0
+                for line in block.get("lines", []):
+                    spans = line.get("spans", [])
+                    lines.append("".join(span.get("text", "") for span in spans))
+                    for span in spans:
+                        n = len(span.get("text", "").strip())
+                        chars += n
+                        size_weight += float(span.get("size", 0.0)) * n
+                        if span.get("flags", 0) & 16 or "bold" in span.get("font", "").lower():
+                            bold_chars += n
+                text = _join_block_lines(lines)
+                if not text or not chars:
+                    continue
+                yield PdfBlock(
+                    page=page_number,
+                    text=text,
+                    font_size=size_weight / chars,
+                    is_bold=bold_chars >= 0.6 * chars,
+                )
+            del layout, page
+    finally:
+        doc.close()
+
+
+_TAIL_SECTIONS = {"references", "bibliography", "appendix", "appendices"}
+
+
+def _is_tail_heading(text: str) -> bool:
+    text = text.strip()
+    if not text or len(text) > 90:
+        return False
+    first = canonical_section_name(text).split()[0]
+    return re.sub(r"[^a-z]", "", first) in _TAIL_SECTIONS
+
+
+class _LayoutAssembler:
+    """Builds flat text plus a section tree from streamed PDF blocks.
+
+    Body font size is the character-weighted mode of block sizes. The first page is
+    buffered before any heading decision so a large title font cannot skew it; later
+    pages keep refining the estimate as they stream in.
+
+    ``done`` flips once ``max_chars`` is reached or, with ``stop_at_tail``, at the first
+    References/Appendix heading after ``min_main_chars``, so callers can stop parsing.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None, stop_at_tail: bool = False, min_main_chars: int = 0) -> None:
+        self.max_chars = max_chars
+        self.stop_at_tail = stop_at_tail
+        self.min_main_chars = min_main_chars
+        self.done = False
+        self.parts: list[str] = []
+        self.length = 0
+        self.size_hist: Counter[float] = Counter()
+        self.pending: list[PdfBlock] = []
+        self.first_page: Optional[int] = None
+        # (offset, level, name) for each detected heading
+        self.headings: list[tuple[int, int, str]] = []
+
+    def _body_size(self) -> float:
+        return self.size_hist.most_common(1)[0][0] if self.size_hist else 0.0
+
+    def _is_heading(self, block: PdfBlock, body_size: float) -> bool:
+        text = block.text.strip()
+        words = text.split()
+        if not body_size or len(text) > 90 or len(words) > 12:
+            return False
+        numbered = heading_level(text) > 1 or text[:1].isdigit()
+        bare = re.sub(r"^[\dIVX.\s]+", "", text) if numbered else text
+        if not bare[:1].isalpha() or bare.endswith((".", ",", ";", ":")):
+            return False
+        larger = block.font_size >= body_size * 1.12
+        bold = block.is_bold and block.font_size >= body_size * 0.95
+        return larger or (bold and (numbered or len(words) <= 6))
+
+    def _emit(self, block: PdfBlock) -> None:
+        if self.done:
+            return
+        body_size = self._body_size()
+        # The first block is the paper title; it belongs to the "main" preamble.
+        is_heading = bool(self.parts) and self._is_heading(block, body_size)
+        if is_heading and self.stop_at_tail and self.length >= self.min_main_chars and _is_tail_heading(block.text):
+            self.done = True
+            return
+        if self.parts:
+            self.parts.append("\n\n")
+            self.length += 2
+        if is_heading:
+            self.headings.append((self.length, heading_level(block.text), canonical_section_name(block.text)))
+        self.parts.append(block.text)
+        self.length += len(block.text)
+        if self.max_chars is not None and self.length >= self.max_chars:
+            self.done = True
+
+    def add(self, block: PdfBlock) -> bool:
+        """Feed one block; returns False once no further blocks are needed."""
+        self.size_hist[round(block.font_size * 2) / 2] += len(block.text)
+        if self.first_page is None:
+            self.first_page = block.page
+        if block.page == self.first_page:
+            self.pending.append(block)
+            return True
+        self._flush_pending()
+        self._emit(block)
+        return not self.done
+
+    def _flush_pending(self) -> None:
+        for pending in self.pending:
+            self._emit(pending)
+        self.pending = []
+
+    def finish(self, parser: str) -> ParsedPdf:
+        self._flush_pending()
+        text = "".join(self.parts)
+        if self.max_chars is not None:
+            text = text[: self.max_chars]
+        sections: list[tuple[str, int, int]] = []
+        points = [(0, 0, "main")] if not self.headings or self.headings[0][0] > 0 else []
+        points += self.headings
+        stack: list[tuple[int, str]] = []
+        for i, (start, level, name) in enumerate(points):
+            while stack and stack[-1][0] >= level:
+                stack.pop()
+            stack.append((level, name))
+            end = min(points[i + 1][0] if i + 1 < len(points) else len(text), len(text))
+            if end > start:
+                path = " / ".join(part for _, part in stack if part != "main") or "main"
+                sections.append((path[:128], start, end))
+        return ParsedPdf(text=text, sections=sections, parser=parser)
+
+
+def _extract_pdf_text(
+    pdf_bytes: bytes,
+    parser_primary: str = "pymupdf",
+    parser_fallback: str = "pdfminer",
+    max_chars: Optional[int] = None,
+    stop_at_tail: bool = False,
+    min_main_chars: int = 0,
+) -> ParsedPdf:
+    """Parse a PDF page by page, stopping early at ``max_chars`` or the reference tail.
+
+    With ``stop_at_tail`` the parse ends at the first References/Appendix heading once at
+    least ``min_main_chars`` of main text is collected; an earlier tail heading (e.g. a
+    short paper whose body did not extract) is kept and parsing continues.
+    """
+
+    def parse_with_pymupdf(data: bytes) -> ParsedPdf:
+        assembler = _LayoutAssembler(max_chars=max_chars, stop_at_tail=stop_at_tail, min_main_chars=min_main_chars)
+        blocks = _iter_pymupdf_blocks(data)
+        try:
+            for block in blocks:
+                if not assembler.add(block):
+                    break
+        finally:
+            blocks.close()
+        return assembler.finish(parser="pymupdf")
+
+    def parse_with_pdfminer(data: bytes) -> ParsedPdf:
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+
+        # No layout metadata here; the chunker falls back to heading-regex sectioning.
+        parts: list[str] = []
+        length = 0
+        for page in extract_pages(io.BytesIO(data)):
+            for element in page:
+                if not isinstance(element, LTTextContainer):
+                    continue
+                text = element.get_text()
+                if stop_at_tail and length >= min_main_chars and _is_tail_heading(text):
+                    return ParsedPdf(text="".join(parts).strip(), parser="pdfminer")
+                parts.append(text)
+                length += len(text)
+                if max_chars is not None and length >= max_chars:
+                    return ParsedPdf(text="".join(parts).strip()[:max_chars], parser="pdfminer")
+        return ParsedPdf(text="".join(parts).strip(), parser="pdfminer")
 
     parsers = [parser_primary, parser_fallback]
     for parser_name in parsers:
         try:
             if parser_name == "pymupdf":
-                text = parse_with_pymupdf(pdf_bytes)
+                parsed = parse_with_pymupdf(pdf_bytes)
             elif parser_name == "pdfminer":
-                text = parse_with_pdfminer(pdf_bytes)
+                parsed = parse_with_pdfminer(pdf_bytes)
             else:
                 continue
-            cleaned = text.strip()
-            if cleaned:
-                return cleaned
+            if parsed.text.strip():
+                return parsed
         except Exception:
             continue
-    return ""
+    return ParsedPdf(text="")
 
 
-def _extract_arxiv_full_text(pdf_url: str, fallback_text: str, parser_primary: str, parser_fallback: str) -> str:
+def _extract_arxiv_full_text(
+    pdf_url: str,
+    fallback_text: str,
+    parser_primary: str,
+    parser_fallback: str,
+    options: Optional[PdfParseOptions] = None,
+) -> ParsedPdf:
+    """Download and parse an arXiv PDF; ``parser`` is empty when ``fallback_text`` was used."""
     if not pdf_url:
-        return fallback_text
+        return ParsedPdf(text=fallback_text)
+    options = options or PdfParseOptions()
 
     try:
         response = _request_with_retry(pdf_url, timeout=90, retries=3)
-        full_text = _extract_pdf_text(response.content, parser_primary=parser_primary, parser_fallback=parser_fallback)
-        if full_text:
-            # Keep reasonable size in DB while preserving substantial context.
-            return full_text[:250_000]
+        # Keep reasonable size in DB while preserving substantial context; the parser stops
+        # at the budget (and, main-paper-first, at the reference tail) instead of clipping after.
+        limits = {
+            "max_chars": options.max_chars,
+            "stop_at_tail": options.appendix_policy == "main_first_fallback",
+            "min_main_chars": options.min_main_chars,
+        }
+        if options.timeout_s:
+            parsed = parse_pdf_isolated(
+                response.content,
+                [parser_primary, parser_fallback],
+                timeout_s=options.timeout_s,
+                memory_mb=options.memory_mb,
+                race_after_s=options.race_after_s,
+                stats=options.stats,
+                **limits,
+            )
+        else:
+            started = time.perf_counter()
+            parsed = _extract_pdf_text(response.content, parser_primary=parser_primary, parser_fallback=parser_fallback, **limits)
+            parsed.parse_seconds = time.perf_counter() - started
+        if parsed.text:
+            return parsed
     except Exception:
         pass
 
-    return fallback_text
+    return ParsedPdf(text=fallback_text)
 
 
 class ArxivConnector:
@@ -112,10 +371,12 @@ class ArxivConnector:
         include_current_id_month: bool = True,
         id_months_back: int = 0,
         announcement_days: int = 7,
+        pdf_options: Optional[PdfParseOptions] = None,
     ) -> None:
         self.categories = categories
         self.parser_primary = parser_primary
         self.parser_fallback = parser_fallback
+        self.pdf_options = pdf_options or PdfParseOptions()
         self.recent_hours = recent_hours
         self.auto_expand_on_empty = auto_expand_on_empty
         self.expand_hours = max(expand_hours, recent_hours)
@@ -189,11 +450,12 @@ class ArxivConnector:
                     continue
 
                 fallback_text = f"{title}\n\n{abstract}"
-                full_text = _extract_arxiv_full_text(
+                parsed = _extract_arxiv_full_text(
                     pdf_url,
                     fallback_text,
                     parser_primary=self.parser_primary,
                     parser_fallback=self.parser_fallback,
+                    options=self.pdf_options,
                 )
 
                 docs.append(
@@ -203,11 +465,14 @@ class ArxivConnector:
                         title=title,
                         authors=", ".join(authors),
                         abstract=abstract,
-                        full_text=full_text,
+                        full_text=parsed.text,
                         published_at=published_at,
                         updated_at=updated_at,
                         source_url=pdf_url or entry_id,
                         arxiv_id=entry_id.split("/")[-1],
+                        sections=parsed.sections,
+                        parser_name=parsed.parser or None,
+                        parse_seconds=parsed.parse_seconds if parsed.parser else None,
                     )
                 )
                 seen_ids.add(entry_id)
@@ -379,6 +644,7 @@ class ArxivConnector:
                 include_current_id_month=self.include_current_id_month,
                 id_months_back=self.id_months_back,
                 announcement_days=self.announcement_days,
+                pdf_options=self.pdf_options,
             )
             return expanded.fetch(max_items=max_items)
 
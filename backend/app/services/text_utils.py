@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from typing import Optional
+
+from app.services.tokenizers import HeuristicTokenizer, Tokenizer
+
+_HEURISTIC = HeuristicTokenizer()
 
 
 @dataclass
@@ -15,54 +20,172 @@ def normalize_whitespace(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
 
 
-def estimate_tokens(text: str) -> int:
-    # Fast approximation for V1.
-    return max(1, len(text) // 4)
-
-
-def split_sections(text: str) -> list[tuple[str, str]]:
-    headings = ["abstract", "introduction", "method", "approach", "results", "discussion", "conclusion"]
-    lower = text.lower()
+def estimate_tokens(text: str, tokenizer: Optional[Tokenizer] = None) -> int:
+    # Falls back to the chars/4 approximation when no model tokenizer is supplied.
+    return (tokenizer or _HEURISTIC).count(text)
+
+
+# One pass over the document: a candidate heading is a short line holding a known section
+# name, optionally numbered ("3", "3.1", "IV.") and optionally followed by a short title tail.
+# _is_heading then rejects candidates that read like wrapped body text.
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?P<number>(?:\d+|[IVX]+)(?:\.\d+)*\.?[ \t]+)?"
+    r"(?P<word>abstract|introduction|methodology|methods?|approach|experiments|evaluation|results"
+    r"|discussion|conclusions?)\b(?P<tail>[^\n]{0,40})$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_TITLE_CONNECTORS = frozenset("a an and for in of on the to with".split())
+_CANONICAL_HEADINGS = {
+    "methodology": "method",
+    "methods": "method",
+    "experiments": "results",
+    "evaluation": "results",
+    "conclusions": "conclusion",
+}
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]?\s+")
+_SENTENCE_BREAKS = (". ", ".\n", "? ", "?\n", "! ", "!\n")
+
+
+_NUMBERING_RE = re.compile(r"^\s*(?:(?:\d+|[IVX]+)(?:\.\d+)*\.?|[A-Z](?:\.\d+)*\.)\s+")
+
+
+def heading_level(heading: str) -> int:
+    """Depth from heading numbering ("3" -> 1, "3.2" -> 2); unnumbered headings are top level."""
+    match = _NUMBERING_RE.match(heading)
+    if not match:
+        return 1
+    return match.group(0).strip().rstrip(".").count(".") + 1
+
+
+def canonical_section_name(heading: str) -> str:
+    """Canonical name for a heading ("3 Methods" -> "method"); other headings are lower-cased as-is."""
+    stripped = _NUMBERING_RE.sub("", heading.strip(), count=1)
+    words = stripped.split()
+    if not words:
+        return "main"
+    first = re.sub(r"[^a-z]", "", words[0].lower())
+    if _HEADING_RE.match(first):
+        return _CANONICAL_HEADINGS.get(first, first)
+    return " ".join(words).lower()[:64]
+
+
+def _is_heading(match: re.Match[str]) -> bool:
+    """Numbered or title-case heading word, and a tail that is a title rather than a sentence.
+
+    "3 Results", "RESULTS" and "Results and Discussion" qualify; "results in poor
+    calibration." (a wrapped body line) does not.
+    """
+    word, tail = match.group("word"), match.group("tail").strip()
+    if not match.group("number") and not word[0].isupper():
+        return False
+    if tail.endswith((".", ",", ";")):
+        return False
+    return all(
+        token[0].isupper() or token.lower() in _TITLE_CONNECTORS for token in re.findall(r"[A-Za-z][A-Za-z'-]*", tail)
+    )
+
+
+def find_sections(text: str) -> list[tuple[str, int, int]]:
+    """Section spans as ``(name, start, end)`` offsets into ``text``.
+
+    Only the first heading line per canonical name opens a section, so later mentions
+    (e.g. a "Results" table caption) do not fragment the paper. Text before the first
+    heading is kept as ``main``.
+    """
     points: list[tuple[int, str]] = []
-    for heading in headings:
-        idx = lower.find(f"\n{heading}")
-        if idx != -1:
-            points.append((idx, heading))
+    seen: set[str] = set()
+    for match in _HEADING_RE.finditer(text):
+        if not _is_heading(match):
+            continue
+        word = match.group("word").lower()
+        name = _CANONICAL_HEADINGS.get(word, word)
+        if name in seen:
+            continue
+        seen.add(name)
+        points.append((match.start(), name))
 
     if not points:
-        return [("main", text)]
+        return [("main", 0, len(text))]
 
-    points.sort(key=lambda x: x[0])
-    sections: list[tuple[str, str]] = []
+    spans: list[tuple[str, int, int]] = []
+    if text[: points[0][0]].strip():
+        spans.append(("main", 0, points[0][0]))
     for i, (start, name) in enumerate(points):
         end = points[i + 1][0] if i + 1 < len(points) else len(text)
-        chunk = text[start:end].strip()
-        if chunk:
-            sections.append((name, chunk))
-    return sections or [("main", text)]
+        spans.append((name, start, end))
+    return spans
 
 
-def make_chunks(text: str, target_tokens: int, overlap_tokens: int) -> list[Chunk]:
-    target_chars = max(1200, target_tokens * 4)
-    overlap_chars = max(0, overlap_tokens * 4)
-    sections = split_sections(text)
-    out: list[Chunk] = []
-
-    for section_name, section_text in sections:
-        raw = normalize_whitespace(section_text)
-        if not raw:
-            continue
+def split_sections(text: str) -> list[tuple[str, str]]:
+    sections = [(name, text[start:end].strip()) for name, start, end in find_sections(text)]
+    return [(name, body) for name, body in sections if body] or [("main", text)]
+
+
+def _snap_end(text: str, lo: int, end: int) -> int:
+    """Move a window end back to the last paragraph or sentence break in ``[lo, end)``."""
+    para = text.rfind("\n\n", lo, end)
+    if para != -1:
+        return para + 2
+    last = max(text.rfind(mark, lo, end) for mark in _SENTENCE_BREAKS)
+    if last != -1:
+        return last + 2
+    space = text.rfind(" ", lo, end)
+    return space + 1 if space != -1 else end
+
+
+def _snap_start(text: str, start: int, limit: int) -> int:
+    """Move an overlap start forward to the next sentence (or word) start before ``limit``."""
+    match = _SENTENCE_END_RE.search(text, start, limit)
+    if match:
+        return match.end()
+    space = text.find(" ", start, limit)
+    return space + 1 if space != -1 else start
+
+
+def make_chunks(
+    text: str,
+    target_tokens: int,
+    overlap_tokens: int,
+    tokenizer: Optional[Tokenizer] = None,
+    sections: Optional[list[tuple[str, int, int]]] = None,
+) -> list[Chunk]:
+    """Split ``text`` into overlapping, boundary-snapped chunks in linear time.
+
+    Windows are computed as offsets into the original string and only the emitted
+    chunk is copied and whitespace-normalized. Overlap is capped at half a window so
+    every step advances by at least half the target, whatever the settings.
+
+    Window sizes follow each section's own characters-per-token ratio: the first window
+    is sized from a one-window sample of the section, later ones from the exact counts
+    of the chunks already emitted for it. Nothing beyond that sample and the emitted
+    chunks is tokenized.
+    """
+    tokenizer = tokenizer or _HEURISTIC
+    if not text.strip():
+        return []
 
-        start = 0
-        length = len(raw)
-        while start < length:
-            end = min(length, start + target_chars)
-            piece = raw[start:end]
-            piece_tokens = estimate_tokens(piece)
-            out.append(Chunk(section_name=section_name, text=piece, estimated_tokens=piece_tokens))
-            if end >= length:
+    out: list[Chunk] = []
+    for section_name, sec_start, sec_end in sections or find_sections(text):
+        sample = text[sec_start : min(sec_end, sec_start + max(1200, target_tokens * 4))]
+        chars_per_token = len(sample) / max(1, tokenizer.count(sample))
+        span_chars = span_tokens = 0
+        start = sec_start
+        while start < sec_end:
+            target_chars = max(1200, int(target_tokens * chars_per_token))
+            overlap_chars = min(max(0, int(overlap_tokens * chars_per_token)), target_chars // 2)
+            end = min(sec_end, start + target_chars)
+            if end < sec_end:
+                end = _snap_end(text, start + (target_chars * 3) // 5, end)
+            piece = " ".join(text[start:end].split())
+            if piece:
+                tokens = estimate_tokens(piece, tokenizer)
+                out.append(Chunk(section_name=section_name, text=piece, estimated_tokens=tokens))
+                span_chars, span_tokens = span_chars + (end - start), span_tokens + tokens
+                chars_per_token = span_chars / max(1, span_tokens)
+            if end >= sec_end:
                 break
-            start = max(start + 1, end - overlap_chars)
+            next_start = max(end - overlap_chars, start + target_chars // 2)
+            start = _snap_start(text, next_start, end) if next_start < end else end
 
     return out
 
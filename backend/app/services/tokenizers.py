@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Protocol
+
+
+class Tokenizer(Protocol):
+    name: str
+
+    def count(self, text: str) -> int:
+        ...
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        ...
+
+
+class HeuristicTokenizer:
+    """Four-characters-per-token approximation used when no vocabulary file is available."""
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        return max(1, len(text) // 4)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return text[: max(0, max_tokens) * 4]
+
+
+def _bytes_to_unicode() -> dict[int, str]:
+    # GPT-2 style reversible byte -> printable character map used by byte-level BPE vocabularies.
+    printable = list(range(ord("!"), ord("~") + 1)) + list(range(ord("¡"), ord("¬") + 1)) + list(range(ord("®"), ord("ÿ") + 1))
+    codes = printable[:]
+    extra = 0
+    for b in range(256):
+        if b not in printable:
+            printable.append(b)
+            codes.append(256 + extra)
+            extra += 1
+    return {b: chr(c) for b, c in zip(printable, codes)}
+
+
+# Qwen2 / Llama 3 pre-tokenizer pattern, with \p{L} and \p{N} approximated for the stdlib `re` module.
+_PRETOKENIZE = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+
+class BPETokenizer:
+    """Byte-level BPE over a Hugging Face ``tokenizer.json`` vocabulary.
+
+    Only counting and truncation are needed, so token ids are never materialized; merges
+    for each pre-tokenized word are memoized, which keeps repeated vocabulary cheap.
+    """
+
+    def __init__(self, name: str, merges: list[tuple[str, str]], cache_size: int = 50_000) -> None:
+        self.name = name
+        self.ranks = {pair: rank for rank, pair in enumerate(merges)}
+        self.byte_map = _bytes_to_unicode()
+        self.cache_size = cache_size
+        self._cache: dict[str, int] = {}
+
+    @classmethod
+    def from_file(cls, name: str, path: Path) -> "BPETokenizer":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        model = data.get("model", {})
+        if model.get("type") != "BPE":
+            raise ValueError(f"Unsupported tokenizer type in {path}: {model.get('type')}")
+        merges: list[tuple[str, str]] = []
+        for merge in model.get("merges", []):
+            left, right = merge.split(" ", 1) if isinstance(merge, str) else merge
+            merges.append((left, right))
+        return cls(name=name, merges=merges)
+
+    def _word_tokens(self, word: str) -> int:
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+
+        parts = [self.byte_map[b] for b in word.encode("utf-8")]
+        while len(parts) > 1:
+            best_rank = None
+            best_idx = -1
+            for idx in range(len(parts) - 1):
+                rank = self.ranks.get((parts[idx], parts[idx + 1]))
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank, best_idx = rank, idx
+            if best_idx == -1:
+                break
+            parts[best_idx : best_idx + 2] = [parts[best_idx] + parts[best_idx + 1]]
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[word] = len(parts)
+        return len(parts)
+
+    def count(self, text: str) -> int:
+        return max(1, sum(self._word_tokens(m.group(0)) for m in _PRETOKENIZE.finditer(text)))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        used = 0
+        for match in _PRETOKENIZE.finditer(text):
+            used += self._word_tokens(match.group(0))
+            if used > max_tokens:
+                return text[: match.start()]
+        return text
+
+
+def _vocab_path(model: str, tokenizer_dir: str) -> Optional[Path]:
+    root = Path(tokenizer_dir)
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", model)
+    for candidate in (root / f"{safe}.json", root / safe / "tokenizer.json"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+@lru_cache(maxsize=16)
+def get_tokenizer(model: Optional[str] = None, tokenizer_dir: str = "") -> Tokenizer:
+    """Tokenizer for ``model``, loaded once per model from ``tokenizer_dir``.
+
+    Looks for ``<dir>/<model>.json`` or ``<dir>/<model>/tokenizer.json`` (``:`` and ``/`` in
+    the model name become ``_``) and falls back to the heuristic when none is present.
+    """
+    if model and tokenizer_dir:
+        path = _vocab_path(model, tokenizer_dir)
+        if path:
+            try:
+                return BPETokenizer.from_file(model, path)
+            except Exception:
+                pass
+    return HeuristicTokenizer()
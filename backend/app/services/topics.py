@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.services.clustering import normalize_rows
+
+EmbedFn = Callable[[list[str]], list[list[float]]]
+
+
+class TopicMatcher:
+    """Scores text against the topic-bias keywords with one compiled regex pass.
+
+    The score is the summed weight of the distinct keywords found (weight 1.0 unless given),
+    which with default weights equals the number of keywords present. Matching is plain
+    substring like ``kw in text`` unless ``word_boundaries`` is set, in which case keywords
+    only match as whole words or phrases ("rl" no longer matches inside "world").
+    """
+
+    def __init__(
+        self,
+        keywords: list[str],
+        weights: Optional[dict[str, float]] = None,
+        word_boundaries: bool = False,
+    ) -> None:
+        self.keywords = list(dict.fromkeys(kw.strip().lower() for kw in keywords if kw.strip()))
+        self.weights = {kw: float((weights or {}).get(kw, 1.0)) for kw in self.keywords}
+        self.word_boundaries = word_boundaries
+        self._pattern: Optional[re.Pattern[str]] = None
+        if not self.keywords:
+            return
+
+        def wrap(kw: str) -> str:
+            return rf"\b{re.escape(kw)}\b" if word_boundaries else re.escape(kw)
+
+        # Longest first, inside a lookahead so every start position is tried: overlapping
+        # keywords all count, and a keyword that is a prefix of a longer match is recovered
+        # through ``_implied`` below.
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = re.compile("(?=(" + "|".join(wrap(kw) for kw in ordered) + "))")
+        self._implied = {
+            longer: [kw for kw in self.keywords if kw != longer and re.match(wrap(kw), longer)] for longer in self.keywords
+        }
+
+    def matches(self, text: str) -> set[str]:
+        if self._pattern is None or not text:
+            return set()
+        found: set[str] = set()
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._implied[keyword])
+        return found
+
+    def score(self, text: str) -> float:
+        return sum(self.weights[kw] for kw in self.matches(text))
+
+
+def parse_keyword_weights(raw: str) -> dict[str, float]:
+    """``"rlhf:2, safety:0.5"`` -> ``{"rlhf": 2.0, "safety": 0.5}``; malformed entries are skipped."""
+    weights: dict[str, float] = {}
+    for item in raw.split(","):
+        keyword, _, value = item.rpartition(":")
+        try:
+            weights[keyword.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    weights.pop("", None)
+    return weights
+
+
+class TopicEmbeddings:
+    """Semantic topic relevance: cosine similarity of texts to the topic-bias keywords.
+
+    Keyword vectors are embedded once per embedding model and kept in a JSON file, so
+    later runs only embed keywords that were added. Scoring a batch of texts is one
+    matrix product against the normalized keyword matrix, taking the best-matching topic.
+    """
+
+    def __init__(self, embed: EmbedFn, model: str, path: Optional[Path] = None, batch_size: int = 64) -> None:
+        self.embed = embed
+        self.model = model
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._vectors: dict[str, list[float]] = {}
+        if path and path.is_file():
+            try:
+                self._vectors = json.loads(path.read_text(encoding="utf-8")).get(model, {})
+            except Exception:
+                self._vectors = {}
+
+    def _embed_batched(self, texts: list[str]) -> np.ndarray:
+        rows: list[list[float]] = []
+        for offset in range(0, len(texts), self.batch_size):
+            rows.extend(self.embed(texts[offset : offset + self.batch_size]))
+        return np.asarray(rows, dtype=np.float32)
+
+    def topic_matrix(self, keywords: list[str]) -> np.ndarray:
+        with self._lock:
+            missing = [kw for kw in keywords if kw not in self._vectors]
+            if missing:
+                for kw, vector in zip(missing, self._embed_batched(missing).tolist()):
+                    self._vectors[kw] = vector
+                self._save()
+            return normalize_rows(np.asarray([self._vectors[kw] for kw in keywords], dtype=np.float32))
+
+    def similarities(self, texts: list[str], keywords: list[str]) -> np.ndarray:
+        """Best cosine similarity to any keyword, per text."""
+        if not texts or not keywords:
+            return np.zeros(len(texts), dtype=np.float32)
+        topics = self.topic_matrix(keywords)
+        docs = normalize_rows(self._embed_batched(texts))
+        return (docs @ topics.T).max(axis=1)
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8")) if self.path.is_file() else {}
+        except Exception:
+            payload = {}
+        payload[self.model] = self._vectors
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload), encoding="utf-8")
+        tmp.replace(self.path)
+
+
+def default_topic_embeddings_path() -> Path:
+    return Path(__file__).resolve().parents[2] / "artifacts" / "topic_embeddings.json"
+
+
+def blend_relevance(
+    keyword_scores: np.ndarray,
+    similarities: np.ndarray,
+    age_hours: np.ndarray,
+    semantic_weight: float,
+    recency_weight: float,
+    half_life_hours: float,
+) -> np.ndarray:
+    """Weighted sum of saturating keyword hits, semantic similarity and recency decay, in [0, 1]."""
+    keyword_weight = max(0.0, 1.0 - semantic_weight - recency_weight)
+    keyword_part = keyword_scores / (keyword_scores + 1.0)
+    semantic_part = np.clip(similarities, 0.0, 1.0)
+    recency_part = np.power(0.5, np.maximum(age_hours, 0.0) / max(half_life_hours, 1e-6))
+    return keyword_weight * keyword_part + semantic_weight * semantic_part + recency_weight * recency_part
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, desc, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Hypothesis,
+    HypothesisPaperLink,
+    IngestionRun,
+    IngestionRunDocument,
+    Paper,
+    PaperAlphaCard,
+    TrendRollup,
+)
+from app.schemas.domain import TrendSeriesOut, TrendsResponse
+
+DIMENSIONS = ("hypothesis_type", "bottleneck", "mechanism", "source", "novelty")
+
+
+def week_keys_ending(week_key: str, count: int) -> list[str]:
+    """``count`` consecutive ISO week keys ending at ``week_key``, oldest first."""
+    year, week = week_key.split("-W")
+    end = date.fromisocalendar(int(year), int(week), 1)
+    keys = []
+    for offset in range(max(1, count) - 1, -1, -1):
+        iso = (end - timedelta(weeks=offset)).isocalendar()
+        keys.append(f"{iso[0]}-W{iso[1]:02d}")
+    return keys
+
+
+def _week_bounds(week_key: str) -> tuple[datetime, datetime]:
+    year, week = week_key.split("-W")
+    start = datetime.combine(date.fromisocalendar(int(year), int(week), 1), time(), tzinfo=timezone.utc)
+    return start, start + timedelta(weeks=1)
+
+
+def _run_cards(week_key: str):
+    return (
+        select(IngestionRunDocument.alpha_card_id)
+        .join(IngestionRun, IngestionRun.id == IngestionRunDocument.run_id)
+        .where(IngestionRun.week_key == week_key, IngestionRunDocument.alpha_card_id.is_not(None))
+    )
+
+
+def _week_counts(db: Session, week_key: str, legacy: bool = False) -> dict[str, dict[str, int]]:
+    """Per-dimension counts for one week.
+
+    ``legacy`` is for weeks recorded before runs tracked their documents and links their
+    week: cards no run claims are taken by creation time, and hypotheses by the week they
+    were introduced.
+    """
+    if legacy:
+        start, end = _week_bounds(week_key)
+        tracked = select(IngestionRunDocument.alpha_card_id).where(IngestionRunDocument.alpha_card_id.is_not(None))
+        week_cards = select(PaperAlphaCard.id).where(
+            PaperAlphaCard.created_at >= start, PaperAlphaCard.created_at < end, PaperAlphaCard.id.not_in(tracked)
+        )
+    else:
+        week_cards = _run_cards(week_key)
+    card_columns = {
+        "bottleneck": PaperAlphaCard.bottleneck_attacked,
+        "mechanism": PaperAlphaCard.mechanism_type,
+        "novelty": PaperAlphaCard.novelty_bucket,
+        "source": Paper.source,
+    }
+    counts: dict[str, dict[str, int]] = {}
+    for dimension, column in card_columns.items():
+        rows = db.execute(
+            select(column, func.count(func.distinct(PaperAlphaCard.id)))
+            .join(Paper, Paper.id == PaperAlphaCard.paper_id)
+            .where(PaperAlphaCard.id.in_(week_cards))
+            .group_by(column)
+        ).all()
+        counts[dimension] = {str(value): int(n) for value, n in rows}
+    # Hypotheses persist across weeks; a week counts the ones that gained supporting evidence in it.
+    hypotheses = (
+        select(Hypothesis.type, func.count(func.distinct(Hypothesis.id)))
+        .join(HypothesisPaperLink, HypothesisPaperLink.hypothesis_id == Hypothesis.id)
+        .where(HypothesisPaperLink.week_key == week_key, HypothesisPaperLink.relation == "support")
+    )
+    if legacy:
+        hypotheses = select(Hypothesis.type, func.count(Hypothesis.id)).where(Hypothesis.week_introduced == week_key)
+    rows = db.execute(hypotheses.group_by(Hypothesis.type)).all()
+    counts["hypothesis_type"] = {str(value): int(n) for value, n in rows}
+    return counts
+
+
+def rollup_week(db: Session, week_key: str, legacy: bool = False) -> int:
+    """Recount ``week_key`` into ``trend_rollups``; earlier weeks are left untouched.
+
+    Each run refreshes only its own week, so the cost follows the week's size rather than
+    the history, and re-running a week (resumes, second nightly run) stays idempotent.
+    Returns the number of rows written.
+    """
+    db.execute(delete(TrendRollup).where(TrendRollup.week_key == week_key))
+    written = 0
+    for dimension, values in _week_counts(db, week_key, legacy=legacy).items():
+        for value, count in values.items():
+            db.add(TrendRollup(week_key=week_key, dimension=dimension, value=value[:256], count=count))
+            written += 1
+    db.flush()
+    return written
+
+
+def backfill_rollups(db: Session, weeks: Optional[list[str]] = None) -> list[str]:
+    """Roll up weeks that have history but no rollup rows yet; returns the weeks written.
+
+    Defaults to every week that has alpha cards or runs. Weeks whose runs tracked their
+    documents are counted exactly as the nightly run would; older weeks use the legacy
+    counts. Weeks that already have rollups are skipped, so this is safe to re-run.
+    """
+    if weeks is None:
+        found = set(db.scalars(select(IngestionRun.week_key).where(IngestionRun.week_key != "").distinct()).all())
+        for (created_at,) in db.execute(select(PaperAlphaCard.created_at)):
+            iso = created_at.isocalendar()
+            found.add(f"{iso[0]}-W{iso[1]:02d}")
+        weeks = sorted(found)
+    done = set(db.scalars(select(TrendRollup.week_key).where(TrendRollup.week_key.in_(weeks)).distinct()).all())
+    written: list[str] = []
+    for week_key in weeks:
+        if week_key in done:
+            continue
+        tracked = db.scalar(select(func.count()).select_from(_run_cards(week_key).subquery()))
+        if rollup_week(db, week_key, legacy=not tracked):
+            written.append(week_key)
+    return written
+
+
+def _mean(values: list[int]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+def trend_report(
+    db: Session,
+    week_key: Optional[str] = None,
+    window: int = 12,
+    dimension: Optional[str] = None,
+    moving_average_weeks: int = 3,
+    recent_weeks: int = 2,
+    limit: int = 10,
+) -> TrendsResponse:
+    """Windowed per-value series from the rollups, ending at ``week_key`` (default: latest rolled-up week).
+
+    Reads at most ``window`` weeks of rollup rows, independent of how much history exists.
+    Each series carries a trailing moving average and the change of the last ``recent_weeks``
+    against the rest of the window; mechanisms with the largest positive and negative change
+    are reported as emerging and declining.
+    """
+    if week_key is None:
+        week_key = db.scalar(select(TrendRollup.week_key).order_by(desc(TrendRollup.week_key)).limit(1))
+    if not week_key:
+        return TrendsResponse(end_week="", weeks=[], series=[], emerging=[], declining=[])
+    weeks = week_keys_ending(week_key, window)
+    query = select(TrendRollup).where(TrendRollup.week_key.in_(weeks))
+    if dimension:
+        query = query.where(TrendRollup.dimension == dimension)
+    position = {week: i for i, week in enumerate(weeks)}
+    counts: dict[tuple[str, str], list[int]] = defaultdict(lambda: [0] * len(weeks))
+    for row in db.scalars(query).all():
+        counts[(row.dimension, row.value)][position[row.week_key]] = row.count
+
+    recent = max(1, min(recent_weeks, len(weeks) - 1)) if len(weeks) > 1 else 1
+    span = max(1, moving_average_weeks)
+    series: list[TrendSeriesOut] = []
+    for (dim, value), weekly in counts.items():
+        recent_average = _mean(weekly[-recent:])
+        baseline_average = _mean(weekly[:-recent])
+        series.append(
+            TrendSeriesOut(
+                dimension=dim,
+                value=value,
+                total=sum(weekly),
+                counts=weekly,
+                moving_average=[round(_mean(weekly[max(0, i + 1 - span) : i + 1]), 3) for i in range(len(weekly))],
+                recent_average=round(recent_average, 3),
+                baseline_average=round(baseline_average, 3),
+                change=round(recent_average - baseline_average, 3),
+            )
+        )
+    series.sort(key=lambda s: (s.dimension, -s.total, s.value))
+    mechanisms = [s for s in series if s.dimension == "mechanism"]
+    emerging = sorted((s for s in mechanisms if s.change > 0), key=lambda s: -s.change)[:limit]
+    declining = sorted((s for s in mechanisms if s.change < 0), key=lambda s: s.change)[:limit]
+    return TrendsResponse(end_week=week_key, weeks=weeks, series=series, emerging=emerging, declining=declining)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+from typing import Optional, Protocol
+
+import numpy as np
+from sqlalchemy import Integer, Select, cast, column, select, text, true, values
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.services.clustering import normalize_rows
+
+# (row id, cosine similarity), best first
+Neighbors = list[tuple[int, float]]
+
+
+class VectorIndex(Protocol):
+    def search(self, vectors: np.ndarray, k: int, exclude: Optional[set[int]] = None) -> list[Neighbors]:
+        ...
+
+    def add(self, ids: list[int], vectors: np.ndarray) -> None:
+        ...
+
+
+class InMemoryVectorIndex:
+    """Exact cosine search over a normalized matrix; one matrix product per query batch.
+
+    Used where pgvector is unavailable (sqlite, tests). ``add`` makes new rows searchable
+    immediately, so items created earlier in a batch can be matched by later ones.
+    """
+
+    def __init__(self, ids: Optional[list[int]] = None, vectors: Optional[np.ndarray] = None, dim: int = 1024) -> None:
+        self.ids: list[int] = list(ids or [])
+        self.matrix = normalize_rows(np.asarray(vectors, dtype=np.float32)) if self.ids else np.zeros((0, dim), np.float32)
+
+    def add(self, ids: list[int], vectors: np.ndarray) -> None:
+        if not ids:
+            return
+        self.ids.extend(ids)
+        self.matrix = np.vstack([self.matrix, normalize_rows(np.asarray(vectors, dtype=np.float32))])
+
+    def search(self, vectors: np.ndarray, k: int, exclude: Optional[set[int]] = None) -> list[Neighbors]:
+        queries = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if not self.ids or not len(queries):
+            return [[] for _ in range(len(queries))]
+        sims = queries @ self.matrix.T
+        if exclude:
+            mask = np.fromiter((row_id in exclude for row_id in self.ids), dtype=bool, count=len(self.ids))
+            sims[:, mask] = -np.inf
+            k = min(k, int((~mask).sum()))
+            if k <= 0:
+                return [[] for _ in range(len(queries))]
+        k = min(k, len(self.ids))
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        out: list[Neighbors] = []
+        for row, cols in zip(sims, top):
+            cols = cols[np.argsort(-row[cols])]
+            out.append([(self.ids[c], float(row[c])) for c in cols])
+        return out
+
+
+class PgVectorIndex:
+    """Nearest neighbours through pgvector's cosine operator, served by an HNSW index.
+
+    A batch of queries is one statement: a LATERAL top-k join over a VALUES list of the
+    query vectors. New rows are searchable as soon as they are flushed, so ``add`` has
+    nothing to do.
+    """
+
+    # pgvector's upper bound for hnsw.ef_search; an HNSW scan returns at most that many rows.
+    MAX_EF_SEARCH = 1000
+
+    def __init__(self, db: Session, id_column: InstrumentedAttribute, vector_column: InstrumentedAttribute) -> None:
+        self.db = db
+        self.id_column = id_column
+        self.vector_column = vector_column
+
+    def add(self, ids: list[int], vectors: np.ndarray) -> None:
+        return None
+
+    def batch_query(self, vectors: list[list[float]], fetch: int) -> Select:
+        """Top ``fetch`` rows by cosine distance for every query vector, as ``(qid, id, distance)``."""
+        queries = values(column("qid", Integer), column("qvec", self.vector_column.type), name="queries").data(
+            list(enumerate(vectors))
+        )
+        # VALUES parameters arrive untyped (text); cast so the operator matches the HNSW opclass.
+        distance = self.vector_column.cosine_distance(cast(queries.c.qvec, self.vector_column.type))
+        hits = (
+            select(self.id_column.label("id"), distance.label("distance"))
+            .where(self.vector_column.is_not(None))
+            .order_by(distance)
+            .limit(fetch)
+            .lateral("hits")
+        )
+        return (
+            select(queries.c.qid, hits.c.id, hits.c.distance)
+            .select_from(queries.join(hits, true()))
+            .order_by(queries.c.qid, hits.c.distance)
+        )
+
+    def search(self, vectors: np.ndarray, k: int, exclude: Optional[set[int]] = None) -> list[Neighbors]:
+        queries = np.asarray(vectors, dtype=np.float32).tolist()
+        out: list[Neighbors] = [[] for _ in queries]
+        if not queries or k <= 0:
+            return out
+        exclude = exclude or set()
+        # Excluded rows are dropped after the index scan (a NOT IN filter would bypass HNSW or
+        # starve it), so over-fetch by their count and widen the scan's candidate list to match.
+        fetch = min(k + len(exclude), self.MAX_EF_SEARCH)
+        if fetch > 40:  # pgvector's default ef_search
+            self.db.execute(text(f"SET LOCAL hnsw.ef_search = {int(fetch)}"))
+        for qid, row_id, dist in self.db.execute(self.batch_query(queries, fetch)).all():
+            if row_id in exclude or len(out[qid]) >= k:
+                continue
+            out[qid].append((int(row_id), 1.0 - float(dist)))
+        return out
+
+
+def open_vector_index(
+    db: Session, id_column: InstrumentedAttribute, vector_column: InstrumentedAttribute, dim: int = 1024
+) -> VectorIndex:
+    """pgvector-backed index on Postgres; otherwise an in-memory index loaded from the table."""
+    if db.get_bind().dialect.name == "postgresql":
+        return PgVectorIndex(db, id_column, vector_column)
+    rows = db.execute(select(id_column, vector_column).where(vector_column.is_not(None))).all()
+    return InMemoryVectorIndex(
+        [int(row_id) for row_id, _ in rows],
+        np.asarray([list(vector) for _, vector in rows], dtype=np.float32) if rows else None,
+        dim=dim,
+    )
+
+
+class IncrementalVectorIndex:
+    """Keeps the in-memory fallback index warm across runs, loading only rows added since the last call.
+
+    Row ids must increase monotonically; vectors updated in place after loading (paper
+    revisions) keep their first-seen value. On Postgres the HNSW index is already
+    incremental, so ``open`` simply returns a ``PgVectorIndex``.
+    """
+
+    def __init__(self, id_column: InstrumentedAttribute, vector_column: InstrumentedAttribute, dim: int = 1024) -> None:
+        self.id_column = id_column
+        self.vector_column = vector_column
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._bind = None
+        self._index = InMemoryVectorIndex(dim=dim)
+        self._max_id = 0
+
+    def open(self, db: Session) -> VectorIndex:
+        bind = db.get_bind()
+        if bind.dialect.name == "postgresql":
+            return PgVectorIndex(db, self.id_column, self.vector_column)
+        with self._lock:
+            if bind is not self._bind:
+                self._bind, self._index, self._max_id = bind, InMemoryVectorIndex(dim=self.dim), 0
+            rows = db.execute(
+                select(self.id_column, self.vector_column)
+                .where(self.vector_column.is_not(None), self.id_column > self._max_id)
+                .order_by(self.id_column)
+            ).all()
+            if rows:
+                vectors = np.asarray([list(vector) for _, vector in rows], dtype=np.float32)
+                self._index.add([int(row_id) for row_id, _ in rows], vectors)
+                self._max_id = int(rows[-1][0])
+            return self._index
@@ -0,0 +1,61 @@
+"""Dedicated pipeline worker, so nightly runs do not share a process (and GIL) with the API.
+
+Runs queued workflow jobs and, with ``SCHEDULER_MODE=external``, the nightly scheduler.
+Pair it with ``JOB_WORKER_MODE=external`` on the API so the API only enqueues.
+
+Usage:
+    python -m app.worker
+    python -m app.worker --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+from typing import Optional
+
+from app.config import settings
+from app.db.session import ensure_db_extensions, init_db
+from app.services.jobs import job_worker
+from app.services.pipeline import workflow_service
+from app.services.scheduler import start_scheduler, stop_scheduler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run queued and scheduled pipeline jobs")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="processes for per-paper chunking and embedding (default: WORKER_PROCESSES)",
+    )
+    parser.add_argument("--no-scheduler", action="store_true", help="only run queued jobs, even in external scheduler mode")
+    args = parser.parse_args(argv)
+    if args.processes is not None:
+        settings.worker_processes = max(1, args.processes)
+
+    if settings.db_init_mode == "create_all":
+        init_db()
+    else:
+        ensure_db_extensions()
+
+    def shutdown(signum, frame) -> None:
+        job_worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    # Several workers may run this; the scheduler's leader lease keeps fires single.
+    run_scheduler = settings.scheduler_mode == "external" and not args.no_scheduler
+    if run_scheduler:
+        start_scheduler()
+    try:
+        job_worker.run_forever()
+    finally:
+        if run_scheduler:
+            stop_scheduler()
+        workflow_service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Fill ``trend_rollups`` for weeks ingested before the table existed.
+
+The nightly run only rolls up its own week, so without a backfill /trends and the
+long-horizon synthesis see no history older than the upgrade. Weeks that already have
+rollups are skipped; re-running is safe.
+
+Usage:
+    python3 scripts/backfill_trend_rollups.py
+    python3 scripts/backfill_trend_rollups.py --week 2026-W40 --week 2026-W41
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.trends import backfill_rollups  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--week", action="append", help="ISO week key (YYYY-Www); default: every week with history")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        written = backfill_rollups(db, weeks=args.week)
+        db.commit()
+    print(f"rolled up {len(written)} week(s): {', '.join(written) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
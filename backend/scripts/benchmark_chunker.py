@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark the offset-based chunker against the previous copy-and-slice chunker.
+
+Feeds real papers through both implementations, clipped to the 250,000-character
+limit the arXiv connector stores. Inputs can be local PDFs or text files, or
+arXiv IDs to download.
+
+Usage:
+    python3 scripts/benchmark_chunker.py --arxiv-id 2310.06825 --arxiv-id 2402.03300
+    python3 scripts/benchmark_chunker.py paper1.pdf paper2.txt --target-tokens 64 --overlap-tokens 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from statistics import median
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.sources import _extract_pdf_text, _request_with_retry  # noqa: E402
+from app.services.text_utils import estimate_tokens, make_chunks  # noqa: E402
+
+MAX_CHARS = 250_000
+
+
+def legacy_make_chunks(text: str, target_tokens: int, overlap_tokens: int) -> list[tuple[str, str]]:
+    """The pre-rewrite chunker, kept verbatim for A/B timing."""
+    target_chars = max(1200, target_tokens * 4)
+    overlap_chars = max(0, overlap_tokens * 4)
+    headings = ["abstract", "introduction", "method", "approach", "results", "discussion", "conclusion"]
+    lower = text.lower()
+    points = []
+    for heading in headings:
+        idx = lower.find(f"\n{heading}")
+        if idx != -1:
+            points.append((idx, heading))
+    points.sort(key=lambda x: x[0])
+    sections = []
+    for i, (start, name) in enumerate(points):
+        end = points[i + 1][0] if i + 1 < len(points) else len(text)
+        chunk = text[start:end].strip()
+        if chunk:
+            sections.append((name, chunk))
+    sections = sections or [("main", text)]
+
+    out = []
+    for section_name, section_text in sections:
+        raw = re.sub(r"\s+", " ", section_text).strip()
+        start = 0
+        length = len(raw)
+        while start < length:
+            end = min(length, start + target_chars)
+            piece = raw[start:end]
+            estimate_tokens(piece)
+            out.append((section_name, piece))
+            if end >= length:
+                break
+            start = max(start + 1, end - overlap_chars)
+    return out
+
+
+def _load_inputs(paths: list[str], arxiv_ids: list[str]) -> list[tuple[str, str]]:
+    docs: list[tuple[str, str]] = []
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.suffix.lower() == ".pdf":
+            text = _extract_pdf_text(path.read_bytes()).text
+        else:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        docs.append((path.name, text[:MAX_CHARS]))
+    for arxiv_id in arxiv_ids:
+        response = _request_with_retry(f"https://arxiv.org/pdf/{arxiv_id}", timeout=90)
+        docs.append((arxiv_id, _extract_pdf_text(response.content).text[:MAX_CHARS]))
+    return docs
+
+
+def _time(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs offset-based chunker on real papers")
+    parser.add_argument("paths", nargs="*", help="PDF or text files")
+    parser.add_argument("--arxiv-id", action="append", default=[], help="arXiv ID to download (repeatable)")
+    parser.add_argument("--target-tokens", type=int, default=1200)
+    parser.add_argument("--overlap-tokens", type=int, default=150)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = _load_inputs(args.paths, args.arxiv_id)
+    if not docs:
+        parser.error("provide at least one paper path or --arxiv-id")
+
+    print(f"target_tokens={args.target_tokens} overlap_tokens={args.overlap_tokens} repeats={args.repeats}")
+    print(f"{'paper':<28} {'chars':>8} {'legacy_ms':>10} {'legacy_n':>9} {'new_ms':>8} {'new_n':>6} {'speedup':>8}")
+    for name, text in docs:
+        legacy_s = _time(lambda: legacy_make_chunks(text, args.target_tokens, args.overlap_tokens), args.repeats)
+        new_s = _time(lambda: make_chunks(text, args.target_tokens, args.overlap_tokens), args.repeats)
+        legacy_n = len(legacy_make_chunks(text, args.target_tokens, args.overlap_tokens))
+        new_n = len(make_chunks(text, args.target_tokens, args.overlap_tokens))
+        speedup = legacy_s / new_s if new_s else float("inf")
+        print(
+            f"{name[:28]:<28} {len(text):>8} {legacy_s * 1000:>10.1f} {legacy_n:>9} "
+            f"{new_s * 1000:>8.1f} {new_n:>6} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark per-paper throughput of the store + extract stages.
+
+Compares the sequential loop (one process, one LLM request at a time, no overlap) with the
+pipelined configuration: chunking/embedding in a process pool and LLM batches in flight
+while the writer persists the previous batch. The LLM is simulated with a fixed latency so
+the numbers isolate pipeline structure from model speed; papers are synthetic unless PDFs
+or text files are given.
+
+Usage:
+    python3 scripts/benchmark_pipeline.py --papers 64 --processes 4 --llm-latency-ms 200
+    python3 scripts/benchmark_pipeline.py paper1.pdf paper2.pdf --llm-parallel 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app.services.pipeline as pipeline  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models import IngestionRun  # noqa: E402
+from app.schemas.domain import WorkflowRunRequest  # noqa: E402
+from app.services.inference import InferenceResult, InferenceStats  # noqa: E402
+from app.services.sources import SourceDocument, _extract_pdf_text  # noqa: E402
+
+MAX_CHARS = 250_000
+
+
+class SimulatedClient:
+    def __init__(self, latency_s: float) -> None:
+        self.latency_s = latency_s
+
+    def warm_up(self, model, keep_alive=None, num_ctx=None):
+        return None
+
+    def unload(self, model):
+        pass
+
+    def generate(self, payload):
+        time.sleep(self.latency_s)
+        return InferenceResult(text="{}", provider="simulated", model=payload.model, total_latency_s=self.latency_s)
+
+    def close(self):
+        pass
+
+
+def _load_docs(paths: list[str], papers: int) -> list[SourceDocument]:
+    now = datetime.now(timezone.utc)
+    texts: list[tuple[str, str]] = []
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.suffix.lower() == ".pdf":
+            text = _extract_pdf_text(path.read_bytes()).text
+        else:
+            text = path.read_text(encoding="utf-8", errors="ignore")
+        texts.append((path.stem, text[:MAX_CHARS]))
+    if not texts:
+        body = " ".join(f"Sentence {i} about agents, tools and inference-time compute." for i in range(4000))
+        texts = [("synthetic", f"Introduction\n\n{body}\n\nResults\n\n{body}")]
+    docs = []
+    for i in range(papers):
+        name, text = texts[i % len(texts)]
+        docs.append(
+            SourceDocument(
+                source="arxiv",
+                source_id=f"bench-{i}",
+                title=f"{name} #{i}",
+                authors="A",
+                abstract=f"Benchmark paper {i} on agents and tool use.",
+                full_text=f"{text}\n\nVariant {i}.",
+                published_at=now,
+                updated_at=now,
+                source_url="http://example.com",
+                arxiv_id=f"2401.{i:05d}v1",
+            )
+        )
+    return docs
+
+
+def _run(docs: list[SourceDocument], processes: int, llm_parallel: int, overlap: bool, latency_s: float) -> float:
+    settings.worker_processes = processes
+    settings.llm_parallel_requests = llm_parallel
+    settings.pipeline_overlap_llm = overlap
+
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    service = pipeline.DefaultWorkflowService()
+    service.inference_client = SimulatedClient(latency_s)
+    service._connectors = lambda sources: {"arxiv": type("Fixed", (), {"fetch": lambda self, max_items: docs})()}
+    payload = WorkflowRunRequest(sources=["arxiv"], max_papers=len(docs))
+    try:
+        with Session(engine) as db:
+            run = IngestionRun(source_scope="arxiv", status="running", week_key="bench", request_json=payload.model_dump_json())
+            db.add(run)
+            db.commit()
+            ctx = pipeline._RunContext(payload=payload, checkpoint={}, llm_stats=InferenceStats(), run_id=run.id)
+            service._stage_fetch(db, run, ctx)
+            db.commit()
+            started = time.perf_counter()
+            service._stage_store(db, run, ctx)
+            service._stage_extract(db, run, ctx)
+            return time.perf_counter() - started
+    finally:
+        service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Papers/minute: sequential loop vs per-paper pipeline")
+    parser.add_argument("paths", nargs="*", help="PDF or text files to use as paper bodies")
+    parser.add_argument("--papers", type=int, default=48)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--llm-parallel", type=int, default=4)
+    parser.add_argument("--llm-latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    docs = _load_docs(args.paths, args.papers)
+    latency_s = args.llm_latency_ms / 1000
+    settings.topic_bias_enabled = False
+    settings.llm_warmup_enabled = False
+    pipeline._write_verification_artifacts = lambda week_key, payload: None
+
+    configs = [
+        ("sequential", 1, 1, False),
+        ("pipelined", args.processes, args.llm_parallel, True),
+    ]
+    print(f"papers={len(docs)} llm_latency_ms={args.llm_latency_ms:.0f} cpus={os.cpu_count()}")
+    print(f"{'mode':<12} {'procs':>6} {'llm_par':>8} {'seconds':>9} {'papers/min':>11}")
+    baseline = None
+    for name, processes, llm_parallel, overlap in configs:
+        elapsed = _run(docs, processes, llm_parallel, overlap, latency_s)
+        rate = len(docs) / elapsed * 60
+        baseline = baseline or rate
+        print(f"{name:<12} {processes:>6} {llm_parallel:>8} {elapsed:>9.2f} {rate:>11.1f}  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Rewrite stored embeddings after a change to the embedding function.
+
+Recomputes paper, chunk, research-memory and hypothesis vectors with the current
+``embed_text`` and rebuilds cluster topic centroids from their member papers. Run once
+after upgrading past the feature-hashing embedding (migration 0008); until then, rows
+embedded before and after the upgrade are not comparable. Commits per batch, so it can be
+re-run if interrupted.
+
+Usage:
+    python3 scripts/reembed_vectors.py
+    python3 scripts/reembed_vectors.py --batch-size 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.pipeline import reembed_stored_vectors  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        updated = reembed_stored_vectors(db, batch_size=max(1, args.batch_size))
+    for table, count in updated.items():
+        print(f"{table:<26} {count:>8}")
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.base import Base
+from app.db.models import ResearchBrief, ResearchBriefVersion
+from app.services.brief_versions import add_version, apply_delta, encode_delta, version_markdown
+from app.services.pipeline import DefaultBriefService
+
+
+def test_delta_round_trips_edge_cases() -> None:
+    cases = [("", "a\nb"), ("a\nb\n", ""), ("a\nb", "a\nb\n"), ("x\ny\nz\n", "x\nY\nz\nw"), ("same\n", "same\n")]
+    for base, target in cases:
+        assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_versions_are_deltas_between_snapshots(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "brief_snapshot_interval", 10)
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    body = [f"- bullet {i}: {'signal ' * 12}" for i in range(200)]
+    texts = []
+    with Session(engine) as db:
+        brief = ResearchBrief(week_key="2026-W42", title="t")
+        db.add(brief)
+        db.flush()
+        # A legacy uncompressed row still anchors the chain.
+        legacy = "# Brief\n" + "\n".join(body)
+        db.add(ResearchBriefVersion(brief_id=brief.id, version_number=1, editor="system", markdown_content=legacy))
+        texts.append(legacy)
+        for n in range(2, 26):
+            body[n] = f"- bullet {n}: edited in version {n}"
+            texts.append("# Brief\n" + "\n".join(body))
+            add_version(db, brief, "user", texts[-1])
+        db.commit()
+
+        rows = db.scalars(select(ResearchBriefVersion).order_by(ResearchBriefVersion.version_number)).all()
+        assert [row.storage for row in rows[:12]] == ["full"] + ["delta"] * 9 + ["full", "delta"]
+        assert [version_markdown(db, row) for row in rows] == texts
+        stored = sum(len(row.payload) for row in rows[1:])
+        assert stored * 20 < sum(len(text) for text in texts[1:])
+
+        out = DefaultBriefService().diff(db, "2026-W42")
+        assert (out.from_version, out.to_version, out.added_lines, out.removed_lines) == (24, 25, 1, 1)
+        assert "+- bullet 25: edited in version 25" in out.diff
+        with pytest.raises(ValueError):
+            DefaultBriefService().diff(db, "2026-W42", from_version=1, to_version=99)
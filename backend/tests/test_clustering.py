@@ -0,0 +1,114 @@
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import ClusterPaperLink, ClusterTopic, Hypothesis, Paper, PaperAlphaCard
+from app.services.clustering import refresh_clusters
+from app.services.document_prep import embed_text
+from app.services.pipeline import _cluster_cards, reembed_stored_vectors
+
+
+def _blob(rng: np.random.Generator, center: np.ndarray, n: int) -> np.ndarray:
+    return center + 0.05 * rng.standard_normal((n, center.shape[0]))
+
+
+def test_refresh_keeps_existing_ids_and_only_clusters_the_rest() -> None:
+    rng = np.random.default_rng(1)
+    a, b, c = np.eye(16)[:3]
+    first = refresh_clusters(None, None, np.vstack([_blob(rng, a, 10), _blob(rng, b, 10)]), match_threshold=0.8, target_size=10)
+    assert len(first.centroids) == 2 and sorted(first.counts.tolist()) == [10.0, 10.0]
+    label_a = first.labels[0]
+
+    second = refresh_clusters(
+        first.centroids, first.counts, np.vstack([_blob(rng, a, 4), _blob(rng, c, 6)]), match_threshold=0.8, target_size=10
+    )
+    assert set(second.labels[:4].tolist()) == {label_a}
+    assert set(second.labels[4:].tolist()) == {2}
+    assert second.counts[label_a] == 14 and second.counts[2] == 6
+
+
+def test_cluster_topics_are_stable_across_weeks() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    themes = {
+        "agents": "Tool-using language agents with planning and web browsing tools",
+        "rlhf": "Reward models and preference optimization for RLHF alignment",
+    }
+
+    def add_papers(db: Session, week: str, theme: str, n: int) -> list[PaperAlphaCard]:
+        cards = []
+        for i in range(n):
+            text = f"{themes[theme]} variant {week} {i}"
+            paper = Paper(
+                source="arxiv",
+                source_id=f"{week}-{theme}-{i}",
+                title=text,
+                authors="A",
+                published_at=now,
+                abstract=text,
+                full_text=text,
+                source_url="http://example.com",
+                embedding_vector=embed_text(f"{text}\n{text}"),
+            )
+            db.add(paper)
+            db.flush()
+            card = PaperAlphaCard(paper_id=paper.id, bottleneck_attacked="reasoning", mechanism_type="agentic")
+            db.add(card)
+            cards.append(card)
+        db.flush()
+        return cards
+
+    with Session(engine) as db:
+        week1 = _cluster_cards(db, add_papers(db, "w1", "agents", 6) + add_papers(db, "w1", "rlhf", 6), "2026-W41")
+        assert len(week1) == 2
+        topic_by_first_paper = {ids[0]: cluster.topic_id for cluster, ids in week1}
+
+        week2 = _cluster_cards(db, add_papers(db, "w2", "agents", 3), "2026-W42")
+        assert len(week2) == 1
+        agents_topic = next(t for pid, t in topic_by_first_paper.items() if "agents" in db.get(Paper, pid).source_id)
+        assert week2[0][0].topic_id == agents_topic
+        assert len(db.scalars(select(ClusterTopic)).all()) == 2
+
+
+def test_reembed_rewrites_old_vectors_and_rebuilds_centroids() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    stale = np.eye(1024)[7].tolist()  # stands in for a vector from the old embedding
+    text = "Mixture of experts routing for sparse language model scaling"
+    with Session(engine) as db:
+        cards = []
+        for i in range(3):
+            paper = Paper(
+                source="arxiv",
+                source_id=f"moe-{i}",
+                title=f"{text} {i}",
+                authors="A",
+                published_at=datetime.now(timezone.utc),
+                abstract=text,
+                full_text=text,
+                source_url="http://example.com",
+                embedding_vector=stale,
+            )
+            db.add(paper)
+            db.flush()
+            cards.append(PaperAlphaCard(paper_id=paper.id))
+        db.add_all(cards)
+        db.add(Hypothesis(text=text, type="moe", week_introduced="2026-W41", embedding_vector=stale))
+        db.flush()
+        for cluster, paper_ids in _cluster_cards(db, cards, "2026-W41"):
+            db.add(cluster)
+            db.flush()
+            db.add_all(ClusterPaperLink(cluster_id=cluster.id, paper_id=pid) for pid in paper_ids)
+        db.commit()
+
+        updated = reembed_stored_vectors(db, batch_size=2)
+
+        assert updated["papers"] == 3 and updated["hypotheses"] == 1 and updated["cluster_topics"] == 1
+        paper = db.scalars(select(Paper).order_by(Paper.id)).first()
+        assert np.allclose(paper.embedding_vector, embed_text(f"{paper.title}\n{paper.abstract}"))
+        centroid = np.asarray(db.scalars(select(ClusterTopic)).one().centroid)
+        assert np.isclose(np.linalg.norm(centroid), 1.0) and centroid @ np.asarray(paper.embedding_vector) > 0.8
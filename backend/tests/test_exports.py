@@ -0,0 +1,51 @@
+import io
+import zipfile
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import ExportArtifact, ResearchBrief
+from app.services.brief_versions import add_version
+from app.services.export_streams import iter_zip
+from app.services.pipeline import DefaultExportService
+
+
+def test_exports_are_generated_once_per_version_and_platform() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    service = DefaultExportService()
+    with Session(engine) as db:
+        brief = ResearchBrief(week_key="2026-W42", title="t")
+        db.add(brief)
+        db.flush()
+        version = add_version(db, brief, "system", "# Brief\n- finding one\n- see /Users/me/notes\n")
+        db.commit()
+
+        first = service.artifacts(db, version.id, ["markdown", "twitter", "linkedin_vc"])
+        assert db.scalar(select(func.count(ExportArtifact.id))) == 3
+        assert "~/me/notes" in first[0].content
+
+        def fail(platform, markdown):
+            raise AssertionError("cached exports must not be regenerated")
+
+        service._render_platform = fail
+        again = service.artifacts(db, version.id, ["twitter", "markdown"])
+        assert [item.content for item in again] == [first[1].content, first[0].content]
+
+        # A template change bumps the renderer version and makes the cached exports stale.
+        service = DefaultExportService()
+        service.RENDERER_VERSION = DefaultExportService.RENDERER_VERSION + 1
+        service._render_platform = lambda platform, markdown: f"new {platform}"
+        assert [item.content for item in service.artifacts(db, version.id, ["twitter"])] == ["new twitter"]
+
+
+def test_zip_stream_is_a_valid_archive() -> None:
+    big = "".join(f"- line {i} of a long brief\n" for i in range(20000))
+    chunks = list(iter_zip([("brief.md", big), ("twitter.txt", "1/1 hello")], chunk_size=4096))
+
+    assert len(chunks) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["brief.md", "twitter.txt"]
+        assert archive.read("brief.md").decode("utf-8") == big
+        assert archive.testzip() is None
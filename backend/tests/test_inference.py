@@ -0,0 +1,60 @@
+import json
+
+import httpx
+
+from app.services.inference import FailoverInferenceClient, InferenceRequest, OllamaClient, collect_stream
+
+
+def test_collect_stream_stops_after_complete_json_object() -> None:
+    deltas = iter(['Sure: {"hypothesis": "a {b}", ', '"results": "x"}', " trailing", " chatter"])
+    payload = InferenceRequest(prompt="p", model="m", stop_on_json=True)
+    result = collect_stream(deltas, payload, provider="test", model="m")
+    assert result.text == 'Sure: {"hypothesis": "a {b}", "results": "x"}'
+    assert result.finish_reason == "json_complete"
+    assert result.first_token_latency_s is not None
+
+
+def test_collect_stream_applies_stop_sequence_and_max_tokens() -> None:
+    payload = InferenceRequest(prompt="p", model="m", stop=["END"])
+    result = collect_stream(iter(["one ", "two E", "ND three"]), payload, provider="test", model="m")
+    assert result.text == "one two "
+    assert result.finish_reason == "stop_sequence"
+
+    capped = InferenceRequest(prompt="p", model="m", max_tokens=2)
+    result = collect_stream(iter(["a", "b", "c"]), capped, provider="test", model="m")
+    assert result.text == "ab"
+    assert result.finish_reason == "length"
+
+
+def test_failover_stream_switches_before_first_token() -> None:
+    class Broken:
+        def stream(self, payload):
+            raise ConnectionError("down")
+            yield ""  # pragma: no cover
+
+    class Working:
+        def stream(self, payload):
+            yield from ["ok"]
+
+    client = FailoverInferenceClient(primary_client=Broken(), fallback_client=Working())
+    assert list(client.stream(InferenceRequest(prompt="p", model="m"))) == ["ok"]
+
+
+def test_ollama_client_streams_over_shared_http_client() -> None:
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        lines = [{"response": "Hel", "done": False}, {"response": "lo", "done": False}, {"response": "", "done": True}]
+        return httpx.Response(200, content="\n".join(json.dumps(line) for line in lines).encode())
+
+    client = OllamaClient(http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    for _ in range(2):
+        result = client.generate(InferenceRequest(prompt="p", model="m", max_tokens=16))
+        assert result.text == "Hello"
+    client.close()
+
+    assert len(calls) == 2
+    assert calls[0]["stream"] is True
+    assert calls[0]["options"]["num_predict"] == 16
+    assert client.http_client.is_closed
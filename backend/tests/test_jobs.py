@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.schemas.domain import WorkflowRunRequest, WorkflowRunResponse
+from app.services.jobs import JobConflictError, JobWorker, WorkflowJobQueue
+
+
+class FakeWorkflow:
+    def run_weekly(self, db, payload, progress=None):
+        progress(7, "fetched", 0, 0)
+        progress(7, "stored", 1, 2)
+        return WorkflowRunResponse(
+            status="completed",
+            run_id=7,
+            ingested_papers=2,
+            extracted_alpha_cards=2,
+            synthesized_hypotheses=0,
+            generated_clusters=0,
+            brief_version=1,
+            notes="",
+        )
+
+
+def _queue(workflow) -> tuple[WorkflowJobQueue, sessionmaker]:
+    engine = create_engine("sqlite+pysqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    return WorkflowJobQueue(session_factory=factory, workflow=workflow), factory
+
+
+def test_job_runs_with_progress_and_blocks_overlapping_submits() -> None:
+    queue, factory = _queue(FakeWorkflow())
+    with factory() as db:
+        job = queue.submit(db, "weekly_run", WorkflowRunRequest(max_papers=5))
+        with pytest.raises(JobConflictError):
+            queue.submit(db, "weekly_run", WorkflowRunRequest())
+        job_id = job.id
+
+    assert JobWorker(queue).run_once()
+
+    with factory() as db:
+        job = queue.get(db, job_id)
+        assert (job.status, job.run_id, job.stage, job.progress_done, job.progress_total) == ("succeeded", 7, "stored", 1, 2)
+        assert job.active_slot is None
+        # The slot is free again once the job finished.
+        assert queue.submit(db, "weekly_run", WorkflowRunRequest()).status == "queued"
+
+
+def test_cancel_stops_running_job_at_next_progress_report() -> None:
+    queue, factory = _queue(None)
+
+    class CancellingWorkflow(FakeWorkflow):
+        def run_weekly(self, db, payload, progress=None):
+            progress(3, "fetched", 0, 0)
+            with factory() as other:
+                queue.cancel(other, job_id)
+            progress(3, "stored", 0, 10)
+            raise AssertionError("run should have been cancelled")
+
+    queue.workflow = CancellingWorkflow()
+    with factory() as db:
+        job_id = queue.submit(db, "weekly_run").id
+
+    JobWorker(queue).run_once()
+    with factory() as db:
+        job = queue.get(db, job_id)
+        assert job.status == "cancelled"
+        assert job.active_slot is None
@@ -0,0 +1,59 @@
+import fitz
+
+from app.services.pdf_worker import ParserRecord, ParserStats, parse_pdf_isolated
+
+
+def _pdf() -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Isolated parse body text.", fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_isolated_parse_falls_through_failed_parser_and_records_stats(tmp_path) -> None:
+    stats = ParserStats(tmp_path / "parser_stats.json")
+    parsed = parse_pdf_isolated(_pdf(), ["unknown", "pymupdf"], timeout_s=60, memory_mb=2048, stats=stats)
+    assert parsed.parser == "pymupdf"
+    assert "Isolated parse body text." in parsed.text
+    assert parsed.parse_seconds > 0
+
+    reloaded = ParserStats(tmp_path / "parser_stats.json")
+    assert reloaded.records["pymupdf"].wins == 1
+    assert reloaded.records["unknown"].failures == 1
+
+
+def test_isolated_parse_enforces_hard_timeout(tmp_path) -> None:
+    stats = ParserStats(tmp_path / "parser_stats.json")
+    parsed = parse_pdf_isolated(_pdf(), ["pymupdf"], timeout_s=0.0, stats=stats)
+    assert parsed.text == ""
+    assert stats.records["pymupdf"].timeouts == 1
+
+
+def test_concurrent_savers_merge_instead_of_overwriting(tmp_path) -> None:
+    path = tmp_path / "parser_stats.json"
+    api, worker = ParserStats(path), ParserStats(path)
+    api.record("pymupdf", "win", 1.0)
+    worker.record("pymupdf", "win", 2.0)
+    worker.record("pdfminer", "loss", 3.0)
+    api.save()
+    worker.save()
+    api.save()  # nothing new: must not write its stale view back
+
+    on_disk = ParserStats(path).records
+    assert on_disk["pymupdf"].wins == 2 and on_disk["pymupdf"].attempts == 2
+    assert on_disk["pdfminer"].losses == 1 and on_disk["pdfminer"].failures == 0
+    assert worker.records["pymupdf"].wins == 2  # a save also picks up the other process's outcomes
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_parser_order_adapts_only_with_enough_samples() -> None:
+    stats = ParserStats(min_attempts=5)
+    stats.records = {"pymupdf": ParserRecord(attempts=3, wins=0, failures=3)}
+    assert stats.order(["pymupdf", "pdfminer"]) == ["pymupdf", "pdfminer"]
+
+    stats.records = {
+        "pymupdf": ParserRecord(attempts=10, wins=2, failures=8, total_s=5.0),
+        "pdfminer": ParserRecord(attempts=10, wins=9, failures=1, total_s=40.0),
+    }
+    assert stats.order(["pymupdf", "pdfminer"]) == ["pdfminer", "pymupdf"]
@@ -1,11 +1,38 @@
-from datetime import datetime, timezone
+import json
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import create_engine
+import numpy as np
+from sqlalchemy import create_engine, desc, func, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.db.base import Base
-from app.db.models import Paper
-from app.services.pipeline import _heuristic_alpha
+from app.db.models import (
+    Hypothesis,
+    HypothesisPaperLink,
+    IngestionRun,
+    IngestionRunDocument,
+    Paper,
+    PaperAlphaCard,
+    PaperChunk,
+    ResearchBriefVersion,
+)
+from app.schemas.domain import WorkflowRunRequest
+from app.services.brief_versions import version_markdown
+from app.services.document_prep import embed_text
+from app.services.inference import InferenceRequest, InferenceResult, InferenceStats
+from app.services.pipeline import (
+    DefaultWorkflowService,
+    _RunContext,
+    _document_to_json,
+    _heuristic_alpha,
+    _hypothesis_strength,
+    _score_novelty,
+    _track_hypotheses,
+)
+from app.services.sources import SourceDocument
+from app.services.vector_index import IncrementalVectorIndex, PgVectorIndex
 
 
 def test_heuristic_alpha_has_required_fields() -> None:
@@ -33,3 +60,532 @@ def test_heuristic_alpha_has_required_fields() -> None:
     assert data["bottleneck_attacked"]
     assert data["mechanism_type"]
     assert data["novelty_bucket"] in {"low", "medium", "high"}
+
+
+def test_generate_grouped_loads_each_model_once() -> None:
+    events: list[str] = []
+
+    class FakeClient:
+        def warm_up(self, model, keep_alive=None, num_ctx=None):
+            events.append(f"warm:{model}")
+            return 1.5
+
+        def unload(self, model):
+            events.append(f"unload:{model}")
+
+        def generate(self, payload):
+            events.append(f"gen:{payload.model}")
+            return InferenceResult(text=payload.prompt, provider="fake", model=payload.model, total_latency_s=0.5)
+
+    service = DefaultWorkflowService()
+    service.inference_client = FakeClient()
+    stats = InferenceStats()
+    requests = [
+        InferenceRequest(prompt="a1", model="extract"),
+        InferenceRequest(prompt="b1", model="synth"),
+        InferenceRequest(prompt="a2", model="extract"),
+    ]
+
+    outputs = service._generate_grouped(requests, stats)
+
+    assert outputs == ["a1", "b1", "a2"]
+    assert events == ["warm:extract", "gen:extract", "gen:extract", "unload:extract", "warm:synth", "gen:synth"]
+    assert stats.by_model["extract"].load_s == 1.5
+    assert stats.by_model["extract"].calls == 2
+
+
+def test_packed_hmr_falls_back_to_single_calls_for_invalid_items() -> None:
+    def blog(paper_id: int) -> Paper:
+        return Paper(id=paper_id, source="frontier_blogs", title=f"Post {paper_id}", abstract="Short update.")
+
+    class FakeClient:
+        def warm_up(self, model, keep_alive=None, num_ctx=None):
+            return None
+
+        def unload(self, model):
+            pass
+
+        def generate(self, payload):
+            if payload.json_root == "array":
+                text = '[{"id": 1, "hypothesis": "h1", "methods": "m1", "results": "r1"}, {"id": 2}]'
+            elif "[id=" not in payload.prompt and "STRICT JSON" in payload.prompt:
+                text = '{"hypothesis": "single", "methods": "m", "results": "r"}'
+            else:
+                text = "summary"
+            return InferenceResult(text=text, provider="fake", model=payload.model)
+
+    service = DefaultWorkflowService()
+    service.inference_client = FakeClient()
+    papers = [blog(1), blog(2)]
+
+    assert service._hmr_batches(papers) == [papers]
+    alpha, hmr = service._run_extraction_llm(papers, InferenceStats())
+
+    assert alpha == ["summary", "summary"]
+    assert hmr[1]["hypothesis"] == "h1"
+    assert hmr[2]["hypothesis"] == "single"
+
+
+def test_revision_reuses_unchanged_chunk_embeddings() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    intro = "Introduction\n\n" + " ".join(f"Intro sentence {i} about agents." for i in range(200))
+    results = "Results\n\n" + " ".join(f"Result sentence {i} on benchmarks." for i in range(200))
+
+    def doc(version: int, results_text: str) -> SourceDocument:
+        return SourceDocument(
+            source="arxiv",
+            source_id=f"http://arxiv.org/abs/2401.00001v{version}",
+            title="Agents at scale",
+            authors="A",
+            abstract="We study agents.",
+            full_text=f"{intro}\n\n{results_text}",
+            published_at=now,
+            updated_at=now,
+            source_url="http://example.com",
+            arxiv_id=f"2401.00001v{version}",
+        )
+
+    service = DefaultWorkflowService()
+    with Session(engine) as db:
+        paper = service._store_paper(db, doc(1, results))
+        db.flush()
+        before = {c.content_hash: c.embedding_vector for c in db.scalars(select(PaperChunk)).all()}
+
+        revised = doc(2, results.replace("Result sentence 150", "Corrected result 150"))
+        prior = service._find_prior_version(db, revised)
+        assert prior is not None and prior.id == paper.id
+        revision = service._apply_revision(db, prior, revised, "2026-W42")
+
+        assert paper.arxiv_id == "2401.00001v2"
+        assert revision.chunks_unchanged > 0
+        assert revision.chunks_added == revision.chunks_total - revision.chunks_unchanged >= 1
+        assert revision.changed_sections == "results"
+        assert revision.alpha_reextracted and not revision.abstract_changed
+        for chunk in db.scalars(select(PaperChunk).where(PaperChunk.paper_id == paper.id)).all():
+            if chunk.content_hash in before:
+                assert list(chunk.embedding_vector) == list(before[chunk.content_hash])
+
+        # An older version resurfacing is not treated as a revision.
+        assert service._find_prior_version(db, doc(1, results)) is None
+
+        # Deleting a whole section is a change to it, even though no new chunk names it.
+        without_results = service._apply_revision(db, paper, doc(3, ""), "2026-W43")
+        assert without_results.changed_sections == "results"
+        assert without_results.alpha_reextracted and without_results.chunks_removed > 0
+
+        # Card versions keep counting up from the paper's highest, not from how many are current.
+        first = service._extract_alpha(db, paper)
+        second = service._extract_alpha(db, paper)
+        assert (first.version_number, second.version_number) == (1, 2) and not first.is_current
+        assert service._extract_alpha(db, paper).version_number == 3
+
+
+def test_store_stage_looks_up_each_prior_version_once() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+
+    def doc(arxiv_id: str) -> SourceDocument:
+        return SourceDocument(
+            source="arxiv",
+            source_id=f"http://arxiv.org/abs/{arxiv_id}",
+            title=f"Paper {arxiv_id}",
+            authors="A",
+            abstract="We study agents.",
+            full_text="Introduction\n\nAgents use tools.",
+            published_at=now,
+            updated_at=now,
+            source_url="http://example.com",
+            arxiv_id=arxiv_id,
+        )
+
+    batch = [doc("2401.00001v2"), doc("2401.00002v1"), doc("2401.00002v2")]
+    service = DefaultWorkflowService()
+    lookups: list[str] = []
+    find_prior_version = service._find_prior_version
+
+    def counting(db, document):
+        lookups.append(document.arxiv_id)
+        return find_prior_version(db, document)
+
+    service._find_prior_version = counting
+    payload = WorkflowRunRequest(sources=["arxiv"], include_revised_papers=True)
+    with Session(engine) as db:
+        service._store_paper(db, doc("2401.00001v1"))
+        run = IngestionRun(source_scope="arxiv", status="running", week_key="2026-W42", request_json=payload.model_dump_json())
+        db.add(run)
+        db.flush()
+        for position, item in enumerate(batch):
+            db.add(
+                IngestionRunDocument(
+                    run_id=run.id, position=position, source="arxiv", source_id=item.source_id, payload_json=_document_to_json(item)
+                )
+            )
+        db.commit()
+        ctx = _RunContext(payload=payload, checkpoint={}, llm_stats=InferenceStats(), run_id=run.id)
+        service._stage_store(db, run, ctx)
+
+        outcomes = [row.outcome for row in service._run_documents(db, run)]
+        # The revision of a stored paper reuses its first lookup; only misses are re-checked,
+        # which is how v2 finds the v1 stored earlier in the same batch.
+        assert outcomes == ["revision", "new", "revision"]
+        assert lookups == ["2401.00001v2", "2401.00002v1", "2401.00002v2", "2401.00002v1", "2401.00002v2"]
+
+
+def test_failed_run_resumes_from_last_checkpoint(monkeypatch) -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    fetches: list[int] = []
+
+    class FakeConnector:
+        def fetch(self, max_items=100):
+            fetches.append(max_items)
+            return [
+                SourceDocument(
+                    source="arxiv",
+                    source_id=f"http://arxiv.org/abs/2401.0000{i}v1",
+                    title=f"Agent tool use paper {i}",
+                    authors="A",
+                    abstract="Agents use tools with test-time compute.",
+                    full_text="Introduction\n\nAgents use tools.",
+                    published_at=now,
+                    updated_at=now,
+                    source_url="http://example.com",
+                    arxiv_id=f"2401.0000{i}v1",
+                )
+                for i in range(3)
+            ]
+
+    class FakeClient:
+        def warm_up(self, model, keep_alive=None, num_ctx=None):
+            return None
+
+        def unload(self, model):
+            pass
+
+        def generate(self, payload):
+            return InferenceResult(text="{}", provider="fake", model=payload.model)
+
+    monkeypatch.setattr("app.services.pipeline._write_verification_artifacts", lambda week_key, payload: None)
+    monkeypatch.setattr("app.services.pipeline.settings.topic_bias_enabled", False)
+    monkeypatch.setattr("app.services.pipeline.settings.llm_warmup_enabled", False)
+    service = DefaultWorkflowService()
+    service.inference_client = FakeClient()
+    service._connectors = lambda sources: {"arxiv": FakeConnector()}
+    extract_alpha = service._extract_alpha
+    crash = {"armed": True}
+
+    def flaky_extract_alpha(db, paper, model_text=None):
+        if crash["armed"]:
+            raise RuntimeError("worker crashed")
+        return extract_alpha(db, paper, model_text)
+
+    service._extract_alpha = flaky_extract_alpha
+
+    with Session(engine) as db:
+        try:
+            service.run_weekly(db, WorkflowRunRequest(sources=["arxiv"]))
+        except RuntimeError:
+            pass
+        run = db.scalar(select(IngestionRun))
+        assert (run.status, run.stage) == ("failed", "stored")
+        assert db.scalar(select(func.count(Paper.id))) == 3
+
+        crash["armed"] = False
+        result = service.resume_run(db, run.id)
+
+        assert result.status == "completed"
+        assert (result.ingested_papers, result.extracted_alpha_cards) == (3, 3)
+        assert len(fetches) == 1
+        assert db.scalar(select(func.count(Paper.id))) == 3
+        assert db.scalar(select(func.count(PaperAlphaCard.id))) == 3
+        assert (run.status, run.stage) == ("completed", "rendered")
+
+
+def test_process_pool_preparation_matches_inline(monkeypatch) -> None:
+    now = datetime.now(timezone.utc)
+    docs = [
+        SourceDocument(
+            source="arxiv",
+            source_id=f"p{i}",
+            title=f"Paper {i}",
+            authors="A",
+            abstract="We study agents.",
+            full_text="Method\n\n" + " ".join(f"Sentence {j} of paper {i}." for j in range(400)),
+            published_at=now,
+            updated_at=now,
+            source_url="http://example.com",
+        )
+        for i in range(8)
+    ]
+    embed = [i != 1 for i in range(len(docs))]
+    service = DefaultWorkflowService()
+    inline = list(service._prepare_documents(docs, embed))
+
+    monkeypatch.setattr(settings, "worker_processes", 2)
+    monkeypatch.setattr("app.services.pipeline.os.cpu_count", lambda: 1)
+    list(service._prepare_documents(docs, embed))
+    assert service._cpu_pool is None  # one CPU: a pool only adds overhead
+
+    monkeypatch.setattr("app.services.pipeline.os.cpu_count", lambda: 4)
+    list(service._prepare_documents(docs[:3], embed[:3]))
+    assert service._cpu_pool is None  # too few documents to amortise the workers
+    try:
+        pooled = list(service._prepare_documents(docs, embed))
+        assert service._cpu_pool is not None
+    finally:
+        service.close()
+
+    assert [p.body for p in pooled] == [p.body for p in inline]
+    assert [len(p.chunks) for p in pooled] == [len(p.chunks) for p in inline]
+    assert pooled[0].chunk_vectors == inline[0].chunk_vectors
+    assert pooled[1].chunk_vectors is None
+
+
+def test_hypotheses_accumulate_evidence_across_weeks() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+
+    def card(db: Session, source_id: str) -> PaperAlphaCard:
+        paper = Paper(
+            source="arxiv",
+            source_id=source_id,
+            title=source_id,
+            authors="A",
+            published_at=now,
+            abstract="",
+            full_text="",
+            source_url="http://example.com",
+        )
+        db.add(paper)
+        db.flush()
+        alpha = PaperAlphaCard(paper_id=paper.id, mechanism_type="agentic", provenance_snippets="p")
+        db.add(alpha)
+        db.flush()
+        return alpha
+
+    claim = "Test-time search over tool calls improves agent success on long-horizon web tasks"
+    with Session(engine) as db:
+        first = card(db, "a")
+        week1 = _track_hypotheses(db, [first], "2026-W40", {first.paper_id: claim})
+        strength1 = db.get(Hypothesis, week1[0]).strength_score
+
+        second, other = card(db, "b"), card(db, "c")
+        week2 = _track_hypotheses(
+            db,
+            [second, other],
+            "2026-W41",
+            {second.paper_id: claim + " and browsing", other.paper_id: "Preference data quality dominates RLHF reward model accuracy"},
+        )
+
+        assert week2[0] == week1[0] and len(week2) == 2
+        tracked = db.get(Hypothesis, week1[0])
+        assert tracked.evidence_count == 2 and tracked.last_evidence_week == "2026-W41"
+        assert tracked.strength_score > strength1
+        assert db.scalar(select(func.count(Hypothesis.id))) == 2
+        links = db.scalars(select(HypothesisPaperLink).where(HypothesisPaperLink.hypothesis_id == tracked.id)).all()
+        assert [link.week_key for link in links] == ["2026-W40", "2026-W41"]
+        # No new evidence: strength decays as weeks pass.
+        assert _hypothesis_strength(tracked, "2026-W49") < tracked.strength_score
+
+
+def test_contradiction_links_are_bounded_and_weighted(monkeypatch) -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    prompts: list[str] = []
+
+    class NliClient:
+        def warm_up(self, model, keep_alive=None, num_ctx=None):
+            return None
+
+        def unload(self, model):
+            pass
+
+        def generate(self, payload):
+            prompts.append(payload.prompt)
+            ids = [int(part.split("]")[0]) for part in payload.prompt.split("[id=")[1:]]
+            text = "[" + ", ".join(f'{{"id": {i}, "label": "contradict", "confidence": 0.9}}' for i in ids) + "]"
+            return InferenceResult(text=text, provider="fake", model=payload.model, total_latency_s=0.1)
+
+    def card(db: Session, title: str) -> PaperAlphaCard:
+        paper = Paper(
+            source="arxiv",
+            source_id=title,
+            title=title,
+            authors="A",
+            published_at=now,
+            abstract="",
+            full_text="",
+            source_url="http://example.com",
+        )
+        db.add(paper)
+        db.flush()
+        alpha = PaperAlphaCard(paper_id=paper.id, mechanism_type="agentic", provenance_snippets="p")
+        db.add(alpha)
+        db.flush()
+        return alpha
+
+    monkeypatch.setattr(settings, "contradiction_max_checks", 1)
+    service = DefaultWorkflowService()
+    service.inference_client = NliClient()
+    with Session(engine) as db:
+        source = card(db, "Test-time search over tool calls improves web agents")
+        _track_hypotheses(db, [source], "2026-W40", {source.paper_id: source.paper.title})
+        rebuttal = card(db, "Test-time search over tool calls does not help web agents")
+        unrelated = card(db, "Protein folding with diffusion priors")
+
+        first_run = IngestionRun(source_scope="arxiv", status="running", week_key="2026-W41")
+        second_run = IngestionRun(source_scope="arxiv", status="running", week_key="2026-W41")
+        db.add_all([first_run, second_run])
+        db.flush()
+        budget = service._contradiction_budget(db, first_run)
+        written, checked = service._detect_contradictions(
+            db, [source, rebuttal, unrelated], "2026-W41", {rebuttal.paper_id: "No gain from search."}, InferenceStats(), budget
+        )
+
+        assert (budget, written, checked) == (1, 1, 1) and len(prompts) == 1
+        assert "No gain from search." in prompts[0]
+        link = db.scalars(select(HypothesisPaperLink).where(HypothesisPaperLink.relation == "contradict")).one()
+        assert link.paper_id == rebuttal.paper_id and link.week_key == "2026-W41"
+        assert 0 < link.confidence < 0.9
+
+        # A second run in the same week (the cron fires daily) shares the week's budget.
+        first_run.checkpoint_json = json.dumps({"contradiction_checks": checked})
+        db.flush()
+        assert service._contradiction_budget(db, second_run) == 0
+        assert service._detect_contradictions(db, [rebuttal], "2026-W41", {}, InferenceStats(), 0) == (0, 0)
+        assert len(prompts) == 1
+
+
+def test_novelty_scores_against_history_with_time_decay() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    index = IncrementalVectorIndex(Paper.id, Paper.embedding_vector)
+
+    def paper(db: Session, source_id: str, title: str, weeks_ago: float) -> Paper:
+        row = Paper(
+            source="arxiv",
+            source_id=source_id,
+            title=title,
+            authors="A",
+            published_at=now - timedelta(weeks=weeks_ago),
+            abstract="",
+            full_text="",
+            source_url="http://example.com",
+            embedding_vector=embed_text(title),
+        )
+        db.add(row)
+        db.flush()
+        return row
+
+    with Session(engine) as db:
+        paper(db, "recent", "Speculative decoding with draft trees for faster inference", 2)
+        paper(db, "old", "Reward model ensembles reduce overoptimization in RLHF", 150)
+        index.open(db)
+        week = [
+            paper(db, "repeat", "Speculative decoding with draft trees for faster inference", 0),
+            paper(db, "revisit", "Reward model ensembles reduce overoptimization in RLHF", 0),
+            paper(db, "fresh", "Protein folding with diffusion priors", 0),
+        ]
+        cards = [PaperAlphaCard(paper_id=p.id, provenance_snippets="p") for p in week]
+        db.add_all(cards)
+        db.flush()
+
+        # The second open only loads the three rows added since the first.
+        assert len(index.open(db).ids) == 5
+        scores = _score_novelty(db, cards, index.open(db))
+
+        assert scores[week[0].id] < 0.1 and cards[0].novelty_bucket == "low"
+        assert scores[week[0].id] < scores[week[1].id] < scores[week[2].id]
+        assert cards[2].novelty_bucket == "high" and cards[2].novelty_score == scores[week[2].id]
+
+
+def test_pgvector_search_is_one_lateral_query_trimmed_after_exclusion() -> None:
+    executed: list[str] = []
+
+    class _Result:
+        def __init__(self, rows):
+            self.rows = rows
+
+        def all(self):
+            return self.rows
+
+    class _Db:
+        def execute(self, statement):
+            executed.append(str(statement.compile(dialect=postgresql.dialect())))
+            if not statement.is_select:
+                return _Result([])
+            # Rows for two queries, nearest first; ids 1 and 2 are excluded by the caller.
+            return _Result([(0, 1, 0.0), (0, 3, 0.1), (0, 4, 0.2), (1, 2, 0.05), (1, 5, 0.3)])
+
+    index = PgVectorIndex(_Db(), Paper.id, Paper.embedding_vector)
+    hits = index.search(np.ones((2, 1024), dtype=np.float32), k=1, exclude={1, 2})
+
+    assert hits == [[(3, 0.9)], [(5, 0.7)]]
+    assert len(executed) == 1  # k + len(exclude) stays under the default ef_search
+    assert "JOIN LATERAL" in executed[0] and "VALUES" in executed[0] and "NOT IN" not in executed[0]
+
+    executed.clear()
+    index.search(np.ones((1, 1024), dtype=np.float32), k=5, exclude=set(range(100)))
+    assert executed[0] == "SET LOCAL hnsw.ef_search = 105"
+
+
+def test_brief_covers_the_week_and_reuses_unchanged_sections(monkeypatch) -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now(timezone.utc)
+    batches = [[0, 1], [2]]
+
+    class NightlyConnector:
+        def fetch(self, max_items=100):
+            return [
+                SourceDocument(
+                    source="arxiv",
+                    source_id=f"http://arxiv.org/abs/2402.0000{i}v1",
+                    title=f"Nightly paper {i}",
+                    authors="A",
+                    abstract=f"Finding number {i}.",
+                    full_text="",
+                    published_at=now,
+                    updated_at=now,
+                    source_url=f"http://example.com/{i}",
+                    arxiv_id=f"2402.0000{i}v1",
+                )
+                for i in batches.pop(0)
+            ]
+
+    class FakeClient:
+        def warm_up(self, model, keep_alive=None, num_ctx=None):
+            return None
+
+        def unload(self, model):
+            pass
+
+        def generate(self, payload):
+            return InferenceResult(text="{}", provider="fake", model=payload.model)
+
+    monkeypatch.setattr("app.services.pipeline._write_verification_artifacts", lambda week_key, payload: None)
+    monkeypatch.setattr("app.services.pipeline.settings.topic_bias_enabled", False)
+    monkeypatch.setattr("app.services.pipeline.settings.llm_warmup_enabled", False)
+    service = DefaultWorkflowService()
+    service.inference_client = FakeClient()
+    service._connectors = lambda sources: {"arxiv": NightlyConnector()}
+
+    with Session(engine) as db:
+        service.run_weekly(db, WorkflowRunRequest(sources=["arxiv"]))
+        service.run_weekly(db, WorkflowRunRequest(sources=["arxiv"]))
+
+        second = db.scalars(select(IngestionRun).order_by(IngestionRun.id)).all()[-1]
+        regenerated = json.loads(second.checkpoint_json)["brief_sections_regenerated"]
+        assert "arxiv" in regenerated and "field_temperature" in regenerated
+        assert "strategic_flags" not in regenerated and "open_questions" not in regenerated
+        latest = db.scalars(select(ResearchBriefVersion).order_by(desc(ResearchBriefVersion.version_number))).first()
+        markdown = version_markdown(db, latest)
+        assert all(f"Nightly paper {i}" in markdown for i in range(3))
+        assert "- Total ingested artifacts: 3" in markdown
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.config import settings
+from app.db.models import SchedulerJobRun, SchedulerLease
+from app.services.scheduler import NIGHTLY_JOB, catch_up_missed_run, previous_fire_time, try_acquire_lease
+
+
+def test_only_one_holder_gets_the_lease_until_it_expires() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        assert try_acquire_lease(db, "scheduler_leader", "worker-a", ttl_s=60)
+        assert not try_acquire_lease(db, "scheduler_leader", "worker-b", ttl_s=60)
+        assert try_acquire_lease(db, "scheduler_leader", "worker-a", ttl_s=60)  # renewal
+
+        lease = db.get(SchedulerLease, "scheduler_leader")
+        lease.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db.commit()
+
+        assert try_acquire_lease(db, "scheduler_leader", "worker-b", ttl_s=60)
+        assert not try_acquire_lease(db, "scheduler_leader", "worker-a", ttl_s=60)
+        db.refresh(lease)
+        assert lease.holder == "worker-b"
+
+
+def test_previous_fire_time_finds_last_daily_slot() -> None:
+    trigger = CronTrigger(minute="0", hour="2", timezone="UTC")
+    now = datetime(2026, 10, 19, 1, 30, tzinfo=timezone.utc)
+    assert previous_fire_time(trigger, now) == datetime(2026, 10, 18, 2, 0, tzinfo=timezone.utc)
+
+
+class _FakeQueue:
+    def __init__(self) -> None:
+        self.submitted = 0
+
+    def submit(self, db, kind, payload=None, run_id=None):
+        self.submitted += 1
+        return SimpleNamespace(id=self.submitted)
+
+
+def test_catch_up_enqueues_one_run_for_a_slot_nobody_ran(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "weekly_cron", "0 2 * * *")
+    monkeypatch.setattr(settings, "weekly_timezone", "UTC")
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    queue = _FakeQueue()
+
+    with Session(engine) as db:
+        db.add(
+            SchedulerJobRun(
+                job_name=NIGHTLY_JOB,
+                scheduled_for=datetime(2026, 10, 16, 2, 0, tzinfo=timezone.utc),
+                holder="worker-a",
+                status="enqueued",
+            )
+        )
+        db.commit()
+
+        # Inside the renewal interval after a fire, the cron job still owns the slot.
+        assert catch_up_missed_run(db, now=datetime(2026, 10, 18, 2, 0, 10, tzinfo=timezone.utc), queue=queue) is None
+
+        # A follower that took over later runs the slot the old leader missed, exactly once.
+        now = datetime(2026, 10, 18, 2, 30, tzinfo=timezone.utc)
+        record = catch_up_missed_run(db, now=now, queue=queue)
+        assert record is not None and record.catch_up and record.status == "enqueued"
+        assert catch_up_missed_run(db, now=now + timedelta(minutes=2), queue=queue) is None
+        assert queue.submitted == 1
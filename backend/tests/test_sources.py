@@ -0,0 +1,64 @@
+import fitz
+
+from app.services.sources import _extract_pdf_text
+
+
+def _make_pdf() -> bytes:
+    doc = fitz.open()
+    body = "Body text line that explains the setup in some detail."
+    layout = [
+        (1, "Layout Aware Parsing", 18, "hebo"),
+        (1, body, 10, "helv"),
+        (1, "1 Introduction", 14, "hebo"),
+        (1, body, 10, "helv"),
+        (2, "2 Methods", 14, "hebo"),
+        (2, body, 10, "helv"),
+        (2, "2.1 Ablation Setup", 11, "hebo"),
+        (2, body, 10, "helv"),
+    ]
+    cursor = {}
+    for page_no, text, size, font in layout:
+        if page_no not in cursor:
+            cursor[page_no] = (doc.new_page(), 72)
+        page, y = cursor[page_no]
+        page.insert_text((72, y), text, fontsize=size, fontname=font)
+        cursor[page_no] = (page, y + 40)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_pymupdf_parser_builds_section_tree_from_font_metadata() -> None:
+    parsed = _extract_pdf_text(_make_pdf())
+    assert parsed.parser == "pymupdf"
+    names = [name for name, _, _ in parsed.sections]
+    assert names == ["main", "introduction", "method", "method / ablation setup"]
+    for name, start, end in parsed.sections:
+        assert 0 <= start < end <= len(parsed.text)
+    intro = next(span for span in parsed.sections if span[0] == "introduction")
+    assert parsed.text[intro[1] : intro[2]].startswith("1 Introduction")
+
+
+def test_parse_stops_at_reference_heading_and_char_budget() -> None:
+    doc = fitz.open()
+    body = "Body text line that explains the setup in some detail."
+    for page_no, heading in enumerate(["1 Introduction", "2 Methods", "References", "A Extra Proofs"]):
+        page = doc.new_page()
+        page.insert_text((72, 72), heading, fontsize=14, fontname="hebo")
+        page.insert_text((72, 112), f"{body} page {page_no}", fontsize=10, fontname="helv")
+    data = doc.tobytes()
+    doc.close()
+
+    full = _extract_pdf_text(data)
+    assert "page 3" in full.text
+
+    main = _extract_pdf_text(data, stop_at_tail=True)
+    assert "page 1" in main.text and "References" not in main.text and "page 2" not in main.text
+
+    # Too little main text yet: keep parsing past the tail heading.
+    fallback = _extract_pdf_text(data, stop_at_tail=True, min_main_chars=10_000)
+    assert "page 3" in fallback.text
+
+    clipped = _extract_pdf_text(data, max_chars=80)
+    assert len(clipped.text) == 80 and "page 2" not in clipped.text
+    assert all(end <= 80 for _, _, end in clipped.sections)
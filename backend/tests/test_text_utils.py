@@ -1,4 +1,4 @@
-from app.services.text_utils import make_chunks, strip_reference_tail
+from app.services.text_utils import find_sections, make_chunks, strip_reference_tail
 
 
 def test_strip_reference_tail_truncates_reference_section() -> None:
@@ -11,3 +11,54 @@ def test_make_chunks_respects_overlap_and_target() -> None:
     chunks = make_chunks(text, target_tokens=200, overlap_tokens=20)
     assert len(chunks) >= 2
     assert all(chunk.estimated_tokens > 0 for chunk in chunks)
+
+
+def test_find_sections_uses_heading_lines_not_body_mentions() -> None:
+    text = (
+        "Title\n1 Introduction\nOur method is new.\nmethods are discussed later\n3 Method\nThe loss\n"
+        "results in poor calibration.\nResults in poor calibration\n4 Results and Discussion\nGains.\nCONCLUSION\nDone."
+    )
+    spans = find_sections(text)
+
+    assert [(name, start) for name, start, _ in spans] == [
+        ("main", 0),
+        ("introduction", text.index("1 Introduction")),
+        ("method", text.index("3 Method")),
+        ("results", text.index("4 Results")),
+        ("conclusion", text.index("CONCLUSION")),
+    ]
+
+
+def test_make_chunks_stays_linear_with_large_overlap_and_snaps_to_sentences() -> None:
+    text = "Introduction\n" + ("This sentence is about reasoning. " * 3000)
+    chunks = make_chunks(text, target_tokens=50, overlap_tokens=400)
+    # Overlap is capped at half a window, so chunk count stays proportional to length.
+    assert len(chunks) <= 2 * len(text) // 1200 + 2
+    assert all(chunk.text.endswith(".") for chunk in chunks)
+
+
+def test_make_chunks_calibrates_window_size_per_section() -> None:
+    class DigitTokenizer:
+        """Each digit is a token; other text is four characters per token."""
+
+        name = "digits"
+        counted: list[int] = []
+
+        def count(self, text: str) -> int:
+            self.counted.append(len(text))
+            digits = sum(ch.isdigit() for ch in text)
+            return max(1, digits + (len(text) - digits) // 4)
+
+        def truncate(self, text: str, max_tokens: int) -> str:
+            return text[:max_tokens]
+
+    prose = "Introduction\n" + "Agents call tools in long loops. " * 800
+    tables = "\n\nResults\n" + "1 2 3 4 5 6 7 8 9 0. " * 1000
+    tokenizer = DigitTokenizer()
+    chunks = make_chunks(prose + tables, target_tokens=1000, overlap_tokens=0, tokenizer=tokenizer)
+
+    for section in ("introduction", "results"):
+        full = [c.estimated_tokens for c in chunks if c.section_name == section][:-1]
+        assert full and all(750 <= tokens <= 1100 for tokens in full), (section, full)
+    # The paper as a whole is never tokenized, only a per-section sample and the chunks.
+    assert max(tokenizer.counted) < len(prose)
@@ -0,0 +1,38 @@
+import json
+
+from app.services.text_utils import make_chunks
+from app.services.tokenizers import BPETokenizer, HeuristicTokenizer, get_tokenizer
+
+
+def _write_vocab(path) -> None:
+    merges = ["l o", "lo w", "Ġ low", "e r"]
+    path.write_text(json.dumps({"model": {"type": "BPE", "vocab": {}, "merges": merges}}), encoding="utf-8")
+
+
+def test_bpe_tokenizer_counts_merged_words_and_truncates(tmp_path) -> None:
+    vocab = tmp_path / "tiny.json"
+    _write_vocab(vocab)
+    tokenizer = BPETokenizer.from_file("tiny", vocab)
+
+    # "low" -> 1 token, " low" -> 1 token, " lower" -> " low" + "er" = 2 tokens
+    assert tokenizer.count("low low lower") == 4
+    assert tokenizer.truncate("low low lower", 2) == "low low"
+
+
+def test_get_tokenizer_is_cached_per_model_and_falls_back(tmp_path) -> None:
+    _write_vocab(tmp_path / "qwen2.5_7b-instruct.json")
+
+    tokenizer = get_tokenizer("qwen2.5:7b-instruct", str(tmp_path))
+    assert isinstance(tokenizer, BPETokenizer)
+    assert get_tokenizer("qwen2.5:7b-instruct", str(tmp_path)) is tokenizer
+    assert isinstance(get_tokenizer("unknown-model", str(tmp_path)), HeuristicTokenizer)
+
+
+def test_make_chunks_reports_tokenizer_counts(tmp_path) -> None:
+    vocab = tmp_path / "tiny.json"
+    _write_vocab(vocab)
+    tokenizer = BPETokenizer.from_file("tiny", vocab)
+
+    chunks = make_chunks("Introduction\n" + ("low " * 2000), target_tokens=300, overlap_tokens=30, tokenizer=tokenizer)
+    assert len(chunks) >= 2
+    assert all(chunk.estimated_tokens == tokenizer.count(chunk.text) for chunk in chunks)
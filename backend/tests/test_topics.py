@@ -0,0 +1,61 @@
+import numpy as np
+
+from app.config import settings
+from app.services.topics import TopicEmbeddings, TopicMatcher, blend_relevance, parse_keyword_weights
+
+
+def test_matcher_agrees_with_substring_checks() -> None:
+    keywords = settings.topic_bias_keywords_list + ["online", "rl"]
+    matcher = TopicMatcher(keywords)
+    texts = [
+        "Online RL for recommender systems with bandits",
+        "RLHF and reinforcement learning for LLM post-training safety",
+        "A world model for robots",
+        "",
+    ]
+    for text in texts:
+        expected = {kw for kw in keywords if kw in text.lower()}
+        assert matcher.matches(text) == expected
+        assert matcher.score(text) == len(expected)
+
+
+def test_word_boundaries_and_weights() -> None:
+    weights = parse_keyword_weights("rlhf:2.5, safety:0.5, broken")
+    assert weights == {"rlhf": 2.5, "safety": 0.5}
+
+    matcher = TopicMatcher(["rl", "rlhf", "safety", "online rl"], weights=weights, word_boundaries=True)
+    assert matcher.matches("A world model") == set()
+    assert matcher.matches("Online RL beats RLHF on safety") == {"rl", "online rl", "rlhf", "safety"}
+    assert matcher.score("RLHF for safety") == 3.0
+
+
+def test_semantic_relevance_ranks_paraphrases_and_caches_topic_vectors(tmp_path) -> None:
+    vocab = ["reinforcement", "policy", "agents", "cooking"]
+    calls: list[list[str]] = []
+
+    def embed(texts: list[str]) -> list[list[float]]:
+        calls.append(texts)
+        return [[float(word in text.lower()) for word in vocab] for text in texts]
+
+    path = tmp_path / "topic_embeddings.json"
+    topics = TopicEmbeddings(embed, model="fake", path=path)
+    sims = topics.similarities(
+        ["Policy optimization for language agents", "Cooking with robots"],
+        ["reinforcement learning policy agents"],
+    )
+    assert sims[0] > 0.8 and sims[1] == 0.0
+
+    cached = TopicEmbeddings(embed, model="fake", path=path)
+    calls.clear()
+    cached.topic_matrix(["reinforcement learning policy agents"])
+    assert calls == []
+
+    relevance = blend_relevance(
+        np.asarray([0.0, 2.0]),
+        sims,
+        np.asarray([0.0, 0.0]),
+        semantic_weight=0.6,
+        recency_weight=0.0,
+        half_life_hours=72,
+    )
+    assert relevance[0] > relevance[1]
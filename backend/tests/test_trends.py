@@ -0,0 +1,102 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Hypothesis, IngestionRun, IngestionRunDocument, Paper, PaperAlphaCard, TrendRollup
+from app.services.trends import backfill_rollups, rollup_week, trend_report, week_keys_ending
+
+
+def _add_week(db: Session, week_key: str, mechanisms: list[str]) -> None:
+    run = IngestionRun(source_scope="arxiv", status="completed", week_key=week_key)
+    db.add(run)
+    db.flush()
+    for i, mechanism in enumerate(mechanisms):
+        paper = Paper(
+            source="arxiv",
+            source_id=f"{week_key}-{i}",
+            title=f"{week_key} {i}",
+            authors="A",
+            published_at=datetime.now(timezone.utc),
+            abstract="",
+            full_text="",
+            source_url="http://example.com",
+        )
+        db.add(paper)
+        db.flush()
+        card = PaperAlphaCard(paper_id=paper.id, mechanism_type=mechanism, bottleneck_attacked="compute")
+        db.add(card)
+        db.flush()
+        db.add(
+            IngestionRunDocument(
+                run_id=run.id, position=i, source_id=paper.source_id, payload_json="{}", paper_id=paper.id, alpha_card_id=card.id
+            )
+        )
+    db.flush()
+
+
+def test_week_keys_cross_year_boundary() -> None:
+    assert week_keys_ending("2026-W02", 3) == ["2025-W52", "2026-W01", "2026-W02"]
+
+
+def test_rollups_feed_windowed_trends() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        _add_week(db, "2026-W38", ["rlhf", "rlhf", "rlhf"])
+        _add_week(db, "2026-W39", ["rlhf", "rlhf"])
+        _add_week(db, "2026-W41", ["agents", "agents", "rlhf"])
+        for week in ("2026-W38", "2026-W39", "2026-W41"):
+            rollup_week(db, week)
+        # Re-rolling a week replaces its rows instead of adding to them.
+        rollup_week(db, "2026-W41")
+        assert db.scalar(select(func.count(TrendRollup.id)).where(TrendRollup.week_key == "2026-W41")) == 5
+
+        report = trend_report(db, window=4, recent_weeks=1, moving_average_weeks=2)
+
+        assert report.end_week == "2026-W41"
+        assert report.weeks == ["2026-W38", "2026-W39", "2026-W40", "2026-W41"]
+        rlhf = next(s for s in report.series if s.dimension == "mechanism" and s.value == "rlhf")
+        assert rlhf.counts == [3, 2, 0, 1] and rlhf.total == 6
+        assert rlhf.moving_average == [3.0, 2.5, 1.0, 0.5]
+        assert [s.value for s in report.emerging] == ["agents"]
+        assert [s.value for s in report.declining] == ["rlhf"]
+        only_sources = trend_report(db, "2026-W41", window=2, dimension="source")
+        assert {s.dimension for s in only_sources.series} == {"source"}
+
+
+def test_backfill_rolls_up_history_from_before_rollups() -> None:
+    engine = create_engine("sqlite+pysqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        # A week ingested before runs tracked their documents: only cards and hypotheses exist.
+        paper = Paper(
+            source="arxiv",
+            source_id="legacy-0",
+            title="legacy",
+            authors="A",
+            published_at=datetime(2026, 9, 30, tzinfo=timezone.utc),
+            abstract="",
+            full_text="",
+            source_url="http://example.com",
+        )
+        db.add(paper)
+        db.flush()
+        db.add(
+            PaperAlphaCard(
+                paper_id=paper.id, mechanism_type="moe", created_at=datetime(2026, 9, 30, 12, tzinfo=timezone.utc)
+            )
+        )
+        db.add(Hypothesis(text="h", type="scaling", week_introduced="2026-W40"))
+        _add_week(db, "2026-W41", ["agents"])
+        rollup_week(db, "2026-W41")
+
+        assert backfill_rollups(db) == ["2026-W40"]
+        assert backfill_rollups(db) == []  # already rolled up
+
+        report = trend_report(db, "2026-W41", window=2)
+        moe = next(s for s in report.series if s.dimension == "mechanism" and s.value == "moe")
+        assert moe.counts == [1, 0]
+        scaling = next(s for s in report.series if s.dimension == "hypothesis_type")
+        assert scaling.value == "scaling" and scaling.counts == [1, 0]
@@ -15,6 +15,7 @@ function App() {
   const [editorValue, setEditorValue] = useState("");
   const [exports, setExports] = useState([]);
   const [status, setStatus] = useState("Idle");
+  const [activeJob, setActiveJob] = useState(null);
 
   const weekKey = useMemo(() => {
     const now = new Date();
@@ -73,16 +74,26 @@ function App() {
   }
 
   async function runWeekly() {
-    setStatus("Running weekly workflow...");
+    setStatus("Queueing weekly workflow...");
     try {
-      const result = await api.runWeekly();
-      setStatus(`Run completed: ${result.notes}`);
-      await loadAll();
+      const job = await api.runWeekly();
+      setActiveJob(job);
+      setStatus(`Run queued (job ${job.id})`);
     } catch (err) {
       setStatus(`Run failed: ${err.message}`);
     }
   }
 
+  async function cancelRun() {
+    if (!activeJob) return;
+    try {
+      setActiveJob(await api.cancelJob(activeJob.id));
+      setStatus(`Cancelling job ${activeJob.id}...`);
+    } catch (err) {
+      setStatus(`Cancel failed: ${err.message}`);
+    }
+  }
+
   async function saveBrief() {
     setStatus("Saving brief version...");
     try {
@@ -133,6 +144,29 @@ function App() {
     loadAll();
   }, []);
 
+  // Runs execute on the backend job worker; poll the job until it settles.
+  useEffect(() => {
+    if (!activeJob || !["queued", "running"].includes(activeJob.status)) return undefined;
+    const timer = setTimeout(async () => {
+      try {
+        const job = await api.job(activeJob.id);
+        setActiveJob(job);
+        if (job.status === "running") {
+          const total = job.progress_total ? `/${job.progress_total}` : "";
+          setStatus(`Running job ${job.id}: ${job.stage || "starting"} ${job.progress_done}${total}`);
+        } else if (job.status === "succeeded") {
+          setStatus(`Run completed (job ${job.id})`);
+          await loadAll();
+        } else if (job.status !== "queued") {
+          setStatus(`Run ${job.status}: ${job.error || `job ${job.id}`}`);
+        }
+      } catch (err) {
+        setStatus(`Job poll failed: ${err.message}`);
+      }
+    }, 3000);
+    return () => clearTimeout(timer);
+  }, [activeJob]);
+
   useEffect(() => {
     function onKeydown(event) {
       if ((event.metaKey || event.ctrlKey) && event.key.toLowerCase() === "r") {
@@ -161,6 +195,9 @@ function App() {
         </div>
         <div className="actions">
           <button onClick={runWeekly}>Run Weekly (Ctrl/Cmd+R)</button>
+          {activeJob && ["queued", "running"].includes(activeJob.status) && (
+            <button onClick={cancelRun}>Cancel Run</button>
+          )}
           <button onClick={saveBrief}>Save Brief (Ctrl/Cmd+S)</button>
           <button onClick={generateExports}>Generate Exports (Ctrl/Cmd+E)</button>
           <button onClick={loadAll}>Refresh</button>
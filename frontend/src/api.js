@@ -16,6 +16,8 @@ export const api = {
   health: () => request("/health"),
   diagnostics: () => request("/diagnostics"),
   runWeekly: () => request("/workflows/weekly-run", { method: "POST", body: JSON.stringify({}) }),
+  job: (jobId) => request(`/workflows/jobs/${jobId}`),
+  cancelJob: (jobId) => request(`/workflows/jobs/${jobId}/cancel`, { method: "POST" }),
   ingestionPolicy: () => request("/workflows/ingestion-policy"),
   inferencePolicy: () => request("/workflows/inference-policy"),
   projectPolicy: () => request("/workflows/project-policy"),